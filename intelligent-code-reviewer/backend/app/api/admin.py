@@ -3,20 +3,106 @@ Admin API endpoints for monitoring and debugging analysis jobs.
 """
 
 from fastapi import APIRouter, HTTPException, Query
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Any, Callable, Dict, Optional
+from datetime import datetime, timezone
+import orjson
+from sqlalchemy import case, func, literal, null, select, union_all
+from starlette.background import BackgroundTask
 
+from ..core.cache import LRUCache
+from ..core.config import settings
 from ..services.progress_tracker import get_all_active_jobs, ProgressTracker
-from ..db.session import get_session
-from ..models.analysis import AnalysisJob, AnalysisStep
+from ..db.session import SessionLocal, engine, get_session
+from ..models.analysis import AnalysisJob, AnalysisStatus, AnalysisStep
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+# Short-lived caches so bursts of dashboard polls are served from memory
+_stats_cache = LRUCache(maxsize=1, ttl=settings.admin_stats_cache_ttl)
+_active_jobs_cache = LRUCache(maxsize=1, ttl=settings.admin_active_jobs_cache_ttl)
+_STATS_CACHE_KEY = "admin:stats:v1"
+_ACTIVE_JOBS_CACHE_KEY = "admin:jobs:active:v1"
 
-@router.get("/jobs/active")
-async def get_active_jobs() -> List[Dict[str, Any]]:
-    """Get all currently active analysis jobs."""
-    return get_all_active_jobs()
+# Rows fetched per round-trip when streaming list endpoints
+STREAM_BATCH_SIZE = 200
+
+
+def _duration_seconds(dialect_name: str, start, end):
+    """Build a SQL expression for the seconds between two datetime expressions."""
+    if dialect_name == "postgresql":
+        return func.extract("epoch", end - start)
+    # SQLite stores datetimes as text; julianday() returns fractional days (UTC for 'now')
+    return (func.julianday(end) - func.julianday(start)) * 86400.0
+
+
+def _hours_ago(dialect_name: str, hours: int):
+    """Build a SQL expression for the current UTC time minus the given hours."""
+    if dialect_name == "postgresql":
+        return func.timezone("utc", func.now()) - func.make_interval(0, 0, 0, 0, hours)
+    # Matches the naive UTC text timestamps SQLite stores
+    return func.datetime("now", f"-{int(hours)} hours")
+
+
+def _job_duration_seconds(dialect_name: str, running_until_now: bool = False):
+    """
+    Build a SQL expression for job duration in seconds for the given dialect.
+    
+    Args:
+        dialect_name: Name of the bound database dialect
+        running_until_now: Measure jobs that have not completed up to the current time
+        
+    Returns:
+        SQL expression yielding seconds, or NULL when the job never started
+    """
+    end = AnalysisJob.completed_at
+    if running_until_now:
+        now = func.timezone("utc", func.now()) if dialect_name == "postgresql" else literal("now")
+        end = func.coalesce(end, now)
+    return _duration_seconds(dialect_name, AnalysisJob.started_at, end)
+
+
+def _ndjson_response(stmt, row_to_dict: Callable[[Any], Dict[str, Any]]) -> StreamingResponse:
+    """
+    Execute stmt and stream its rows as NDJSON, one orjson-encoded line per row.
+    
+    The statement runs before the response is built, so database errors reach
+    the caller as a 500 instead of a truncated 200; only row fetching (in
+    batches) is left to the stream. The session closes once streaming ends.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=STREAM_BATCH_SIZE)).mappings()
+    except Exception:
+        db.close()
+        raise
+    # The sync generator is iterated in the threadpool; memory stays flat as rows grow
+    return StreamingResponse(
+        (orjson.dumps(row_to_dict(row)) + b"\n" for row in result),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(db.close)
+    )
+
+
+def _job_row_to_dict(row) -> Dict[str, Any]:
+    """Shape a job listing row for the /jobs/all response."""
+    return {
+        "task_id": row["task_id"],
+        "status": row["status"],
+        "progress": row["progress_percentage"],
+        "current_step": row["current_step"],
+        "source_type": row["input_source_type"],
+        "source": row["input_source_path"],
+        "created_at": row["created_at"],
+        "started_at": row["started_at"],
+        "updated_at": row["updated_at"],
+        "completed_at": row["completed_at"],
+        "duration": row["duration"],
+        "files_progress": f"{row['processed_files']}/{row['total_files']}",
+        "tools_progress": f"{row['completed_tools']}/{row['total_tools']}",
+        "error": row["error_message"],
+        "warnings_count": row["warnings_count"],
+    }
 
 
 @router.get("/jobs/all")
@@ -24,127 +110,121 @@ async def get_all_jobs(
     limit: int = Query(50, description="Number of jobs to return"),
     status: Optional[str] = Query(None, description="Filter by status"),
     hours: Optional[int] = Query(None, description="Jobs from last N hours")
-) -> List[Dict[str, Any]]:
-    """Get all analysis jobs with optional filtering."""
+) -> StreamingResponse:
+    """Get all analysis jobs with optional filtering, streamed as NDJSON (one job per line)."""
     try:
-        with get_session() as db:
-            query = db.query(AnalysisJob)
-            
-            # Filter by status if provided
-            if status:
-                query = query.filter(AnalysisJob.status == status)
-            
-            # Filter by time if provided
-            if hours:
-                since = datetime.utcnow() - timedelta(hours=hours)
-                query = query.filter(AnalysisJob.created_at >= since)
-            
-            # Order by most recent first
-            jobs = query.order_by(AnalysisJob.created_at.desc()).limit(limit).all()
-            
-            return [{
-                "task_id": job.task_id,
-                "status": job.status,
-                "progress": job.progress_percentage,
-                "current_step": job.current_step,
-                "source_type": job.input_source_type,
-                "source": job.input_source_path,
-                "created_at": job.created_at.isoformat(),
-                "started_at": job.started_at.isoformat() if job.started_at else None,
-                "updated_at": job.updated_at.isoformat(),
-                "completed_at": job.completed_at.isoformat() if job.completed_at else None,
-                "duration": job.get_duration(),
-                "files_progress": f"{job.processed_files}/{job.total_files}",
-                "tools_progress": f"{job.completed_tools}/{job.total_tools}",
-                "error": job.error_message,
-                "warnings_count": len(job.warnings) if job.warnings else 0,
-            } for job in jobs]
+        # Core select of scalar columns; rows are read as mappings, not ORM objects
+        stmt = select(
+            AnalysisJob.task_id,
+            AnalysisJob.status,
+            AnalysisJob.progress_percentage,
+            AnalysisJob.current_step,
+            AnalysisJob.input_source_type,
+            AnalysisJob.input_source_path,
+            AnalysisJob.created_at,
+            AnalysisJob.started_at,
+            AnalysisJob.updated_at,
+            AnalysisJob.completed_at,
+            AnalysisJob.processed_files,
+            AnalysisJob.total_files,
+            AnalysisJob.completed_tools,
+            AnalysisJob.total_tools,
+            AnalysisJob.error_message,
+            _job_duration_seconds(engine.dialect.name, running_until_now=True).label("duration"),
+            AnalysisJob.warnings_count,
+        )
+        
+        # Filter by status if provided
+        if status:
+            stmt = stmt.where(AnalysisJob.status == status)
+        
+        # Filter by time if provided
+        if hours:
+            stmt = stmt.where(AnalysisJob.created_at >= _hours_ago(engine.dialect.name, hours))
+        
+        # Order by most recent first
+        stmt = stmt.order_by(AnalysisJob.created_at.desc()).limit(limit)
+        
+        return _ndjson_response(stmt, _job_row_to_dict)
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get jobs: {str(e)}")
 
 
 @router.get("/jobs/{task_id}/details")
-async def get_job_details(task_id: str) -> Dict[str, Any]:
+async def get_job_details(task_id: str) -> ORJSONResponse:
     """Get detailed information about a specific analysis job."""
     try:
-        tracker = ProgressTracker(task_id)
+        # Prefetch job, status and steps in one batch instead of separate round-trips
+        tracker = ProgressTracker.batch_load([task_id]).get(task_id)
+        if not tracker:
+            raise HTTPException(status_code=404, detail="Job not found")
         
-        # Get current status
         status = tracker.get_current_status()
-        
-        # Get step history
         steps = tracker.get_step_history()
         
-        # Get job metadata
-        with get_session() as db:
-            job = db.query(AnalysisJob).filter(AnalysisJob.task_id == task_id).first()
-            if not job:
-                raise HTTPException(status_code=404, detail="Job not found")
-            
-            return {
-                "job_info": {
-                    "task_id": job.task_id,
-                    "status": job.status,
-                    "source_type": job.input_source_type,
-                    "source_identifier": job.input_source_path,
-                    "created_at": job.created_at.isoformat(),
-                    "started_at": job.started_at.isoformat() if job.started_at else None,
-                    "updated_at": job.updated_at.isoformat(),
-                    "completed_at": job.completed_at.isoformat() if job.completed_at else None,
-                    "error_message": job.error_message,
-                    "error_details": job.error_details,
-                    "warnings": job.warnings,
-                    "metadata": job.analysis_metadata,
-                },
-                "progress": status,
-                "steps": steps,
-                "summary": {
-                    "total_steps": len(steps),
-                    "completed_steps": len([s for s in steps if s["status"] == "completed"]),
-                    "failed_steps": len([s for s in steps if s["status"] == "failed"]),
-                    "running_steps": len([s for s in steps if s["status"] == "running"]),
-                }
-            }
-            
+        return ORJSONResponse({
+            "job_info": tracker.get_job_info(),
+            "progress": status,
+            "steps": steps,
+            "summary": tracker.get_step_summary()
+        })
+        
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get job details: {str(e)}")
 
 
+def _step_log_row_to_dict(row) -> Dict[str, Any]:
+    """Shape a step log row; completion entries also carry duration and error."""
+    entry = {
+        "timestamp": row["timestamp"],
+        "type": row["type"],
+        "message": row["message"],
+        "level": row["level"],
+    }
+    if row["type"] == "step_complete":
+        entry["duration"] = row["duration"]
+        entry["error"] = row["error"]
+    return entry
+
+
 @router.get("/jobs/{task_id}/logs")
-async def get_job_logs(task_id: str) -> List[Dict[str, Any]]:
-    """Get detailed logs for a specific analysis job."""
+async def get_job_logs(task_id: str) -> StreamingResponse:
+    """Get detailed logs for a specific analysis job, streamed as NDJSON (one entry per line)."""
     try:
-        with get_session() as db:
-            steps = db.query(AnalysisStep).filter(
-                AnalysisStep.task_id == task_id
-            ).order_by(AnalysisStep.started_at).all()
-            
-            logs = []
-            for step in steps:
-                log_entry = {
-                    "timestamp": step.started_at.isoformat() if step.started_at else None,
-                    "type": "step_start",
-                    "message": f"Started {step.step_type}: {step.step_name}",
-                    "level": "info"
-                }
-                logs.append(log_entry)
-                
-                if step.completed_at:
-                    status = "success" if step.success else "error"
-                    log_entry = {
-                        "timestamp": step.completed_at.isoformat(),
-                        "type": "step_complete",
-                        "message": f"{'Completed' if step.success else 'Failed'} {step.step_name}",
-                        "level": status,
-                        "duration": step.get_duration(),
-                        "error": step.error_message if not step.success else None
-                    }
-                    logs.append(log_entry)
-            
-            return logs
+        # One row per step start and one per step completion, shaped and ordered in SQL
+        completed = select(
+            AnalysisStep.completed_at.label("timestamp"),
+            literal(1).label("seq"),
+            literal("step_complete").label("type"),
+            (
+                case((AnalysisStep.success, "Completed"), else_="Failed")
+                + literal(" ") + AnalysisStep.step_name
+            ).label("message"),
+            case((AnalysisStep.success, "success"), else_="error").label("level"),
+            _duration_seconds(
+                engine.dialect.name, AnalysisStep.started_at, AnalysisStep.completed_at
+            ).label("duration"),
+            case((AnalysisStep.success, null()), else_=AnalysisStep.error_message).label("error"),
+        ).where(
+            AnalysisStep.task_id == task_id,
+            AnalysisStep.completed_at.isnot(None)
+        )
+        started = select(
+            AnalysisStep.started_at,
+            literal(0),
+            literal("step_start"),
+            literal("Started ") + AnalysisStep.step_type + literal(": ") + AnalysisStep.step_name,
+            literal("info"),
+            null(),
+            null(),
+        ).where(AnalysisStep.task_id == task_id)
+        
+        stmt = union_all(completed, started).order_by("timestamp", "seq")
+        
+        return _ndjson_response(stmt, _step_log_row_to_dict)
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get logs: {str(e)}")
@@ -156,7 +236,7 @@ async def cancel_job(task_id: str) -> Dict[str, str]:
     try:
         tracker = ProgressTracker(task_id)
         tracker.update_status(
-            status="CANCELLED",
+            status=AnalysisStatus.CANCELLED,
             progress=None,
             step="Cancelled by admin"
         )
@@ -169,47 +249,51 @@ async def cancel_job(task_id: str) -> Dict[str, str]:
 @router.get("/stats")
 async def get_system_stats() -> Dict[str, Any]:
     """Get system-wide analysis statistics."""
+    cached = _stats_cache.get(_STATS_CACHE_KEY)
+    if cached is not None:
+        return cached
+    
     try:
         with get_session() as db:
-            # Count jobs by status
-            from sqlalchemy import func
-            
-            status_counts = db.query(
+            # Count jobs by status and recent activity (last 24 hours) in one pass
+            last_24h = _hours_ago(db.get_bind().dialect.name, 24)
+            status_rows = db.query(
                 AnalysisJob.status,
-                func.count(AnalysisJob.id).label('count')
+                func.count(AnalysisJob.task_id).label('count'),
+                func.count(AnalysisJob.task_id).filter(
+                    AnalysisJob.created_at >= last_24h
+                ).label('recent_count')
             ).group_by(AnalysisJob.status).all()
+            recent_jobs = sum(row.recent_count for row in status_rows)
             
-            # Recent activity (last 24 hours)
-            last_24h = datetime.utcnow() - timedelta(hours=24)
-            recent_jobs = db.query(func.count(AnalysisJob.id)).filter(
-                AnalysisJob.created_at >= last_24h
-            ).scalar()
-            
-            # Average completion time
-            completed_jobs = db.query(AnalysisJob).filter(
+            # Average completion time, aggregated in the database
+            duration = _job_duration_seconds(db.get_bind().dialect.name)
+            avg_duration, completed_total = db.query(
+                func.avg(duration),
+                func.count(AnalysisJob.task_id)
+            ).filter(
                 AnalysisJob.status == "COMPLETE",
                 AnalysisJob.started_at.isnot(None),
                 AnalysisJob.completed_at.isnot(None)
-            ).all()
+            ).one()
             
-            avg_duration = None
-            if completed_jobs:
-                durations = [job.get_duration() for job in completed_jobs if job.get_duration()]
-                if durations:
-                    avg_duration = sum(durations) / len(durations)
-            
-            return {
-                "status_counts": {status: count for status, count in status_counts},
+            stats = {
+                "status_counts": {row.status: row.count for row in status_rows},
                 "recent_activity": {
                     "jobs_last_24h": recent_jobs,
                 },
                 "performance": {
-                    "average_duration_seconds": avg_duration,
-                    "completed_jobs_total": len(completed_jobs),
+                    "average_duration_seconds": float(avg_duration) if avg_duration is not None else None,
+                    "completed_jobs_total": completed_total,
                 },
-                "active_jobs": len(get_all_active_jobs()),
-                "timestamp": datetime.utcnow().isoformat()
+                "active_jobs": len(_active_jobs_cache.get_or_set(
+                    _ACTIVE_JOBS_CACHE_KEY, get_all_active_jobs
+                )),
+                "timestamp": datetime.now(timezone.utc).isoformat()
             }
+        
+        _stats_cache.set(_STATS_CACHE_KEY, stats)
+        return stats
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}") 
\ No newline at end of file
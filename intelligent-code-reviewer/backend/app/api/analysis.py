@@ -9,20 +9,50 @@ import asyncio
 import logging
 from typing import Dict, Any
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, UploadFile, File
-from ..models.api import AnalyzeURLRequest, AnalyzeZipRequest, AnalysisResponse
+from fastapi.concurrency import run_in_threadpool
+from ..models.api_models import AnalyzeURLRequest, AnalyzeZipRequest, AnalysisResponse
 from ..db.database import get_db_service, DatabaseService
-from ..services.agent_integration import AgentIntegrationService
-import tempfile
-import shutil
-from pathlib import Path
+from ..services.code_retriever import CodeRetrievalError
+from ..core.config import settings
 import uuid
 
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Global agent integration service instance
-agent_service = AgentIntegrationService()
+# Agent integration service shared by all requests; see get_agent_service
+_agent_service = None
+
+# Status-specific messages for the status endpoint; templates take the current stage
+_STATUS_MESSAGES = {
+    "completed": "Analysis completed successfully. Use /report/{task_id} to get full results.",
+    "failed": "Analysis failed. Check progress details for error information.",
+    "in_progress": "Analysis in progress - {stage}",
+}
+
+
+def get_agent_service():
+    """
+    Return the shared agent integration service, creating it on first use.
+    
+    Built lazily so importing this router does not load the RAG pipeline,
+    vector store and AI agent until an analysis actually needs them.
+    """
+    global _agent_service
+    if _agent_service is None:
+        from ..services.agent_integration import AgentIntegrationService
+        _agent_service = AgentIntegrationService()
+    return _agent_service
+
+
+def _upload_size(upload: UploadFile) -> int:
+    """Return the upload size in bytes, measuring the spooled file if unknown."""
+    if upload.size is not None:
+        return upload.size
+    upload.file.seek(0, 2)
+    size = upload.file.tell()
+    upload.file.seek(0)
+    return size
 
 
 async def run_analysis_job(
@@ -37,7 +67,7 @@ async def run_analysis_job(
         logger.info(f"Starting background analysis job {task_id}")
         
         # Run the integrated analysis
-        result = await agent_service.process_analysis_job(
+        result = await get_agent_service().process_analysis_job(
             task_id=task_id,
             source_type=source_type,
             source_location=source_location,
@@ -135,16 +165,27 @@ async def analyze_zip_file(
                 detail="Only ZIP files are supported"
             )
         
+        # Reject oversize uploads before extracting anything
+        file_size = _upload_size(file)
+        if file_size > settings.max_file_size_mb * 1024 * 1024:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File exceeds maximum size of {settings.max_file_size_mb} MB"
+            )
+        
         # Generate unique task ID
         task_id = f"zip_{uuid.uuid4().hex[:8]}"
         
-        # Save uploaded file temporarily
-        temp_dir = tempfile.mkdtemp(prefix=f"upload_{task_id}_")
-        temp_file_path = Path(temp_dir) / file.filename
-        
+        # The upload is already spooled by Starlette; extract straight from it
+        # (off the event loop) instead of copying it to a temp ZIP first
         try:
-            with open(temp_file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            project_dir = await run_in_threadpool(
+                get_agent_service().rag_pipeline.code_retriever.retrieve_from_zip_file,
+                file.file,
+                task_id
+            )
+        except CodeRetrievalError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         finally:
             file.file.close()
         
@@ -152,12 +193,12 @@ async def analyze_zip_file(
         await db_service.create_job(
             task_id=task_id,
             source_type="zip_file",
-            source_location=str(temp_file_path),
+            source_location=str(project_dir),
             status="pending",
             metadata={
                 "original_filename": file.filename,
-                "file_size": temp_file_path.stat().st_size,
-                "temp_path": str(temp_file_path),
+                "file_size": file_size,
+                "extracted_path": str(project_dir),
                 "created_at": "now"
             }
         )
@@ -167,7 +208,7 @@ async def analyze_zip_file(
             run_analysis_job,
             task_id=task_id,
             source_type="zip",
-            source_location=str(temp_file_path),
+            source_location=str(project_dir),
             db_service=db_service,
             analysis_requirements=None
         )
@@ -205,7 +246,7 @@ async def get_analysis_report(
     """
     try:
         # Get report from agent service
-        report = await agent_service.get_analysis_report(task_id, db_service)
+        report = await get_agent_service().get_analysis_report(task_id, db_service)
         
         if report is None:
             raise HTTPException(
@@ -255,26 +296,18 @@ async def get_analysis_status(
         }
         
         # Add progress information if available
-        if job.metadata:
-            if isinstance(job.metadata, dict):
-                response["progress"] = job.metadata
-            else:
-                try:
-                    import json
-                    response["progress"] = json.loads(job.metadata)
-                except:
-                    response["progress"] = {"raw": job.metadata}
+        if job.analysis_metadata:
+            response["progress"] = job.analysis_metadata
         
         # Add status-specific information
-        if job.status == "completed":
-            response["message"] = "Analysis completed successfully. Use /report/{task_id} to get full results."
-        elif job.status == "failed":
-            response["message"] = "Analysis failed. Check progress details for error information."
+        template = _STATUS_MESSAGES.get(job.status)
+        if template is None:
+            response["message"] = f"Job status: {job.status}"
         elif job.status == "in_progress":
             stage = response.get("progress", {}).get("stage", "unknown")
-            response["message"] = f"Analysis in progress - {stage}"
+            response["message"] = template.format(stage=stage)
         else:
-            response["message"] = f"Job status: {job.status}"
+            response["message"] = template
         
         return response
         
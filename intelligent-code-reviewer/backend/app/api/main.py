@@ -1,12 +1,15 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional
+import orjson
 import uuid
 
 from ..models.api_models import (
     AnalyzeUrlRequest,
     AnalyzeResponse,
     ReportResponse,
-    JobStatus,
     ErrorResponse,
 )
 from ..db.session import get_db
@@ -16,6 +19,19 @@ from . import admin
 
 router = APIRouter(prefix="/api")
 
+# Served when a job is COMPLETE but no final report row exists
+FALLBACK_REPORT_JSON = orjson.dumps({
+    "summary": "Analysis complete",
+    "findings": [],
+    "recommendations": []
+})
+
+
+def _report_json(payload: Dict[str, Any], report_json: Optional[bytes]) -> bytes:
+    """Encode payload and splice in already-encoded report JSON as report_content."""
+    body = orjson.dumps(payload)
+    return body[:-1] + b',"report_content":' + (report_json or b"null") + b"}"
+
 router.include_router(analyze.router)
 router.include_router(admin.router)
 
@@ -32,8 +48,9 @@ async def analyze_repository_url(request: AnalyzeUrlRequest, db: Session = Depen
         # Generate unique task ID
         task_id = str(uuid.uuid4())
         
-        # Create job in database
-        DatabaseService.create_analysis_job(
+        # Create job in database (sync session, run off the event loop)
+        await run_in_threadpool(
+            DatabaseService.create_analysis_job,
             db=db,
             task_id=task_id,
             input_source_type="git_url",
@@ -65,8 +82,9 @@ async def analyze_zip_upload(file: UploadFile = File(...), db: Session = Depends
         # Generate unique task ID
         task_id = str(uuid.uuid4())
         
-        # Create job in database
-        DatabaseService.create_analysis_job(
+        # Create job in database (sync session, run off the event loop)
+        await run_in_threadpool(
+            DatabaseService.create_analysis_job,
             db=db,
             task_id=task_id,
             input_source_type="zip_upload",
@@ -91,44 +109,40 @@ async def get_analysis_report(task_id: str, db: Session = Depends(get_db)):
     
     This endpoint returns the current status of the analysis job.
     When the job is complete, it also returns the full analysis report.
+    
+    The stored report JSON is spliced into the response bytes as-is, so
+    the report is never decoded and re-encoded; ReportResponse only
+    documents the shape.
     """
     try:
         # Get job from database
-        job = DatabaseService.get_analysis_job(db, task_id)
+        job = await run_in_threadpool(DatabaseService.get_analysis_job, db, task_id)
         if not job:
             raise HTTPException(status_code=404, detail="Task not found")
         
-        # Create job status object
-        job_status = JobStatus(
-            status=job.status,
-            created_at=job.created_at,
-            completed_at=job.completed_at
-        )
-        
         # Create response
-        response = ReportResponse(
-            task_id=task_id,
-            job_status=job_status
-        )
+        response = {
+            "task_id": task_id,
+            "job_status": {
+                "status": job.status,
+                "created_at": job.created_at,
+                "completed_at": job.completed_at,
+            },
+            "error_message": None,
+        }
+        report_json = None
         
         # If job is complete, include the actual report
-        if job_status.status == "COMPLETE":
-            final_report = DatabaseService.get_final_report(db, task_id)
-            if final_report:
-                response.report_content = final_report.report_content
-            else:
-                # Fallback if no report found but job is marked complete
-                response.report_content = {
-                    "summary": "Analysis complete",
-                    "findings": [],
-                    "recommendations": []
-                }
+        if job.status == "COMPLETE":
+            raw = await run_in_threadpool(DatabaseService.get_final_report_raw, db, task_id)
+            # Fallback if no report found but job is marked complete
+            report_json = raw.encode() if raw else FALLBACK_REPORT_JSON
         
         # If job failed, include error message
-        if job_status.status == "FAILED" and job.error_message:
-            response.error_message = job.error_message
+        if job.status == "FAILED" and job.error_message:
+            response["error_message"] = job.error_message
         
-        return response
+        return Response(content=_report_json(response, report_json), media_type="application/json")
         
     except HTTPException:
         raise
@@ -2,8 +2,9 @@
 Configuration settings for the Intelligent Code Reviewer.
 """
 
-from pydantic_settings import BaseSettings
-from typing import Optional
+from functools import cached_property, lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import FrozenSet, Optional, Tuple
 
 
 class Settings(BaseSettings):
@@ -16,10 +17,17 @@ class Settings(BaseSettings):
     
     # Database settings
     database_url: str = "sqlite:///./intelligent_code_reviewer.db"
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 3600  # Seconds before a pooled server connection is replaced
+    db_query_cache_size: int = 1200  # Compiled-statement LRU entries per engine
     
     # Vector store settings
     vector_store_path: str = "./vector_store"
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    pattern_search_cache_size: int = 512  # Cached (collection, query, k) playbook searches
+    pattern_search_cache_ttl: float = 300.0  # Seconds
     
     # File processing settings
     temp_directory: str = "./temp"
@@ -38,11 +46,15 @@ class Settings(BaseSettings):
     api_version: str = "1.0.0"
     api_description: str = "AI-Powered Intelligent Code Analysis and Review Platform"
     
+    # Admin dashboard cache settings (seconds)
+    admin_stats_cache_ttl: float = 10.0
+    admin_active_jobs_cache_ttl: float = 2.0
+    
     # CORS settings
-    cors_origins: list = ["http://localhost:3000", "http://127.0.0.1:3000"]
+    cors_origins: Tuple[str, ...] = ("http://localhost:3000", "http://127.0.0.1:3000")
     cors_allow_credentials: bool = True
-    cors_allow_methods: list = ["*"]
-    cors_allow_headers: list = ["*"]
+    cors_allow_methods: Tuple[str, ...] = ("*",)
+    cors_allow_headers: Tuple[str, ...] = ("*",)
     
     # Development settings
     debug: bool = True
@@ -51,9 +63,22 @@ class Settings(BaseSettings):
     # Security settings
     secret_key: str = "intelligent-code-reviewer-secret-key-change-in-production"
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+    @cached_property
+    def cors_origins_set(self) -> FrozenSet[str]:
+        """Allowed CORS origins as a frozenset for constant-time lookups."""
+        return frozenset(self.cors_origins)
+    
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        frozen=True,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, parsing the environment only once."""
+    return Settings()
 
 
-settings = Settings() 
\ No newline at end of file
+settings = get_settings() 
\ No newline at end of file
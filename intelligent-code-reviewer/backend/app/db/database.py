@@ -2,24 +2,33 @@
 Database service for managing analysis jobs, logs, and reports.
 """
 
-import json
 import logging
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+import time
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Tuple
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import selectinload
-from sqlalchemy import select, and_, desc
-from ..models.database import Base, AnalysisJob, AgentLog, FinalReport
+from sqlalchemy import JSON, bindparam, case, cast, delete, func, insert, literal, select, tuple_, and_, desc, update
+from sqlalchemy.dialects.postgresql import JSONB
+from ..models import Base, AnalysisJob, AgentLog, FinalReport
 from ..core.config import settings
+from .pragmas import register_sqlite_pragmas
+from .session import engine_pool_options, orjson_serializer
 
 
 logger = logging.getLogger(__name__)
 
-# Create async engine
+# Create async engine; shared by every request-scoped session
 engine = create_async_engine(
     settings.database_url.replace("sqlite://", "sqlite+aiosqlite://"),
-    echo=settings.debug
+    echo=settings.debug,
+    query_cache_size=settings.db_query_cache_size,
+    json_serializer=orjson_serializer,
+    json_deserializer=orjson.loads,
+    **engine_pool_options(settings.database_url),
 )
+register_sqlite_pragmas(engine.sync_engine)
 
 # Create session factory
 async_session_factory = async_sessionmaker(
@@ -27,6 +36,76 @@ async_session_factory = async_sessionmaker(
 )
 
 
+def _json_merge(column, patch: Dict[str, Any]):
+    """
+    Build a SQL expression merging patch into a JSON object column.
+    
+    The merge is shallow on every database, like dict.update: each top-level
+    key of patch replaces the stored value whole, nested objects included, and
+    a None value is stored as JSON null rather than deleting the key.
+    """
+    # Jobs created without metadata hold SQL NULL or JSON null; both start empty
+    if engine.dialect.name == "postgresql":
+        stored = cast(column, JSONB)
+        current = case((func.jsonb_typeof(stored) == "object", stored), else_=cast("{}", JSONB))
+        return current.op("||")(bindparam("metadata_patch", patch, type_=JSONB))
+    # SQLite's json_patch follows RFC 7396 (deep merge, null deletes), so set
+    # each top-level key instead. Keys are plain identifiers, used as quoted labels
+    current = case((func.json_type(column) == "object", column), else_="{}")
+    paths_and_values = []
+    for key, value in patch.items():
+        paths_and_values += [f'$."{key}"', func.json(literal(value, JSON))]
+    return func.json_set(current, *paths_and_values)
+
+
+# Read statements built once at import; each call only binds parameters, so
+# SQLAlchemy skips rebuilding the expression tree and hits its compiled cache
+_GET_JOB = select(AnalysisJob).where(AnalysisJob.task_id == bindparam("task_id"))
+
+# (created_at, task_id) of the last job on a page; list_jobs resumes after it
+JobCursor = Tuple[datetime, str]
+
+
+def _list_jobs_stmt(by_status: bool, after_cursor: bool):
+    """Build a newest-first job page query using keyset pagination."""
+    stmt = select(AnalysisJob)
+    if by_status:
+        stmt = stmt.where(AnalysisJob.status == bindparam("status"))
+    if after_cursor:
+        cursor_created_at = bindparam("cursor_created_at", type_=AnalysisJob.created_at.type)
+        if engine.dialect.name == "sqlite":
+            # Server defaults store whole seconds; normalize the bound value to
+            # the same text format so equal timestamps compare equal
+            cursor_created_at = func.datetime(cursor_created_at)
+        stmt = stmt.where(
+            tuple_(AnalysisJob.created_at, AnalysisJob.task_id)
+            < tuple_(cursor_created_at, bindparam("cursor_task_id"))
+        )
+    return stmt.order_by(
+        desc(AnalysisJob.created_at), desc(AnalysisJob.task_id)
+    ).limit(bindparam("limit"))
+
+
+_LIST_JOBS = {
+    (by_status, after_cursor): _list_jobs_stmt(by_status, after_cursor)
+    for by_status in (False, True)
+    for after_cursor in (False, True)
+}
+
+_GET_AGENT_LOGS = (
+    select(AgentLog)
+    .where(AgentLog.task_id == bindparam("task_id"))
+    .order_by(AgentLog.timestamp)
+)
+_GET_AGENT_LOGS_BY_TOOL = (
+    select(AgentLog)
+    .where(AgentLog.task_id == bindparam("task_id"), AgentLog.action_tool == bindparam("action_tool"))
+    .order_by(AgentLog.timestamp)
+)
+
+_GET_FINAL_REPORT = select(FinalReport).where(FinalReport.task_id == bindparam("task_id"))
+
+
 class DatabaseService:
     """Database service for managing analysis jobs and results."""
     
@@ -45,17 +124,14 @@ class DatabaseService:
         try:
             job = AnalysisJob(
                 task_id=task_id,
-                source_type=source_type,
-                source_location=source_location,
+                input_source_type=source_type,
+                input_source_path=source_location,
                 status=status,
-                metadata=json.dumps(metadata) if metadata else None,
-                created_at=datetime.now(),
-                updated_at=datetime.now()
+                analysis_metadata=metadata
             )
             
             self.session.add(job)
             await self.session.commit()
-            await self.session.refresh(job)
             
             logger.info(f"Created analysis job: {task_id}")
             return job
@@ -68,8 +144,7 @@ class DatabaseService:
     async def get_job(self, task_id: str) -> Optional[AnalysisJob]:
         """Get an analysis job by task ID."""
         try:
-            stmt = select(AnalysisJob).where(AnalysisJob.task_id == task_id)
-            result = await self.session.execute(stmt)
+            result = await self.session.execute(_GET_JOB, {"task_id": task_id})
             return result.scalar_one_or_none()
             
         except Exception as e:
@@ -84,29 +159,25 @@ class DatabaseService:
     ) -> bool:
         """Update job status and metadata."""
         try:
-            stmt = select(AnalysisJob).where(AnalysisJob.task_id == task_id)
+            values = {"status": status, "updated_at": func.now()}
+            if metadata:
+                # Merge with existing metadata inside the database
+                values["analysis_metadata"] = _json_merge(AnalysisJob.analysis_metadata, metadata)
+            
+            # Single UPDATE; RETURNING tells us whether the job existed
+            stmt = (
+                update(AnalysisJob)
+                .where(AnalysisJob.task_id == task_id)
+                .values(**values)
+                .returning(AnalysisJob.task_id)
+            )
             result = await self.session.execute(stmt)
-            job = result.scalar_one_or_none()
             
-            if not job:
+            if result.scalar_one_or_none() is None:
+                await self.session.rollback()
                 logger.warning(f"Job {task_id} not found for status update")
                 return False
             
-            job.status = status
-            job.updated_at = datetime.now()
-            
-            if metadata:
-                # Merge with existing metadata
-                existing_metadata = {}
-                if job.metadata:
-                    try:
-                        existing_metadata = json.loads(job.metadata)
-                    except json.JSONDecodeError:
-                        pass
-                
-                existing_metadata.update(metadata)
-                job.metadata = json.dumps(existing_metadata)
-            
             await self.session.commit()
             logger.info(f"Updated job {task_id} status to {status}")
             return True
@@ -119,45 +190,65 @@ class DatabaseService:
     async def list_jobs(
         self,
         limit: int = 50,
-        offset: int = 0,
+        cursor: Optional[JobCursor] = None,
         status_filter: Optional[str] = None
-    ) -> List[AnalysisJob]:
-        """List analysis jobs with optional filtering."""
+    ) -> Tuple[List[AnalysisJob], Optional[JobCursor]]:
+        """
+        List analysis jobs newest first, one keyset page at a time.
+        
+        Args:
+            limit: Maximum number of jobs to return
+            cursor: next_cursor from the previous page; None for the first page
+            status_filter: Only return jobs with this status
+            
+        Returns:
+            The page of jobs and the cursor for the next page (None when the
+            page was not full)
+        """
         try:
-            stmt = select(AnalysisJob).order_by(desc(AnalysisJob.created_at))
+            params: Dict[str, Any] = {"limit": limit}
             
             if status_filter:
-                stmt = stmt.where(AnalysisJob.status == status_filter)
+                params["status"] = status_filter
             
-            stmt = stmt.limit(limit).offset(offset)
+            if cursor:
+                params["cursor_created_at"], params["cursor_task_id"] = cursor
             
-            result = await self.session.execute(stmt)
-            return result.scalars().all()
+            stmt = _LIST_JOBS[(bool(status_filter), bool(cursor))]
+            result = await self.session.execute(stmt, params)
+            jobs = result.scalars().all()
+            
+            next_cursor = None
+            if len(jobs) == limit:
+                next_cursor = (jobs[-1].created_at, jobs[-1].task_id)
+            return jobs, next_cursor
             
         except Exception as e:
             logger.error(f"Failed to list jobs: {e}")
-            return []
+            return [], None
     
     async def log_agent_action(
         self,
         task_id: str,
-        action_type: str,
-        action_data: Dict[str, Any],
-        tool_name: Optional[str] = None
+        step_index: int,
+        thought: str,
+        action_tool: str,
+        action_input: str,
+        observation: str
     ) -> AgentLog:
-        """Log an agent action."""
+        """Log one thought/action/observation step of the agent."""
         try:
             log_entry = AgentLog(
                 task_id=task_id,
-                action_type=action_type,
-                action_data=json.dumps(action_data),
-                tool_name=tool_name,
-                timestamp=datetime.now()
+                step_index=step_index,
+                thought=thought,
+                action_tool=action_tool,
+                action_input=action_input,
+                observation=observation
             )
             
             self.session.add(log_entry)
             await self.session.commit()
-            await self.session.refresh(log_entry)
             
             return log_entry
             
@@ -166,21 +257,58 @@ class DatabaseService:
             logger.error(f"Failed to log agent action for {task_id}: {e}")
             raise
     
+    async def log_agent_actions_bulk(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert many agent log rows in one executemany and a single commit.
+        
+        Args:
+            rows: Dicts with task_id, step_index, thought, action_tool,
+                action_input, observation and an optional timestamp key
+            
+        Returns:
+            Number of rows written
+        """
+        if not rows:
+            return 0
+        
+        try:
+            now = datetime.now(timezone.utc)
+            params = [
+                {
+                    "task_id": row["task_id"],
+                    "step_index": row["step_index"],
+                    "thought": row["thought"],
+                    "action_tool": row["action_tool"],
+                    "action_input": row["action_input"],
+                    "observation": row["observation"],
+                    "timestamp": row.get("timestamp") or now,
+                }
+                for row in rows
+            ]
+            await self.session.execute(insert(AgentLog), params)
+            await self.session.commit()
+            return len(params)
+            
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Failed to bulk log {len(rows)} agent actions: {e}")
+            raise
+    
     async def get_agent_logs(
         self,
         task_id: str,
-        action_type: Optional[str] = None
+        action_tool: Optional[str] = None
     ) -> List[AgentLog]:
         """Get agent logs for a task."""
         try:
-            stmt = select(AgentLog).where(AgentLog.task_id == task_id)
-            
-            if action_type:
-                stmt = stmt.where(AgentLog.action_type == action_type)
+            params = {"task_id": task_id}
+            stmt = _GET_AGENT_LOGS
             
-            stmt = stmt.order_by(AgentLog.timestamp)
+            if action_tool:
+                stmt = _GET_AGENT_LOGS_BY_TOOL
+                params["action_tool"] = action_tool
             
-            result = await self.session.execute(stmt)
+            result = await self.session.execute(stmt, params)
             return result.scalars().all()
             
         except Exception as e:
@@ -196,13 +324,11 @@ class DatabaseService:
         try:
             report = FinalReport(
                 task_id=task_id,
-                report_data=json.dumps(report_data),
-                generated_at=datetime.now()
+                report_content=report_data
             )
             
             self.session.add(report)
             await self.session.commit()
-            await self.session.refresh(report)
             
             logger.info(f"Created final report for task: {task_id}")
             return report
@@ -215,16 +341,12 @@ class DatabaseService:
     async def get_final_report(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get final report by task ID."""
         try:
-            stmt = select(FinalReport).where(FinalReport.task_id == task_id)
-            result = await self.session.execute(stmt)
+            result = await self.session.execute(_GET_FINAL_REPORT, {"task_id": task_id})
             report = result.scalar_one_or_none()
             
-            if report and report.report_data:
-                try:
-                    return json.loads(report.report_data)
-                except json.JSONDecodeError:
-                    logger.warning(f"Invalid JSON in final report for {task_id}")
-                    return None
+            if report and report.report_content:
+                # JSON column: the driver has already decoded it
+                return report.report_content
             
             return None
             
@@ -235,24 +357,16 @@ class DatabaseService:
     async def delete_job(self, task_id: str) -> bool:
         """Delete a job and all related data."""
         try:
-            # Delete agent logs
-            await self.session.execute(
-                select(AgentLog).where(AgentLog.task_id == task_id)
+            # Children are deleted explicitly rather than relying on ON DELETE
+            # CASCADE, which SQLite only honours with PRAGMA foreign_keys=ON
+            await self.session.execute(delete(AgentLog).where(AgentLog.task_id == task_id))
+            await self.session.execute(delete(FinalReport).where(FinalReport.task_id == task_id))
+            result = await self.session.execute(
+                delete(AnalysisJob).where(AnalysisJob.task_id == task_id)
             )
+            await self.session.commit()
             
-            # Delete final report
-            await self.session.execute(
-                select(FinalReport).where(FinalReport.task_id == task_id)
-            )
-            
-            # Delete job
-            stmt = select(AnalysisJob).where(AnalysisJob.task_id == task_id)
-            result = await self.session.execute(stmt)
-            job = result.scalar_one_or_none()
-            
-            if job:
-                await self.session.delete(job)
-                await self.session.commit()
+            if result.rowcount > 0:
                 logger.info(f"Deleted job and related data: {task_id}")
                 return True
             
@@ -264,6 +378,59 @@ class DatabaseService:
             return False
 
 
+class AgentLogBuffer:
+    """
+    Buffers agent log rows and writes them with log_agent_actions_bulk.
+    
+    Rows are flushed once max_size are pending or the oldest pending row is
+    older than max_delay seconds, and on exiting the async context.
+    """
+    
+    def __init__(self, db_service: DatabaseService, max_size: int = 100, max_delay: float = 0.25):
+        self.db_service = db_service
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._rows: List[Dict[str, Any]] = []
+        self._oldest: Optional[float] = None
+    
+    async def add(
+        self,
+        task_id: str,
+        step_index: int,
+        thought: str,
+        action_tool: str,
+        action_input: str,
+        observation: str
+    ) -> None:
+        """Queue one agent step, flushing if the batch is full or stale."""
+        if not self._rows:
+            self._oldest = time.monotonic()
+        self._rows.append({
+            "task_id": task_id,
+            "step_index": step_index,
+            "thought": thought,
+            "action_tool": action_tool,
+            "action_input": action_input,
+            "observation": observation,
+            # Stamped when queued, not when flushed, to keep step order accurate
+            "timestamp": datetime.now(timezone.utc),
+        })
+        if len(self._rows) >= self.max_size or time.monotonic() - self._oldest >= self.max_delay:
+            await self.flush()
+    
+    async def flush(self) -> int:
+        """Write all pending rows in one batch."""
+        rows, self._rows = self._rows, []
+        self._oldest = None
+        return await self.db_service.log_agent_actions_bulk(rows)
+    
+    async def __aenter__(self) -> "AgentLogBuffer":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.flush()
+
+
 # Database session dependency
 async def get_db_session() -> AsyncSession:
     """Get database session."""
@@ -291,4 +458,21 @@ async def create_tables():
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Failed to create database tables: {e}")
-        raise 
\ No newline at end of file
+        raise
+
+
+async def drop_tables():
+    """Drop database tables. Use with caution!"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+async def close_engine():
+    """Refresh SQLite planner statistics and close pooled connections (call on shutdown)."""
+    if engine.dialect.name == "sqlite":
+        try:
+            async with engine.connect() as conn:
+                await conn.exec_driver_sql("PRAGMA optimize")
+        except Exception as e:
+            logger.warning(f"PRAGMA optimize failed: {e}")
+    await engine.dispose()
@@ -0,0 +1,42 @@
+"""
+SQLite connection tuning shared by the sync and async engines.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Applied to every new SQLite connection. WAL lets readers proceed during a
+# write and, with synchronous=NORMAL, makes a commit one sequential append.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=2147483648",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+def register_sqlite_pragmas(engine: Engine) -> None:
+    """
+    Run SQLITE_PRAGMAS on each connection the engine opens.
+
+    Does nothing for non-SQLite engines. For an AsyncEngine pass
+    ``engine.sync_engine``.
+
+    Args:
+        engine: Synchronous engine (or an async engine's sync_engine)
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
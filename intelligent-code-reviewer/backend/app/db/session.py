@@ -1,17 +1,68 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.pool import StaticPool
+from typing import Any, Dict, Generator
 from contextlib import contextmanager
+import orjson
 
 from ..core.config import settings
+from .pragmas import register_sqlite_pragmas
 
-# Create SQLAlchemy engine
+
+def engine_pool_options(database_url: str) -> Dict[str, Any]:
+    """
+    Connection pool arguments shared by the sync and async engines.
+    
+    - In-memory SQLite lives inside one connection, so every session must
+      share it through a StaticPool.
+    - File SQLite keeps a sized pool of local connections; WAL (see
+      pragmas.py) lets them read concurrently and there is no server link
+      to ping or recycle.
+    - Server databases also pre-ping and recycle pooled connections so
+      ones dropped by the server or a proxy are never handed out.
+    
+    Args:
+        database_url: Database URL the engine is created for
+        
+    Returns:
+        Keyword arguments for create_engine / create_async_engine
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        if url.database in (None, "", ":memory:"):
+            return {"poolclass": StaticPool}
+        return {
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+        }
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+
+def orjson_serializer(value: Any) -> str:
+    """Encode JSON column values with orjson (naive datetimes as UTC, numpy natively)."""
+    return orjson.dumps(value, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
+# Synchronous engine for the remaining sync call paths (api/main.py, the admin
+# API, ProgressTracker and their tests); async code uses db/database.py, which
+# also owns table creation and shutdown
 engine = create_engine(
     settings.database_url,
     connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
     echo=settings.debug,  # Log SQL queries in debug mode
+    query_cache_size=settings.db_query_cache_size,
+    json_serializer=orjson_serializer,
+    json_deserializer=orjson.loads,
+    **engine_pool_options(settings.database_url),
 )
 
+register_sqlite_pragmas(engine)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -55,25 +106,10 @@ def create_tables():
     Create all database tables.
     
     This function creates all tables defined in the SQLAlchemy models.
-    It should be called during application startup.
+    It is meant for scripts; the application creates tables at startup
+    through the async engine in db/database.py.
     """
-    # Import both model files to ensure all tables are created
-    from ..models.sql_models import Base as SqlBase
-    from ..models.analysis import Base as AnalysisBase
+    from ..models import Base
     
-    # Create tables from both base classes
-    SqlBase.metadata.create_all(bind=engine)
-    AnalysisBase.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
 
-
-def drop_tables():
-    """
-    Drop all database tables.
-    
-    This function drops all tables. Use with caution!
-    """
-    from ..models.sql_models import Base as SqlBase
-    from ..models.analysis import Base as AnalysisBase
-    
-    SqlBase.metadata.drop_all(bind=engine)
-    AnalysisBase.metadata.drop_all(bind=engine) 
\ No newline at end of file
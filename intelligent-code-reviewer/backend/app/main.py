@@ -1,9 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from .api.main import router as api_router
 from .core.config import settings
-from .db.session import create_tables
+from .db.database import close_engine, create_tables
+from .db.session import engine as sync_engine
 
 
 def create_application() -> FastAPI:
@@ -20,12 +22,13 @@ def create_application() -> FastAPI:
         description=settings.app_description,
         docs_url="/docs",
         redoc_url="/redoc",
+        default_response_class=ORJSONResponse,
     )
     
     # Add CORS middleware
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=settings.cors_origins,
+        allow_origins=settings.cors_origins_set,
         allow_credentials=settings.cors_allow_credentials,
         allow_methods=settings.cors_allow_methods,
         allow_headers=settings.cors_allow_headers,
@@ -36,8 +39,14 @@ def create_application() -> FastAPI:
     
     @app.on_event("startup")
     async def startup_event():
-        """Initialize database on startup."""
-        create_tables()
+        """Initialize database on startup without blocking the event loop."""
+        await create_tables()
+    
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        """Refresh SQLite planner statistics and release both connection pools."""
+        await close_engine()
+        sync_engine.dispose()
     
     @app.get("/")
     async def root():
@@ -0,0 +1,16 @@
+"""
+ORM models. Importing this package registers every table on ``Base.metadata``.
+"""
+
+from .base import Base
+from .sql_models import AnalysisJob, AgentLog, FinalReport
+from .analysis import AnalysisStatus, AnalysisStep
+
+__all__ = [
+    "Base",
+    "AnalysisJob",
+    "AgentLog",
+    "FinalReport",
+    "AnalysisStatus",
+    "AnalysisStep",
+]
@@ -2,13 +2,13 @@
 Enhanced analysis models with detailed progress tracking.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Boolean, JSON
-from sqlalchemy.ext.declarative import declarative_base
-from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Boolean, JSON, Index
 from enum import Enum
-from typing import Optional, Dict, Any
+from typing import Optional
 
-Base = declarative_base()
+from .base import Base
+# AnalysisJob lives in sql_models; re-exported for progress tracking callers
+from .sql_models import AnalysisJob  # noqa: F401
 
 
 class AnalysisStatus(str, Enum):
@@ -25,72 +25,6 @@ class AnalysisStatus(str, Enum):
     CANCELLED = "CANCELLED"
 
 
-class AnalysisJob(Base):
-    """Enhanced analysis job model with detailed tracking."""
-    
-    __tablename__ = "analysis_jobs"
-    
-    # Core fields
-    task_id = Column(String(36), primary_key=True, index=True, nullable=False)  # UUID format
-    
-    # Source information
-    input_source_type = Column(String, nullable=False)  # 'git_url' or 'zip_file'
-    input_source_path = Column(String, nullable=False)  # URL or filename
-    
-    # Status tracking
-    status = Column(String, nullable=False, default=AnalysisStatus.PENDING)
-    progress_percentage = Column(Float, default=0.0)
-    current_step = Column(String, nullable=True)
-    
-    # Timing information
-    created_at = Column(DateTime, default=datetime.utcnow)
-    started_at = Column(DateTime, nullable=True)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    completed_at = Column(DateTime, nullable=True)
-    
-    # Progress details
-    total_files = Column(Integer, default=0)
-    processed_files = Column(Integer, default=0)
-    total_tools = Column(Integer, default=13)  # We have 13 analysis tools
-    completed_tools = Column(Integer, default=0)
-    
-    # Results and errors
-    error_message = Column(Text, nullable=True)
-    error_details = Column(JSON, nullable=True)
-    warnings = Column(JSON, nullable=True)
-    
-    # Metadata
-    analysis_metadata = Column(JSON, nullable=True)  # Store additional info
-    
-    def get_duration(self) -> Optional[float]:
-        """Get analysis duration in seconds."""
-        if self.started_at and self.completed_at:
-            return (self.completed_at - self.started_at).total_seconds()
-        elif self.started_at:
-            return (datetime.utcnow() - self.started_at).total_seconds()
-        return None
-    
-    def get_progress_details(self) -> Dict[str, Any]:
-        """Get detailed progress information."""
-        return {
-            "status": self.status,
-            "progress_percentage": self.progress_percentage,
-            "current_step": self.current_step,
-            "files_progress": f"{self.processed_files}/{self.total_files}",
-            "tools_progress": f"{self.completed_tools}/{self.total_tools}",
-            "duration": self.get_duration(),
-            "estimated_remaining": self.estimate_remaining_time(),
-        }
-    
-    def estimate_remaining_time(self) -> Optional[float]:
-        """Estimate remaining time based on current progress."""
-        if self.progress_percentage > 0 and self.started_at:
-            elapsed = (datetime.utcnow() - self.started_at).total_seconds()
-            estimated_total = elapsed / (self.progress_percentage / 100)
-            return max(0, estimated_total - elapsed)
-        return None
-
-
 class AnalysisStep(Base):
     """Individual analysis step tracking."""
     
@@ -115,6 +49,11 @@ class AnalysisStep(Base):
     execution_time = Column(Float, nullable=True)
     memory_usage = Column(Float, nullable=True)
     
+    __table_args__ = (
+        # Per-task step history ordered by start time
+        Index("ix_steps_task_id_started_at", task_id, started_at),
+    )
+    
     def get_duration(self) -> Optional[float]:
         """Get step duration in seconds."""
         if self.started_at and self.completed_at:
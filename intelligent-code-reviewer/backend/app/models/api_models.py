@@ -1,4 +1,4 @@
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 from pydantic import BaseModel, HttpUrl, Field
 from datetime import datetime
 
@@ -9,6 +9,13 @@ class AnalyzeUrlRequest(BaseModel):
     git_url: HttpUrl = Field(..., description="The Git repository URL to analyze")
 
 
+class AnalyzeURLRequest(BaseModel):
+    """Request model for the agent-based Git repository analysis."""
+    git_url: str = Field(..., description="The Git repository URL to analyze")
+    branch: str = Field("main", description="Branch to analyze")
+    analysis_requirements: Optional[List[str]] = Field(None, description="Specific analysis requirements")
+
+
 class AnalyzeZipRequest(BaseModel):
     """Request model for analyzing an uploaded ZIP file."""
     # This will be handled as multipart/form-data in the endpoint
@@ -22,6 +29,14 @@ class AnalyzeResponse(BaseModel):
     message: str = Field(..., description="Success message")
 
 
+class AnalysisResponse(BaseModel):
+    """Response model for the agent-based analyze endpoints."""
+    task_id: str = Field(..., description="Unique identifier for the analysis task")
+    status: str = Field(..., description="Job status when the request was accepted")
+    message: str = Field(..., description="Success message")
+    estimated_completion_time: Optional[str] = Field(None, description="Rough time until the report is ready")
+
+
 class JobStatus(BaseModel):
     """Model representing the current status of an analysis job."""
     status: Literal["PENDING", "PROCESSING_RAG", "PROCESSING_AGENT", "COMPLETE", "FAILED"]
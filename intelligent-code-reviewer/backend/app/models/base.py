@@ -0,0 +1,10 @@
+"""
+Declarative base shared by every ORM model.
+
+All tables register on this single metadata so they can be created, dropped
+and related to each other in one pass.
+"""
+
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any
 
-Base = declarative_base()
+from .base import Base
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Return a timestamp as aware UTC; SQLite hands timezone=True columns back naive."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
 
 
 class AnalysisJob(Base):
@@ -21,8 +26,11 @@ class AnalysisJob(Base):
         String(20), 
         nullable=False, 
         default="PENDING",
-        comment="Job status: PENDING, PROCESSING_RAG, PROCESSING_AGENT, COMPLETE, FAILED"
+        comment="Job status: PENDING, PROCESSING_RAG, PROCESSING_AGENT, COMPLETE, FAILED "
+                "or one of the detailed AnalysisStatus values"
     )
+    progress_percentage = Column(Float, default=0.0)
+    current_step = Column(String, nullable=True)
     input_source_type = Column(
         String(20), 
         nullable=False,
@@ -38,22 +46,72 @@ class AnalysisJob(Base):
         server_default=func.now(),
         nullable=False
     )
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     completed_at = Column(
         DateTime(timezone=True), 
         nullable=True
     )
+    
+    # Progress details
+    total_files = Column(Integer, default=0)
+    processed_files = Column(Integer, default=0)
+    total_tools = Column(Integer, default=13)  # We have 13 analysis tools
+    completed_tools = Column(Integer, default=0)
+    
     error_message = Column(
         Text,
         nullable=True,
         comment="Error details if status is FAILED"
     )
+    error_details = Column(JSON, nullable=True)
+    warnings = Column(JSON, nullable=True)
+    warnings_count = Column(Integer, default=0, nullable=False)  # Kept in sync with warnings
+    analysis_metadata = Column(JSON, nullable=True)  # Store additional info
     
     # Relationships
     agent_logs = relationship("AgentLog", back_populates="analysis_job", cascade="all, delete-orphan")
     final_report = relationship("FinalReport", back_populates="analysis_job", uselist=False, cascade="all, delete-orphan")
     
+    __table_args__ = (
+        # Status filter + newest-first listing (/admin/jobs/all, list_jobs keyset pages)
+        Index("ix_jobs_status_created_at", status, created_at.desc(), task_id.desc()),
+        # Unfiltered keyset pages over (created_at, task_id)
+        Index("idx_jobs_created_tid", created_at.desc(), task_id.desc()),
+        # Time-window filters (/admin/jobs/all?hours=, /admin/stats)
+        Index("ix_jobs_created_at", created_at),
+    )
+    
     def __repr__(self):
         return f"<AnalysisJob(task_id='{self.task_id}', status='{self.status}')>"
+    
+    def get_duration(self) -> Optional[float]:
+        """Get analysis duration in seconds."""
+        if self.started_at and self.completed_at:
+            return (_as_utc(self.completed_at) - _as_utc(self.started_at)).total_seconds()
+        elif self.started_at:
+            return (datetime.now(timezone.utc) - _as_utc(self.started_at)).total_seconds()
+        return None
+    
+    def get_progress_details(self) -> Dict[str, Any]:
+        """Get detailed progress information."""
+        return {
+            "status": self.status,
+            "progress_percentage": self.progress_percentage,
+            "current_step": self.current_step,
+            "files_progress": f"{self.processed_files}/{self.total_files}",
+            "tools_progress": f"{self.completed_tools}/{self.total_tools}",
+            "duration": self.get_duration(),
+            "estimated_remaining": self.estimate_remaining_time(),
+        }
+    
+    def estimate_remaining_time(self) -> Optional[float]:
+        """Estimate remaining time based on current progress."""
+        if self.progress_percentage > 0 and self.started_at:
+            elapsed = (datetime.now(timezone.utc) - _as_utc(self.started_at)).total_seconds()
+            estimated_total = elapsed / (self.progress_percentage / 100)
+            return max(0, estimated_total - elapsed)
+        return None
 
 
 class AgentLog(Base):
@@ -77,6 +135,9 @@ class AgentLog(Base):
         nullable=False,
         comment="The sequence number of the step (1, 2, 3...)"
     )
+    # thought/action_input/observation hold plain text, not nested structures,
+    # so a binary encoding (msgpack/CBOR) would not shrink them; they stay TEXT
+    # so the audit trail remains readable with ordinary SQL tools.
     thought = Column(
         Text, 
         nullable=False,
@@ -106,6 +167,12 @@ class AgentLog(Base):
     # Relationships
     analysis_job = relationship("AnalysisJob", back_populates="agent_logs")
     
+    __table_args__ = (
+        # Per-task log listing in timestamp order, optionally filtered by tool
+        Index("idx_agent_logs_task_ts", "task_id", "timestamp"),
+        Index("idx_agent_logs_task_action_ts", "task_id", "action_tool", "timestamp"),
+    )
+    
     def __repr__(self):
         return f"<AgentLog(log_id={self.log_id}, task_id='{self.task_id}', step={self.step_index})>"
 
@@ -5,17 +5,166 @@ This module defines the base interface that all analysis playbooks must implemen
 to ensure consistent behavior and integration with the AI Agent.
 """
 
+import ast
 import asyncio
+import hashlib
 import logging
+import re
+from collections import Counter
+from functools import lru_cache
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
+import numpy as np
+
+from ..core.cache import LRUCache
+from ..core.config import settings
 from ..services.ai_agent import AnalysisResult, AnalysisStatus, SeverityLevel, AgentContext
+from ..services.vector_store import get_vector_store
 
 
 logger = logging.getLogger(__name__)
 
+# Vector search results keyed by (collection, generation, query, k); playbooks
+# re-issue the same fixed queries on every run, so repeats skip embedding and the
+# index query. Rebuilding or extending a collection bumps its generation, so
+# entries from before are never served again and simply age out
+_pattern_cache = LRUCache(
+    maxsize=settings.pattern_search_cache_size,
+    ttl=settings.pattern_search_cache_ttl
+)
+
+# Python ASTs keyed by a digest of the parsed source. The same chunk is returned
+# for several queries and walked by several playbooks; cached trees are only read
+_parsed_python = LRUCache(maxsize=1024)
+
+# Cached in place of a tree for source that does not parse
+_UNPARSABLE = object()
+
+
+def _load_python_ast(content: str) -> Any:
+    """Parse Python source, or return _UNPARSABLE if it is not valid Python."""
+    try:
+        return ast.parse(content)
+    except (SyntaxError, ValueError):
+        return _UNPARSABLE
+
+
+# Keyword tallies for _analyze_code_metrics, gathered in one scan of the content
+_METRIC_RE = re.compile(
+    r"(?P<method>\bdef )"
+    r"|(?P<class_>\bclass )"
+    r"|(?P<function>\bfunction )"
+    r"|(?P<branch>\b(?:if|for|while) )"
+    r"|(?P<import_>\b(?:import|from) )"
+)
+
+
+# Severity summary lines for _generate_targeted_recommendations, most severe first
+_SEVERITY_RECS = (
+    ("critical", "🚨 CRITICAL: Address {count} critical {playbook_type} issues immediately"),
+    ("high", "⚠️ HIGH: Fix {count} high-priority {playbook_type} issues"),
+)
+
+# General advice appended after the severity summary, per playbook type
+_GENERAL_RECS = {
+    "god_class": (
+        "🎯 Break large classes into smaller, single-responsibility classes",
+        "📦 Extract related methods into separate service classes",
+        "🔧 Apply the Single Responsibility Principle (SRP)"
+    ),
+    "circular_dependency": (
+        "🔄 Refactor code to eliminate circular imports",
+        "📐 Introduce interfaces or abstract base classes",
+        "🏗️ Reorganize module structure for better separation"
+    ),
+    "high_complexity": (
+        "⚡ Simplify complex functions using Extract Method pattern",
+        "🎯 Reduce cyclomatic complexity through guard clauses",
+        "🔧 Break down large methods into smaller, focused functions"
+    ),
+    "dependency_health": (
+        "📦 Update outdated dependencies to latest stable versions",
+        "🛡️ Address security vulnerabilities in dependencies",
+        "🔒 Pin dependency versions for reproducible builds"
+    ),
+    "hardcoded_secrets": (
+        "🔐 Move secrets to environment variables immediately",
+        "🛡️ Use secure secret management systems",
+        "🔍 Implement automated secret scanning in CI/CD"
+    ),
+    "idor_vulnerability": (
+        "🔒 Implement proper authorization checks",
+        "🛡️ Use parameterized queries and input validation",
+        "🔍 Add access control verification for all object references"
+    )
+}
+
+
+@lru_cache(maxsize=256)
+def _targeted_recommendations(playbook_type: str, severity_counts: Tuple[int, ...]) -> Tuple[str, ...]:
+    """
+    Build the recommendation lines for a playbook type and severity profile.
+    
+    The text depends only on these arguments, so repeated runs reuse it.
+    
+    Args:
+        playbook_type: Playbook type key into _GENERAL_RECS
+        severity_counts: Finding count for each _SEVERITY_RECS entry, in order
+        
+    Returns:
+        Up to six recommendations
+    """
+    recommendations = []
+    
+    # Add severity-based recommendations
+    for (severity, template), count in zip(_SEVERITY_RECS, severity_counts):
+        if count > 0:
+            recommendations.append(template.format(count=count, playbook_type=playbook_type))
+    
+    # Add general recommendations based on playbook type
+    recommendations.extend(_GENERAL_RECS.get(playbook_type, ()))
+    
+    return tuple(recommendations[:6])  # Limit to top 6 recommendations
+
+
+# Below this many lines building NumPy string arrays costs more than it saves
+_VECTORIZED_INDENT_MIN_LINES = 64
+
+
+def _indent_profile(lines: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute per-line indentation and a mask of lines that can end a block.
+    
+    Args:
+        lines: Source lines
+        
+    Returns:
+        Indent width of each line, and whether each line is code (neither
+        blank nor a comment)
+    """
+    if len(lines) < _VECTORIZED_INDENT_MIN_LINES:
+        lstripped = [line.lstrip() for line in lines]
+        indents = np.fromiter(
+            (len(line) - len(rest) for line, rest in zip(lines, lstripped)),
+            dtype=np.int32,
+            count=len(lines)
+        )
+        can_end = np.fromiter(
+            (bool(rest) and not rest.startswith('#') for rest in lstripped),
+            dtype=bool,
+            count=len(lines)
+        )
+        return indents, can_end
+    
+    line_array = np.array(lines)
+    lstripped = np.char.lstrip(line_array)
+    stripped_lengths = np.char.str_len(lstripped)
+    indents = (np.char.str_len(line_array) - stripped_lengths).astype(np.int32)
+    can_end = (stripped_lengths > 0) & ~np.char.startswith(lstripped, '#')
+    return indents, can_end
+
 
 class BasePlaybook(ABC):
     """
@@ -96,27 +245,40 @@ class BasePlaybook(ABC):
         all_results = []
         
         try:
-            # Access vector store through the agent context
-            from ..services.vector_store import VectorStore
-            vector_store = VectorStore()
+            collection = context.vector_store_collection
+            vector_store = get_vector_store()
+            generation = vector_store.collection_generation(collection)
+            cached = {
+                query: _pattern_cache.get((collection, generation, query, max_results))
+                for query in search_queries
+            }
+            misses = [query for query, results in cached.items() if results is None]
             
-            for query in search_queries:
-                results = vector_store.search(
-                    context.vector_store_collection,
-                    query,
-                    k=max_results
+            if misses:
+                # One embedding batch and one index query for the uncached queries,
+                # run in a worker thread so concurrently scheduled playbooks
+                # (see AgentOrchestrator) are not serialized behind it
+                loop = asyncio.get_running_loop()
+                batched_results = await loop.run_in_executor(
+                    None, vector_store.batch_search, collection, misses, max_results
                 )
-                
-                for result in results:
+                for query, results in zip(misses, batched_results):
+                    _pattern_cache.set((collection, generation, query, max_results), results)
+                    cached[query] = results
+            
+            for query in search_queries:
+                for result in cached[query]:
+                    # Copied so callers cannot change the cached result
+                    metadata = dict(result["metadata"])
                     all_results.append({
                         "query": query,
                         "content": result["content"],
-                        "metadata": result["metadata"],
-                        "file_path": result["metadata"].get("file_path", "unknown"),
-                        "language": result["metadata"].get("language", "unknown"),
-                        "chunk_type": result["metadata"].get("chunk_type", "unknown"),
-                        "start_line": result["metadata"].get("start_line", 1),
-                        "end_line": result["metadata"].get("end_line", 1)
+                        "metadata": metadata,
+                        "file_path": metadata.get("file_path", "unknown"),
+                        "language": metadata.get("language", "unknown"),
+                        "chunk_type": metadata.get("chunk_type", "unknown"),
+                        "start_line": metadata.get("start_line", 1),
+                        "end_line": metadata.get("end_line", 1)
                     })
             
             self.logger.info(f"Found {len(all_results)} patterns across {len(search_queries)} queries")
@@ -139,32 +301,47 @@ class BasePlaybook(ABC):
         Returns:
             Dictionary with basic metrics
         """
-        lines = content.split('\n')
-        non_empty_lines = [line for line in lines if line.strip()]
+        total_lines = code_lines = comment_lines = blank_lines = 0
+        for line in content.split('\n'):
+            total_lines += 1
+            stripped = line.lstrip()
+            if not stripped:
+                blank_lines += 1
+                continue
+            code_lines += 1
+            if stripped.startswith(('#', '//')):
+                comment_lines += 1
+        
+        counts = Counter(match.lastgroup for match in _METRIC_RE.finditer(content))
         
         return {
-            "total_lines": len(lines),
-            "code_lines": len(non_empty_lines),
-            "comment_lines": len([line for line in lines if line.strip().startswith('#') or line.strip().startswith('//')]),
-            "blank_lines": len(lines) - len(non_empty_lines),
-            "method_count": content.count('def '),
-            "class_count": content.count('class '),
-            "function_count": content.count('function '),
-            "complexity_indicators": content.count('if ') + content.count('for ') + content.count('while '),
-            "import_count": content.count('import ') + content.count('from ')
+            "total_lines": total_lines,
+            "code_lines": code_lines,
+            "comment_lines": comment_lines,
+            "blank_lines": blank_lines,
+            "method_count": counts["method"],
+            "class_count": counts["class_"],
+            "function_count": counts["function"],
+            "complexity_indicators": counts["branch"],
+            "import_count": counts["import_"]
         }
     
     def _extract_code_elements(
         self,
         content: str,
-        element_type: str = "class"
+        element_type: str = "class",
+        language: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Extract specific code elements (classes, functions, etc.) from content.
         
+        Python content that parses is read from its AST, which gives exact
+        element boundaries; anything else falls back to a line scan.
+        
         Args:
             content: Code content
             element_type: Type of element to extract ('class', 'function', 'method')
+            language: Source language of the content, if known
             
         Returns:
             List of extracted elements with metadata
@@ -172,6 +349,11 @@ class BasePlaybook(ABC):
         elements = []
         lines = content.split('\n')
         
+        if language == "python":
+            python_elements = self._extract_python_elements(content, lines, element_type)
+            if python_elements is not None:
+                return python_elements
+        
         if element_type == "class":
             pattern = "class "
         elif element_type in ["function", "method"]:
@@ -179,6 +361,10 @@ class BasePlaybook(ABC):
         else:
             return elements
         
+        # Per-line indent and "can end a body" mask, computed once so each
+        # element's end is found with one vectorized scan
+        indents, can_end = _indent_profile(lines)
+        
         for i, line in enumerate(lines):
             stripped = line.strip()
             if stripped.startswith(pattern):
@@ -190,18 +376,11 @@ class BasePlaybook(ABC):
                 else:
                     continue
                 
-                # Calculate element size (approximate)
-                element_lines = 1
-                indent_level = len(line) - len(line.lstrip())
-                
-                # Look ahead to find element end
-                for j in range(i + 1, len(lines)):
-                    next_line = lines[j]
-                    if next_line.strip():  # Non-empty line
-                        next_indent = len(next_line) - len(next_line.lstrip())
-                        if next_indent <= indent_level and not next_line.strip().startswith('#'):
-                            break
-                    element_lines += 1
+                # Calculate element size (approximate): the body ends at the
+                # first later code line indented no deeper than the header
+                ends = can_end[i + 1:] & (indents[i + 1:] <= indents[i])
+                end = i + 1 + int(ends.argmax()) if ends.any() else len(lines)
+                element_lines = end - i
                 
                 elements.append({
                     "name": name_part,
@@ -214,6 +393,67 @@ class BasePlaybook(ABC):
         
         return elements
     
+    def _extract_python_elements(
+        self,
+        content: str,
+        lines: List[str],
+        element_type: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Extract classes or functions from Python source using its AST.
+        
+        Args:
+            content: Python source
+            lines: content split into lines
+            element_type: Type of element to extract ('class', 'function', 'method')
+            
+        Returns:
+            List of extracted elements in source order, each with its AST
+            node, or None if the content does not parse (e.g. a partial chunk)
+        """
+        if element_type == "class":
+            node_types = (ast.ClassDef,)
+        elif element_type in ["function", "method"]:
+            node_types = (ast.FunctionDef, ast.AsyncFunctionDef)
+        else:
+            return []
+        
+        tree = self._parse_python(content)
+        if tree is None:
+            return None
+        
+        nodes = sorted(
+            (node for node in ast.walk(tree) if isinstance(node, node_types)),
+            key=lambda node: node.lineno
+        )
+        return [
+            {
+                "name": node.name,
+                "type": element_type,
+                "line_start": node.lineno,
+                "line_end": node.end_lineno,
+                "lines": node.end_lineno - node.lineno + 1,
+                "content": '\n'.join(lines[node.lineno - 1:node.end_lineno]),
+                "node": node
+            }
+            for node in nodes
+        ]
+    
+    def _parse_python(self, content: str) -> Optional[ast.AST]:
+        """
+        Parse Python source, reusing the tree when the same content was parsed before.
+        
+        Args:
+            content: Python source
+            
+        Returns:
+            The module AST, shared with other callers and not to be modified,
+            or None if the content does not parse
+        """
+        digest = hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        tree = _parsed_python.get_or_set(digest, lambda: _load_python_ast(content))
+        return None if tree is _UNPARSABLE else tree
+    
     def _assess_severity_from_metrics(
         self,
         metrics: Dict[str, Any],
@@ -262,58 +502,8 @@ class BasePlaybook(ABC):
         if not findings:
             return [f"✅ No {playbook_type} issues detected - code appears healthy"]
         
-        recommendations = []
-        
-        # Add severity-based recommendations
-        severity_counts = {}
-        for finding in findings:
-            severity = finding.get("severity", "low")
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
-        
-        if severity_counts.get("critical", 0) > 0:
-            recommendations.append(
-                f"🚨 CRITICAL: Address {severity_counts['critical']} critical {playbook_type} issues immediately"
-            )
-        
-        if severity_counts.get("high", 0) > 0:
-            recommendations.append(
-                f"⚠️ HIGH: Fix {severity_counts['high']} high-priority {playbook_type} issues"
-            )
-        
-        # Add general recommendations based on playbook type
-        general_recommendations = {
-            "god_class": [
-                "🎯 Break large classes into smaller, single-responsibility classes",
-                "📦 Extract related methods into separate service classes",
-                "🔧 Apply the Single Responsibility Principle (SRP)"
-            ],
-            "circular_dependency": [
-                "🔄 Refactor code to eliminate circular imports",
-                "📐 Introduce interfaces or abstract base classes",
-                "🏗️ Reorganize module structure for better separation"
-            ],
-            "high_complexity": [
-                "⚡ Simplify complex functions using Extract Method pattern",
-                "🎯 Reduce cyclomatic complexity through guard clauses",
-                "🔧 Break down large methods into smaller, focused functions"
-            ],
-            "dependency_health": [
-                "📦 Update outdated dependencies to latest stable versions",
-                "🛡️ Address security vulnerabilities in dependencies",
-                "🔒 Pin dependency versions for reproducible builds"
-            ],
-            "hardcoded_secrets": [
-                "🔐 Move secrets to environment variables immediately",
-                "🛡️ Use secure secret management systems",
-                "🔍 Implement automated secret scanning in CI/CD"
-            ],
-            "idor_vulnerability": [
-                "🔒 Implement proper authorization checks",
-                "🛡️ Use parameterized queries and input validation",
-                "🔍 Add access control verification for all object references"
-            ]
-        }
-        
-        recommendations.extend(general_recommendations.get(playbook_type, []))
-        
-        return recommendations[:6]  # Limit to top 6 recommendations 
\ No newline at end of file
+        severity_counts = Counter(finding.get("severity", "low") for finding in findings)
+        return list(_targeted_recommendations(
+            playbook_type,
+            tuple(severity_counts[severity] for severity, _ in _SEVERITY_RECS)
+        )) 
\ No newline at end of file
@@ -5,11 +5,69 @@ Specialized playbook for detecting circular dependencies, import cycles,
 and problematic dependency chains in the codebase.
 """
 
-from typing import Dict, List, Any, Set
+import re
+from collections import Counter, deque
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Dict, Iterator, List, Any, Optional, Set, Tuple
 from .base_playbook import BasePlaybook
 from ..services.ai_agent import AnalysisResult, AnalysisStatus, SeverityLevel, AgentContext
 
 
+# Python "import x" / "from x import"
+_PY_IMPORT_PATTERN = r"""^[ \t]*(?:import[ \t]+([\w.]+)(?=[ \t]*(?:$|[,;#]|as\b))|from[ \t]+([\w.]+)[ \t]+import\b)"""
+# JS/TS "... from 'x'" and CommonJS require('x')
+_JS_IMPORT_PATTERN = r"""\bfrom[ \t]+['"]([^'"]+)['"]|\brequire\([ \t]*['"]([^'"]+)['"]"""
+
+_PY_IMPORT_RE = re.compile(_PY_IMPORT_PATTERN, re.MULTILINE)
+_JS_IMPORT_RE = re.compile(_JS_IMPORT_PATTERN, re.MULTILINE)
+# Chunks without a known language are scanned for both syntaxes
+_IMPORT_RE = re.compile(f"{_PY_IMPORT_PATTERN}|{_JS_IMPORT_PATTERN}", re.MULTILINE)
+
+_IMPORT_RE_BY_LANGUAGE = {
+    'python': _PY_IMPORT_RE,
+    'py': _PY_IMPORT_RE,
+    'javascript': _JS_IMPORT_RE,
+    'typescript': _JS_IMPORT_RE,
+    'js': _JS_IMPORT_RE,
+    'ts': _JS_IMPORT_RE,
+    'jsx': _JS_IMPORT_RE,
+    'tsx': _JS_IMPORT_RE,
+}
+
+# Top-level packages treated as third-party/stdlib rather than project modules
+EXTERNAL_MODULES = frozenset({
+    'numpy', 'pandas', 'requests', 'flask', 'django', 'react', 'vue',
+    'express', 'lodash', 'moment', 'os', 'sys', 'json', 're'
+})
+
+# Upper bound on reported findings; override with config["max_findings"]
+DEFAULT_MAX_FINDINGS = 500
+
+
+# Chunks of one file (and the same chunk returned for several queries) share
+# a path, so conversions repeat within and across playbook runs
+@lru_cache(maxsize=4096)
+def _file_path_to_module(file_path: str) -> str:
+    """Convert file path to module name."""
+    # Remove common prefixes and file extensions
+    module = file_path.replace('/', '.').replace('\\', '.')
+    
+    # Remove file extensions
+    for ext in ['.py', '.js', '.ts', '.jsx', '.tsx']:
+        if module.endswith(ext):
+            module = module[:-len(ext)]
+            break
+    
+    # Remove common prefixes
+    for prefix in ['src.', 'app.', 'lib.']:
+        if module.startswith(prefix):
+            module = module[len(prefix):]
+            break
+    
+    return module
+
+
 class CircularDependenciesPlaybook(BasePlaybook):
     """
     Playbook for detecting circular dependencies and import cycles.
@@ -32,6 +90,8 @@ class CircularDependenciesPlaybook(BasePlaybook):
         """Execute circular dependencies detection analysis."""
         self.logger.info(f"Starting circular dependencies analysis for task {context.task_id}")
         
+        max_findings = (config or {}).get("max_findings", DEFAULT_MAX_FINDINGS)
+        
         try:
             # Search for import and dependency patterns
             search_queries = [
@@ -55,16 +115,21 @@ class CircularDependenciesPlaybook(BasePlaybook):
                 )
             
             # Build dependency graph
-            dependency_graph = self._build_dependency_graph(code_results)
+            adjacency, module_names = self._build_dependency_graph(code_results)
             
-            # Detect circular dependencies
-            circular_deps = self._detect_cycles(dependency_graph)
-            
-            # Analyze dependency patterns
-            dependency_issues = self._analyze_dependency_patterns(code_results, dependency_graph)
-            
-            # Combine findings
-            all_findings = circular_deps + dependency_issues
+            # Detect circular dependencies and dependency issues lazily, stopping
+            # one past max_findings so truncation can be reported
+            all_findings = list(islice(
+                chain(
+                    self._detect_cycles(adjacency, module_names),
+                    self._analyze_dependency_patterns(adjacency, module_names)
+                ),
+                max_findings + 1
+            ))
+            findings_truncated = len(all_findings) > max_findings
+            del all_findings[max_findings:]
+            circular_deps = [f for f in all_findings if f["type"] == "circular_dependency"]
+            dependency_issue_count = len(all_findings) - len(circular_deps)
             
             # Assess overall severity
             overall_severity = self._assess_circular_deps_severity(all_findings)
@@ -78,15 +143,16 @@ class CircularDependenciesPlaybook(BasePlaybook):
                 status=AnalysisStatus.COMPLETED,
                 severity=overall_severity,
                 title=f"Circular Dependencies Analysis Complete - {len(all_findings)} Issues Found",
-                description=f"Detected {len(circular_deps)} circular dependencies and {len(dependency_issues)} dependency issues that need attention.",
+                description=f"Detected {len(circular_deps)} circular dependencies and {dependency_issue_count} dependency issues that need attention.",
                 findings=all_findings,
                 recommendations=recommendations,
                 confidence_score=0.9,
                 metadata={
                     "playbook_version": self.version,
-                    "modules_analyzed": len(dependency_graph),
+                    "modules_analyzed": len(module_names),
                     "circular_dependencies": len(circular_deps),
-                    "dependency_issues": len(dependency_issues),
+                    "dependency_issues": dependency_issue_count,
+                    "findings_truncated": findings_truncated,
                     "max_cycle_length": max([len(f.get("metadata", {}).get("cycle", [])) for f in circular_deps], default=0)
                 }
             )
@@ -102,185 +168,230 @@ class CircularDependenciesPlaybook(BasePlaybook):
                 metadata={"error": str(e)}
             )
     
-    def _build_dependency_graph(self, code_results: List[Dict[str, Any]]) -> Dict[str, Set[str]]:
-        """Build a dependency graph from import statements."""
-        dependency_graph = {}
+    def _build_dependency_graph(self, code_results: List[Dict[str, Any]]) -> Tuple[List[List[int]], List[str]]:
+        """
+        Build a dependency graph from import statements.
+        
+        Module names are interned to consecutive ints so graph traversal
+        hashes and compares small ints instead of dotted module paths.
+        
+        Returns:
+            Adjacency lists indexed by module id, and the module name for each id
+        """
+        name_to_id: Dict[str, int] = {}
+        id_to_name: List[str] = []
+        adjacency: List[Set[int]] = []
+        # _search_patterns returns the same chunk once per matching query
+        seen_chunks: Set[Tuple[str, str]] = set()
+        
+        def intern(module: str) -> int:
+            module_id = name_to_id.get(module)
+            if module_id is None:
+                module_id = name_to_id[module] = len(id_to_name)
+                id_to_name.append(module)
+                adjacency.append(set())
+            return module_id
         
         for result in code_results:
             file_path = result["file_path"]
             content = result["content"]
             
-            # Convert file path to module name
-            module_name = self._file_path_to_module(file_path)
+            chunk_key = (file_path, content)
+            if chunk_key in seen_chunks:
+                continue
+            seen_chunks.add(chunk_key)
             
-            if module_name not in dependency_graph:
-                dependency_graph[module_name] = set()
+            # Convert file path to module name
+            module_id = intern(_file_path_to_module(file_path))
             
             # Extract imports from content
-            imports = self._extract_imports(content)
+            imports = self._extract_imports(content, result.get("language"))
             
             for imported_module in imports:
                 # Only consider internal modules
                 if self._is_internal_module(imported_module, file_path):
-                    dependency_graph[module_name].add(imported_module)
-        
-        return dependency_graph
-    
-    def _file_path_to_module(self, file_path: str) -> str:
-        """Convert file path to module name."""
-        # Remove common prefixes and file extensions
-        module = file_path.replace('/', '.').replace('\\', '.')
+                    adjacency[module_id].add(intern(imported_module))
         
-        # Remove file extensions
-        for ext in ['.py', '.js', '.ts', '.jsx', '.tsx']:
-            if module.endswith(ext):
-                module = module[:-len(ext)]
-                break
-        
-        # Remove common prefixes
-        for prefix in ['src.', 'app.', 'lib.']:
-            if module.startswith(prefix):
-                module = module[len(prefix):]
-                break
-        
-        return module
+        return [sorted(targets) for targets in adjacency], id_to_name
     
-    def _extract_imports(self, content: str) -> List[str]:
-        """Extract import statements from content."""
-        imports = []
-        lines = content.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Python imports
-            if line.startswith('import '):
-                module = line.replace('import ', '').split(' as ')[0].split(',')[0].strip()
-                imports.append(module)
-            elif line.startswith('from ') and ' import ' in line:
-                module = line.split(' import ')[0].replace('from ', '').strip()
-                imports.append(module)
-            
-            # JavaScript/TypeScript imports
-            elif 'import ' in line and ' from ' in line:
-                parts = line.split(' from ')
-                if len(parts) > 1:
-                    module = parts[1].strip().strip(';').strip('\'"')
-                    imports.append(module)
-            elif line.startswith('const ') and 'require(' in line:
-                # CommonJS require
-                start = line.find("require('") or line.find('require("')
-                if start != -1:
-                    quote_char = line[start + 8]
-                    end = line.find(quote_char, start + 9)
-                    if end != -1:
-                        module = line[start + 9:end]
-                        imports.append(module)
+    def _extract_imports(self, content: str, language: Optional[str] = None) -> List[str]:
+        """
+        Extract imported module names from Python and JavaScript/TypeScript content.
         
-        return imports
+        Only the import syntax of the chunk's language is scanned for; unknown
+        languages are scanned for both.
+        """
+        import_re = _IMPORT_RE_BY_LANGUAGE.get((language or "").lower(), _IMPORT_RE)
+        return [
+            next(group for group in match.groups() if group)
+            for match in import_re.finditer(content)
+        ]
     
     def _is_internal_module(self, module: str, current_file: str) -> bool:
         """Check if module is internal to the project."""
-        # Skip external/third-party modules
-        external_indicators = [
-            'numpy', 'pandas', 'requests', 'flask', 'django', 'react', 'vue',
-            'express', 'lodash', 'moment', 'os', 'sys', 'json', 're'
-        ]
-        
         # Check for relative imports
         if module.startswith('.'):
             return True
         
         # Check if it's a known external module
-        if any(ext in module.lower() for ext in external_indicators):
+        if module.split('.', 1)[0].lower() in EXTERNAL_MODULES:
             return False
         
         # If module doesn't contain dots, it's likely external
-        if '.' not in module and not module.startswith('.'):
+        if '.' not in module:
             return False
         
         return True
     
-    def _detect_cycles(self, dependency_graph: Dict[str, Set[str]]) -> List[Dict[str, Any]]:
-        """Detect circular dependencies using DFS."""
-        circular_deps = []
-        visited = set()
-        rec_stack = set()
+    def _detect_cycles(self, adjacency: List[List[int]], module_names: List[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Detect circular dependencies as strongly connected components.
         
-        def dfs(node: str, path: List[str]) -> None:
-            if node in rec_stack:
-                # Found cycle
-                cycle_start = path.index(node)
-                cycle = path[cycle_start:] + [node]
-                
-                circular_deps.append({
-                    "type": "circular_dependency",
-                    "pattern": "import_cycle",
-                    "severity": self._assess_cycle_severity(cycle),
-                    "file": "multiple_modules",
-                    "line": None,
-                    "message": f"Circular dependency: {' → '.join(cycle)}",
-                    "content_preview": f"Cycle: {' → '.join(cycle)}",
-                    "metadata": {
-                        "cycle": cycle,
-                        "cycle_length": len(cycle) - 1,
-                        "affected_modules": cycle[:-1]
-                    }
-                })
-                return
-            
-            if node in visited:
-                return
+        Every SCC with more than one module (or a module importing itself) is
+        one cycle class and is reported once, with a representative cycle.
+        The cycle starts at the component's lexicographically smallest module,
+        so the same cycle is reported identically whatever the traversal
+        order. Findings are yielded so callers can stop early.
+        """
+        for component in self._strongly_connected_components(adjacency):
+            start = min(component, key=module_names.__getitem__)
+            if len(component) == 1 and start not in adjacency[start]:
+                continue
             
-            visited.add(node)
-            rec_stack.add(node)
+            cycle = [
+                module_names[module_id]
+                for module_id in self._representative_cycle(adjacency, component, start)
+            ]
+            yield {
+                "type": "circular_dependency",
+                "pattern": "import_cycle",
+                "severity": self._assess_cycle_severity(cycle),
+                "file": "multiple_modules",
+                "line": None,
+                "message": f"Circular dependency: {' → '.join(cycle)}",
+                "content_preview": f"Cycle: {' → '.join(cycle)}",
+                "metadata": {
+                    "cycle": cycle,
+                    "cycle_length": len(cycle) - 1,
+                    "affected_modules": cycle[:-1]
+                }
+            }
+    
+    def _strongly_connected_components(self, adjacency: List[List[int]]) -> List[List[int]]:
+        """Find strongly connected components with an iterative Tarjan's algorithm (O(V+E))."""
+        node_count = len(adjacency)
+        index = [-1] * node_count
+        lowlink = [0] * node_count
+        on_stack = bytearray(node_count)
+        stack: List[int] = []
+        components: List[List[int]] = []
+        next_index = 0
+        
+        for root in range(node_count):
+            if index[root] != -1:
+                continue
             
-            for neighbor in dependency_graph.get(node, set()):
-                dfs(neighbor, path + [node])
+            index[root] = lowlink[root] = next_index
+            next_index += 1
+            stack.append(root)
+            on_stack[root] = 1
+            work = [(root, iter(adjacency[root]))]
             
-            rec_stack.remove(node)
+            while work:
+                node, neighbors = work[-1]
+                advanced = False
+                
+                for neighbor in neighbors:
+                    if index[neighbor] == -1:
+                        index[neighbor] = lowlink[neighbor] = next_index
+                        next_index += 1
+                        stack.append(neighbor)
+                        on_stack[neighbor] = 1
+                        work.append((neighbor, iter(adjacency[neighbor])))
+                        advanced = True
+                        break
+                    if on_stack[neighbor]:
+                        lowlink[node] = min(lowlink[node], index[neighbor])
+                
+                if advanced:
+                    continue
+                
+                # All neighbors done: pop node and propagate its lowlink to the parent
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component[::-1])
+        
+        return components
+    
+    def _representative_cycle(
+        self,
+        adjacency: List[List[int]],
+        component: List[int],
+        start: int
+    ) -> List[int]:
+        """Return the shortest cycle through start inside one SCC, e.g. [a, b, a]."""
+        in_component = set(component)
+        parents = {start: None}
+        queue = deque([start])
         
-        # Check each module
-        for module in dependency_graph:
-            if module not in visited:
-                dfs(module, [])
+        while queue:
+            node = queue.popleft()
+            for neighbor in adjacency[node]:
+                if neighbor == start:
+                    # Walk back to start to recover the path start -> ... -> node
+                    path = [node]
+                    while parents[path[-1]] is not None:
+                        path.append(parents[path[-1]])
+                    return path[::-1] + [start]
+                if neighbor in in_component and neighbor not in parents:
+                    parents[neighbor] = node
+                    queue.append(neighbor)
         
-        return circular_deps
+        return [start, start]
     
     def _analyze_dependency_patterns(
         self,
-        code_results: List[Dict[str, Any]],
-        dependency_graph: Dict[str, Set[str]]
-    ) -> List[Dict[str, Any]]:
-        """Analyze dependency patterns for potential issues."""
-        issues = []
-        
+        adjacency: List[List[int]],
+        module_names: List[str]
+    ) -> Iterator[Dict[str, Any]]:
+        """Analyze dependency patterns for potential issues, yielding each finding."""
         # Analyze coupling levels
-        for module, dependencies in dependency_graph.items():
-            if len(dependencies) > 10:  # High coupling
-                issues.append({
+        for module_id, dependency_ids in enumerate(adjacency):
+            if len(dependency_ids) > 10:  # High coupling
+                module = module_names[module_id]
+                dependencies = [module_names[dep] for dep in dependency_ids]
+                yield {
                     "type": "dependency_issue",
                     "pattern": "high_coupling",
                     "severity": "medium",
                     "file": module.replace('.', '/') + '.py',
                     "line": 1,
                     "message": f"Module {module} has high coupling ({len(dependencies)} dependencies)",
-                    "content_preview": f"Dependencies: {', '.join(list(dependencies)[:5])}...",
+                    "content_preview": f"Dependencies: {', '.join(dependencies[:5])}...",
                     "metadata": {
                         "dependency_count": len(dependencies),
-                        "dependencies": list(dependencies)
+                        "dependencies": dependencies
                     }
-                })
+                }
         
         # Find modules that are imported by many others (potential bottlenecks)
-        import_counts = {}
-        for deps in dependency_graph.values():
-            for dep in deps:
-                import_counts[dep] = import_counts.get(dep, 0) + 1
+        import_counts = Counter(dep for dependency_ids in adjacency for dep in dependency_ids)
         
-        for module, count in import_counts.items():
+        for module_id, count in import_counts.items():
             if count > 8:  # Imported by many modules
-                issues.append({
+                module = module_names[module_id]
+                yield {
                     "type": "dependency_issue",
                     "pattern": "dependency_bottleneck",
                     "severity": "low",
@@ -292,9 +403,7 @@ class CircularDependenciesPlaybook(BasePlaybook):
                         "import_count": count,
                         "potential_bottleneck": True
                     }
-                })
-        
-        return issues
+                }
     
     def _assess_cycle_severity(self, cycle: List[str]) -> str:
         """Assess severity of a circular dependency cycle."""
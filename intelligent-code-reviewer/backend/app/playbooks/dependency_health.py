@@ -5,12 +5,69 @@ Specialized playbook for analyzing dependency health including
 version freshness, security vulnerabilities, and management issues.
 """
 
+import asyncio
+import hashlib
+import os
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
+
+import orjson
+
 from .base_playbook import BasePlaybook
+from ..core.cache import LRUCache
 from ..services.ai_agent import AnalysisResult, AnalysisStatus, SeverityLevel, AgentContext
 
 
+# Manifest file names recognised as dependency configuration
+DEPENDENCY_FILES = frozenset({
+    "package.json", "requirements.txt", "setup.py", "pyproject.toml",
+    "Pipfile", "composer.json", "build.gradle", "pom.xml", "Cargo.toml"
+})
+
+# Dependency names quoted in setup.py / pyproject.toml (simplified analysis)
+_SETUP_DEPENDENCY_RE = re.compile(r'["\']([a-zA-Z0-9_-]+)[>=<~!]*[^"\']*["\']')
+
+# First characters of npm version specs that accept a range of versions
+_NPM_RANGE_PREFIXES = frozenset('^~<>*')
+
+# Version pin operators recognised in requirements.txt lines
+_VERSION_OPERATOR_RE = re.compile(r"==|>=|<=|~=")
+
+# Name fragments that suggest a non-production package (simplified heuristic;
+# in practice you'd use a vulnerability database), matched in one regex scan
+PROBLEMATIC_PACKAGE_PATTERNS = (
+    'debug', 'test', 'mock', 'temp', 'experimental',
+    'alpha', 'beta', 'rc', 'dev', 'unstable'
+)
+_PROBLEMATIC_PACKAGE_RE = re.compile("|".join(PROBLEMATIC_PACKAGE_PATTERNS))
+
+# Parse results keyed by a digest of the file content: the same manifests are
+# re-analyzed on every run, and digests avoid holding whole files as keys
+_parsed_package_json = LRUCache(maxsize=256)
+_setup_dependencies = LRUCache(maxsize=256)
+
+# Cached in place of the parsed data for content that is not valid JSON
+_INVALID_JSON = object()
+
+
+def _content_digest(content: str) -> bytes:
+    """Return a short digest identifying file content for the parse caches."""
+    return hashlib.blake2b(content.encode(), digest_size=16).digest()
+
+
+def _load_package_json(content: str) -> Any:
+    """Parse package.json content, or return _INVALID_JSON if it is malformed."""
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        return _INVALID_JSON
+
+
+def _find_setup_dependencies(content: str) -> Tuple[str, ...]:
+    """Extract quoted dependency names from setup.py / pyproject.toml content."""
+    return tuple(_SETUP_DEPENDENCY_RE.findall(content))
+
+
 class DependencyHealthPlaybook(BasePlaybook):
     """
     Playbook for analyzing dependency health and management.
@@ -54,12 +111,14 @@ class DependencyHealthPlaybook(BasePlaybook):
                     confidence_score=0.7
                 )
             
-            dependency_findings = []
-            
-            for result in code_results:
-                if self._is_dependency_file(result["file_path"]):
-                    findings = await self._analyze_dependency_file(result)
-                    dependency_findings.extend(findings)
+            dependency_results = [r for r in code_results if self._is_dependency_file(r["file_path"])]
+            # Analyze manifests concurrently so per-file lookups can overlap
+            findings_per_file = await asyncio.gather(
+                *(self._analyze_dependency_file(result) for result in dependency_results)
+            )
+            dependency_findings = [
+                finding for findings in findings_per_file for finding in findings
+            ]
             
             overall_severity = self._assess_dependency_health_severity(dependency_findings)
             recommendations = self._generate_targeted_recommendations("dependency_health", dependency_findings)
@@ -74,7 +133,7 @@ class DependencyHealthPlaybook(BasePlaybook):
                 confidence_score=0.8,
                 metadata={
                     "playbook_version": self.version,
-                    "dependency_files_analyzed": len([r for r in code_results if self._is_dependency_file(r["file_path"])]),
+                    "dependency_files_analyzed": len(dependency_results),
                     "health_issues": len(dependency_findings)
                 }
             )
@@ -92,23 +151,20 @@ class DependencyHealthPlaybook(BasePlaybook):
     
     def _is_dependency_file(self, file_path: str) -> bool:
         """Check if file is a dependency configuration file."""
-        dependency_files = [
-            "package.json", "requirements.txt", "setup.py", "pyproject.toml",
-            "Pipfile", "composer.json", "build.gradle", "pom.xml", "Cargo.toml"
-        ]
-        return any(dep_file in file_path for dep_file in dependency_files)
+        return os.path.basename(file_path) in DEPENDENCY_FILES
     
     async def _analyze_dependency_file(self, result: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Analyze a dependency configuration file."""
         findings = []
         content = result["content"]
         file_path = result["file_path"]
+        file_name = os.path.basename(file_path)
         
-        if "package.json" in file_path:
+        if file_name == "package.json":
             findings.extend(self._analyze_npm_dependencies(content, file_path))
-        elif "requirements.txt" in file_path:
+        elif file_name == "requirements.txt":
             findings.extend(self._analyze_python_dependencies(content, file_path))
-        elif "setup.py" in file_path or "pyproject.toml" in file_path:
+        elif file_name in ("setup.py", "pyproject.toml"):
             findings.extend(self._analyze_python_setup(content, file_path))
         
         return findings
@@ -117,10 +173,10 @@ class DependencyHealthPlaybook(BasePlaybook):
         """Analyze npm package.json dependencies."""
         findings = []
         
-        try:
-            import json
-            package_data = json.loads(content)
-        except json.JSONDecodeError:
+        package_data = _parsed_package_json.get_or_set(
+            _content_digest(content), lambda: _load_package_json(content)
+        )
+        if package_data is _INVALID_JSON:
             return [{
                 "type": "dependency_issue",
                 "pattern": "invalid_package_json",
@@ -138,31 +194,32 @@ class DependencyHealthPlaybook(BasePlaybook):
         unpinned_deps = 0
         
         for section in dep_sections:
-            if section in package_data:
-                deps = package_data[section]
-                total_deps += len(deps)
+            deps = package_data.get(section)
+            if not deps:
+                continue
+            total_deps += len(deps)
+            
+            for pkg_name, version in deps.items():
+                # Check for unpinned versions: ranges, wildcards and tags like "latest"
+                if not version or version[0] in _NPM_RANGE_PREFIXES or not any(c.isdigit() for c in version[:2]):
+                    unpinned_deps += 1
                 
-                for pkg_name, version in deps.items():
-                    # Check for unpinned versions
-                    if version.startswith('^') or version.startswith('~') or version == '*':
-                        unpinned_deps += 1
-                    
-                    # Check for potentially problematic packages
-                    if self._is_potentially_problematic_package(pkg_name):
-                        findings.append({
-                            "type": "dependency_issue",
-                            "pattern": "problematic_package",
-                            "severity": "medium",
-                            "file": file_path,
-                            "line": None,
-                            "message": f"Package '{pkg_name}' may have known issues",
-                            "content_preview": f"{pkg_name}: {version}",
-                            "metadata": {
-                                "package_name": pkg_name,
-                                "version": version,
-                                "section": section
-                            }
-                        })
+                # Check for potentially problematic packages
+                if self._is_potentially_problematic_package(pkg_name):
+                    findings.append({
+                        "type": "dependency_issue",
+                        "pattern": "problematic_package",
+                        "severity": "medium",
+                        "file": file_path,
+                        "line": None,
+                        "message": f"Package '{pkg_name}' may have known issues",
+                        "content_preview": f"{pkg_name}: {version}",
+                        "metadata": {
+                            "package_name": pkg_name,
+                            "version": version,
+                            "section": section
+                        }
+                    })
         
         # Check for too many dependencies
         if total_deps > 50:
@@ -205,12 +262,15 @@ class DependencyHealthPlaybook(BasePlaybook):
             if line and not line.startswith('#'):
                 total_count += 1
                 
-                # Check for unpinned versions
-                if '==' not in line and '>=' not in line and '<=' not in line and '~=' not in line:
+                # Check for unpinned versions; the package name ends at the first pin
+                version_op = _VERSION_OPERATOR_RE.search(line)
+                if version_op is None:
                     unpinned_count += 1
+                    pkg_name = line
+                else:
+                    pkg_name = line[:version_op.start()].rstrip()
                 
                 # Check for potentially problematic packages
-                pkg_name = line.split('==')[0].split('>=')[0].split('<=')[0].split('~=')[0].strip()
                 if self._is_potentially_problematic_package(pkg_name):
                     findings.append({
                         "type": "dependency_issue",
@@ -245,7 +305,9 @@ class DependencyHealthPlaybook(BasePlaybook):
         # Look for dependency specifications
         if 'install_requires' in content or 'dependencies' in content:
             # Extract dependencies (simplified analysis)
-            deps = re.findall(r'["\']([a-zA-Z0-9_-]+)[>=<~!]*[^"\']*["\']', content)
+            deps = _setup_dependencies.get_or_set(
+                _content_digest(content), lambda: _find_setup_dependencies(content)
+            )
             
             for dep in deps:
                 if self._is_potentially_problematic_package(dep):
@@ -264,22 +326,20 @@ class DependencyHealthPlaybook(BasePlaybook):
     
     def _is_potentially_problematic_package(self, package_name: str) -> bool:
         """Check if package is known to have issues (simplified heuristic)."""
-        # This is a simplified check - in practice, you'd use a vulnerability database
-        problematic_patterns = [
-            'debug', 'test', 'mock', 'temp', 'experimental',
-            'alpha', 'beta', 'rc', 'dev', 'unstable'
-        ]
-        
-        pkg_lower = package_name.lower()
-        return any(pattern in pkg_lower for pattern in problematic_patterns)
+        return _PROBLEMATIC_PACKAGE_RE.search(package_name.lower()) is not None
     
     def _assess_dependency_health_severity(self, findings: List[Dict[str, Any]]) -> SeverityLevel:
         """Assess overall dependency health severity."""
         if not findings:
             return SeverityLevel.LOW
         
-        problematic_packages = len([f for f in findings if f.get("pattern") == "problematic_package"])
-        unpinned_issues = len([f for f in findings if "unpinned" in f.get("pattern", "")])
+        problematic_packages = unpinned_issues = 0
+        for finding in findings:
+            pattern = finding.get("pattern", "")
+            if pattern == "problematic_package":
+                problematic_packages += 1
+            elif "unpinned" in pattern:
+                unpinned_issues += 1
         
         if problematic_packages > 3:
             return SeverityLevel.HIGH
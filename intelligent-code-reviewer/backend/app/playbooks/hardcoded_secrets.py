@@ -5,12 +5,59 @@ Specialized playbook for detecting hardcoded secrets, credentials,
 API keys, and other sensitive information in the codebase.
 """
 
+import asyncio
 import re
-from typing import Dict, List, Any
+from collections import Counter
+from itertools import chain
+from typing import Dict, Iterable, List, Any
+
+import numpy as np
+import re2
+
 from .base_playbook import BasePlaybook
 from ..services.ai_agent import AnalysisResult, AnalysisStatus, SeverityLevel, AgentContext
 
 
+# Path fragments of tests, docs and vendored/generated trees that are not scanned
+SKIP_PATH_PATTERNS = (
+    "test", "spec", "mock", "example", "demo", "sample",
+    "readme", "doc", "documentation", ".md", ".txt",
+    "node_modules", "__pycache__", ".git"
+)
+_SKIP_PATH_RE = re.compile("|".join(map(re.escape, SKIP_PATH_PATTERNS)))
+
+# Placeholder fragments that mark a matched value as a sample, not a real secret
+FALSE_POSITIVE_PATTERNS = (
+    "example", "dummy", "test", "fake", "placeholder",
+    "your_", "my_", "insert_", "add_your", "replace_with",
+    "xxx", "000", "123", "abc", "password123"
+)
+_FALSE_POSITIVE_RE = re.compile("|".join(map(re.escape, FALSE_POSITIVE_PATTERNS)))
+
+# More unique findings than this in one file is a false-positive cluster
+# (e.g. embedded test fixtures), so the scan stops there
+MAX_FINDINGS_PER_FILE = 1000
+
+# Severity per secret type; unlisted types are medium
+SECRET_SEVERITY = {
+    "private_key": "critical",
+    "database_credential": "critical",
+    "aws_credential": "critical",
+    "password": "high",
+    "api_key": "high",
+    "jwt_token": "high",
+}
+
+# Characters that raise confidence that a matched value is a generated secret
+_SPECIAL_CHARACTERS = frozenset("!@#$%^&*()_+-=[]{}|;:,.<>?")
+
+
+def _line_preview(data: bytes, line_starts: np.ndarray, line_num: int) -> str:
+    """Return the first 100 characters of a 1-based line of UTF-8 data, stripped."""
+    line = data[line_starts[line_num - 1]:line_starts[line_num] - 1]
+    return line.decode("utf-8", "surrogatepass").strip()[:100]
+
+
 class HardcodedSecretsPlaybook(BasePlaybook):
     """
     Playbook for detecting hardcoded secrets and credentials.
@@ -30,42 +77,63 @@ class HardcodedSecretsPlaybook(BasePlaybook):
             version="1.0.0"
         )
         
-        # Comprehensive secret patterns
+        # Comprehensive secret patterns. Quote/space bridges exclude newlines so
+        # a key name and its value must sit on the same line
         self.secret_patterns = {
             "api_key": [
-                r"api[_-]?key['\"\s]*[:=]['\"\s]*[a-zA-Z0-9_-]{20,}",
-                r"apikey['\"\s]*[:=]['\"\s]*[a-zA-Z0-9_-]{20,}",
-                r"key['\"\s]*[:=]['\"\s]*[a-zA-Z0-9_-]{32,}"
+                r"api[_-]?key['\" \t]*[:=]['\" \t]*[a-zA-Z0-9_-]{20,}",
+                r"apikey['\" \t]*[:=]['\" \t]*[a-zA-Z0-9_-]{20,}",
+                r"key['\" \t]*[:=]['\" \t]*[a-zA-Z0-9_-]{32,}"
             ],
             "password": [
-                r"password['\"\s]*[:=]['\"\s]*['\"][^'\"]{8,}['\"]",
-                r"passwd['\"\s]*[:=]['\"\s]*['\"][^'\"]{8,}['\"]",
-                r"pwd['\"\s]*[:=]['\"\s]*['\"][^'\"]{8,}['\"]"
+                r"password['\" \t]*[:=]['\" \t]*['\"][^'\"]{8,}['\"]",
+                r"passwd['\" \t]*[:=]['\" \t]*['\"][^'\"]{8,}['\"]",
+                r"pwd['\" \t]*[:=]['\" \t]*['\"][^'\"]{8,}['\"]"
             ],
             "token": [
-                r"token['\"\s]*[:=]['\"\s]*['\"][a-zA-Z0-9_-]{20,}['\"]",
-                r"access[_-]?token['\"\s]*[:=]['\"\s]*['\"][a-zA-Z0-9_-]{20,}['\"]",
-                r"bearer[_-]?token['\"\s]*[:=]['\"\s]*['\"][a-zA-Z0-9_-]{20,}['\"]"
+                r"token['\" \t]*[:=]['\" \t]*['\"][a-zA-Z0-9_-]{20,}['\"]",
+                r"access[_-]?token['\" \t]*[:=]['\" \t]*['\"][a-zA-Z0-9_-]{20,}['\"]",
+                r"bearer[_-]?token['\" \t]*[:=]['\" \t]*['\"][a-zA-Z0-9_-]{20,}['\"]"
             ],
             "database_credential": [
                 r"(mysql|postgresql|mongodb)://[^'\"\s]+",
-                r"database[_-]?url['\"\s]*[:=]['\"\s]*['\"][^'\"]+['\"]",
-                r"db[_-]?(user|password)['\"\s]*[:=]['\"\s]*['\"][^'\"]+['\"]"
+                r"database[_-]?url['\" \t]*[:=]['\" \t]*['\"][^'\"]+['\"]",
+                r"db[_-]?(user|password)['\" \t]*[:=]['\" \t]*['\"][^'\"]+['\"]"
             ],
             "private_key": [
                 r"-----BEGIN\s+(RSA\s+)?PRIVATE\s+KEY-----",
-                r"private[_-]?key['\"\s]*[:=]['\"\s]*['\"][^'\"]{40,}['\"]"
+                r"private[_-]?key['\" \t]*[:=]['\" \t]*['\"][^'\"]{40,}['\"]"
             ],
             "aws_credential": [
                 r"AKIA[0-9A-Z]{16}",
-                r"aws[_-]?access[_-]?key['\"\s]*[:=]['\"\s]*['\"][^'\"]+['\"]",
-                r"aws[_-]?secret['\"\s]*[:=]['\"\s]*['\"][^'\"]+['\"]"
+                r"aws[_-]?access[_-]?key['\" \t]*[:=]['\" \t]*['\"][^'\"]+['\"]",
+                r"aws[_-]?secret['\" \t]*[:=]['\" \t]*['\"][^'\"]+['\"]"
             ],
             "jwt_token": [
                 r"eyJ[a-zA-Z0-9_-]+\.[a-zA-Z0-9_-]+\.[a-zA-Z0-9_-]+",
-                r"jwt[_-]?token['\"\s]*[:=]['\"\s]*['\"]eyJ[^'\"]+['\"]"
+                r"jwt[_-]?token['\" \t]*[:=]['\" \t]*['\"]eyJ[^'\"]+['\"]"
             ]
         }
+        
+        # Compiled once here so a bad pattern fails at startup, not mid-scan.
+        # RE2 matches in linear time, so no file content can trigger
+        # catastrophic backtracking. Kept as separate scans because one
+        # alternation of all of them drops overlapping matches of different
+        # types, such as password inside db_password
+        self._compiled_patterns = [
+            (secret_type, re2.compile("(?im)" + pattern))
+            for secret_type, patterns in self.secret_patterns.items()
+            for pattern in patterns
+        ]
+        # One pass over a file reports which patterns match anywhere in it, so
+        # only those are rerun to locate matches; index i is _compiled_patterns[i].
+        # The pass costs the same for one pattern as for all of them, so there
+        # are no per-extension subsets, which would also miss keys pasted into
+        # unexpected file types
+        self._pattern_set = re2.Set.SearchSet()
+        for _, compiled in self._compiled_patterns:
+            self._pattern_set.Add(compiled.pattern)
+        self._pattern_set.Compile()
     
     async def execute(self, context: AgentContext, config: Dict[str, Any] = None) -> AnalysisResult:
         """Execute hardcoded secrets detection analysis."""
@@ -91,18 +159,23 @@ class HardcodedSecretsPlaybook(BasePlaybook):
                     confidence_score=0.8
                 )
             
-            secret_findings = []
-            
-            for result in code_results:
-                # Skip test files and documentation
-                if self._should_skip_file(result["file_path"]):
-                    continue
-                    
-                findings = await self._scan_for_secrets(result)
-                secret_findings.extend(findings)
-            
-            # Remove duplicates and false positives
-            secret_findings = self._filter_findings(secret_findings)
+            # A chunk returned by several queries is scanned once; its findings
+            # would only be dropped again as duplicates. Test files and
+            # documentation are skipped
+            unique_results = {
+                (result["file_path"], result["content"]): result
+                for result in code_results
+                if not self._should_skip_file(result["file_path"])
+            }
+            # Scan files in worker threads; RE2 releases the GIL while matching
+            loop = asyncio.get_running_loop()
+            findings_per_file = await asyncio.gather(*(
+                loop.run_in_executor(None, self._scan_for_secrets, result)
+                for result in unique_results.values()
+            ))
+            # Each scan already drops its own repeats; this merge drops those
+            # shared by different chunks of the same file
+            secret_findings = self._filter_findings(chain.from_iterable(findings_per_file))
             
             overall_severity = self._assess_secrets_severity(secret_findings)
             recommendations = self._generate_targeted_recommendations("hardcoded_secrets", secret_findings)
@@ -136,62 +209,80 @@ class HardcodedSecretsPlaybook(BasePlaybook):
     
     def _should_skip_file(self, file_path: str) -> bool:
         """Check if file should be skipped from secret scanning."""
-        skip_patterns = [
-            "test", "spec", "mock", "example", "demo", "sample",
-            "readme", "doc", "documentation", ".md", ".txt",
-            "node_modules", "__pycache__", ".git"
-        ]
-        return any(pattern in file_path.lower() for pattern in skip_patterns)
+        return _SKIP_PATH_RE.search(file_path.lower()) is not None
     
-    async def _scan_for_secrets(self, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _scan_for_secrets(self, result: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Scan content for hardcoded secrets."""
         findings = []
         content = result["content"]
         file_path = result["file_path"]
-        lines = content.split('\n')
         
-        for secret_type, patterns in self.secret_patterns.items():
-            for pattern in patterns:
-                try:
-                    matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
-                    for match in matches:
-                        line_num = content[:match.start()].count('\n') + 1
-                        matched_text = match.group(0)
-                        
-                        # Additional validation to reduce false positives
-                        if self._is_likely_secret(matched_text, secret_type):
-                            masked_text = self._mask_secret(matched_text)
-                            
-                            findings.append({
-                                "type": "hardcoded_secret",
-                                "pattern": secret_type,
-                                "severity": self._get_secret_severity(secret_type),
-                                "file": file_path,
-                                "line": line_num,
-                                "message": f"Hardcoded {secret_type.replace('_', ' ')} detected",
-                                "content_preview": masked_text,
-                                "metadata": {
-                                    "secret_type": secret_type,
-                                    "confidence": self._calculate_confidence(matched_text, secret_type),
-                                    "line_content": lines[line_num - 1].strip()[:100] if line_num <= len(lines) else ""
-                                }
-                            })
-                except re.error:
+        # Scanned as UTF-8 bytes: RE2 would otherwise re-encode str content on
+        # every call and convert each match offset back to characters
+        data = content.encode("utf-8", "surrogatepass")
+        
+        # Most files match none of the patterns
+        matched = self._pattern_set.Match(data)
+        if not matched:
+            return findings
+        
+        # Byte offset of each line's first character, plus one past the end;
+        # matches are assigned to lines with one searchsorted per pattern, and
+        # a finding's line is sliced from data rather than splitting the file
+        line_starts = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == 10) + 1
+        line_starts = np.concatenate(([0], line_starts, [len(data) + 1]))
+        
+        # (line, pattern) pairs already reported; _filter_findings would drop
+        # repeats, so they are never built
+        seen = set()
+        
+        for index in sorted(matched):
+            secret_type, secret_re = self._compiled_patterns[index]
+            matches = list(secret_re.finditer(data))
+            if not matches:
+                continue
+            line_nums = np.searchsorted(
+                line_starts, [match.start() for match in matches], side="right"
+            ).tolist()
+            
+            for match, line_num in zip(matches, line_nums):
+                if (line_num, secret_type) in seen:
                     continue
+                matched_text = match.group(0).decode("utf-8", "surrogatepass")
+                # Lowercased once for both the false-positive and confidence checks
+                matched_lower = matched_text.lower()
+                
+                # Additional validation to reduce false positives
+                if self._is_likely_secret(matched_text, secret_type, matched_lower):
+                    masked_text = self._mask_secret(matched_text)
+                    
+                    seen.add((line_num, secret_type))
+                    findings.append({
+                        "type": "hardcoded_secret",
+                        "pattern": secret_type,
+                        "severity": self._get_secret_severity(secret_type),
+                        "file": file_path,
+                        "line": line_num,
+                        "message": f"Hardcoded {secret_type.replace('_', ' ')} detected",
+                        "content_preview": masked_text,
+                        "metadata": {
+                            "secret_type": secret_type,
+                            "confidence": self._calculate_confidence(matched_text, secret_type, matched_lower),
+                            "line_content": _line_preview(data, line_starts, line_num)
+                        }
+                    })
+                    if len(findings) >= MAX_FINDINGS_PER_FILE:
+                        self.logger.warning(
+                            f"Stopped scanning {file_path} after {MAX_FINDINGS_PER_FILE} secret findings"
+                        )
+                        return findings
         
         return findings
     
-    def _is_likely_secret(self, text: str, secret_type: str) -> bool:
-        """Additional validation to reduce false positives."""
+    def _is_likely_secret(self, text: str, secret_type: str, text_lower: str) -> bool:
+        """Additional validation to reduce false positives; text_lower is text.lower()."""
         # Skip obvious false positives
-        false_positive_patterns = [
-            "example", "dummy", "test", "fake", "placeholder",
-            "your_", "my_", "insert_", "add_your", "replace_with",
-            "xxx", "000", "123", "abc", "password123"
-        ]
-        
-        text_lower = text.lower()
-        if any(fp in text_lower for fp in false_positive_patterns):
+        if _FALSE_POSITIVE_RE.search(text_lower):
             return False
         
         # Type-specific validation
@@ -217,34 +308,27 @@ class HardcodedSecretsPlaybook(BasePlaybook):
     
     def _get_secret_severity(self, secret_type: str) -> str:
         """Get severity level for different secret types."""
-        critical_secrets = ["private_key", "database_credential", "aws_credential"]
-        high_secrets = ["password", "api_key", "jwt_token"]
-        
-        if secret_type in critical_secrets:
-            return "critical"
-        elif secret_type in high_secrets:
-            return "high"
-        else:
-            return "medium"
+        return SECRET_SEVERITY.get(secret_type, "medium")
     
-    def _calculate_confidence(self, text: str, secret_type: str) -> float:
-        """Calculate confidence score for secret detection."""
+    def _calculate_confidence(self, text: str, secret_type: str, text_lower: str) -> float:
+        """Calculate confidence score for secret detection; text_lower is text.lower()."""
         base_confidence = 0.8
         
         # Increase confidence for longer strings
         if len(text) > 32:
             base_confidence += 0.1
         
-        # Increase confidence for mixed case and special characters
-        if any(c.isupper() for c in text) and any(c.islower() for c in text):
+        # Increase confidence for mixed case and special characters; the case
+        # and set checks run in C instead of per-character generators
+        if text != text_lower and text != text.upper():
             base_confidence += 0.05
         
-        if any(c in text for c in "!@#$%^&*()_+-=[]{}|;:,.<>?"):
+        if not _SPECIAL_CHARACTERS.isdisjoint(text):
             base_confidence += 0.05
         
         return min(0.99, base_confidence)
     
-    def _filter_findings(self, findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _filter_findings(self, findings: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Filter out duplicates and false positives."""
         filtered = []
         seen = set()
@@ -261,11 +345,7 @@ class HardcodedSecretsPlaybook(BasePlaybook):
     
     def _categorize_secrets(self, findings: List[Dict[str, Any]]) -> Dict[str, int]:
         """Categorize secrets by type."""
-        categories = {}
-        for finding in findings:
-            secret_type = finding.get("pattern", "unknown")
-            categories[secret_type] = categories.get(secret_type, 0) + 1
-        return categories
+        return dict(Counter(finding.get("pattern", "unknown") for finding in findings))
     
     def _assess_secrets_severity(self, findings: List[Dict[str, Any]]) -> SeverityLevel:
         """Assess overall secrets severity."""
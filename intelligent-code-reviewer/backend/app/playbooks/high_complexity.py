@@ -5,11 +5,28 @@ Specialized playbook for detecting functions and methods with
 excessive cyclomatic complexity, cognitive load, and maintainability issues.
 """
 
-from typing import Dict, List, Any
+import ast
+import asyncio
+import re
+import textwrap
+from collections import Counter
+from typing import Dict, List, Any, Optional
 from .base_playbook import BasePlaybook
 from ..services.ai_agent import AnalysisResult, AnalysisStatus, SeverityLevel, AgentContext
 
 
+# Statements that add a branch and open a nested block
+_BRANCH_NODES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.ExceptHandler)
+# Blocks that deepen nesting without adding a branch of their own
+_NESTING_NODES = _BRANCH_NODES + (ast.Try, ast.With, ast.AsyncWith)
+# Nested definitions are measured on their own, not as part of the enclosing function
+_SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+
+# Decision keywords counted by the keyword fallback, matched as whole words
+DECISION_KEYWORDS = ('if', 'elif', 'else', 'for', 'while', 'case', 'catch', 'except', 'and', 'or')
+_WORD_RE = re.compile(r"\w+")
+
+
 class HighComplexityPlaybook(BasePlaybook):
     """
     Playbook for detecting high complexity functions and methods.
@@ -64,12 +81,17 @@ class HighComplexityPlaybook(BasePlaybook):
                     confidence_score=0.8
                 )
             
-            complexity_findings = []
-            
-            for result in code_results:
-                if result["chunk_type"] in ["function", "method"] or any(keyword in result["content"] for keyword in ["def ", "function "]):
-                    findings = await self._analyze_function_complexity(result)
-                    complexity_findings.extend(findings)
+            # Analyze chunks in worker threads so the event loop stays free for
+            # concurrently scheduled playbooks
+            loop = asyncio.get_running_loop()
+            findings_per_chunk = await asyncio.gather(*(
+                loop.run_in_executor(None, self._analyze_function_complexity, result)
+                for result in code_results
+                if result["chunk_type"] in ["function", "method"] or any(keyword in result["content"] for keyword in ["def ", "function "])
+            ))
+            complexity_findings = [
+                finding for findings in findings_per_chunk for finding in findings
+            ]
             
             overall_severity = self._assess_complexity_severity(complexity_findings)
             recommendations = self._generate_targeted_recommendations("high_complexity", complexity_findings)
@@ -101,20 +123,20 @@ class HighComplexityPlaybook(BasePlaybook):
                 metadata={"error": str(e)}
             )
     
-    async def _analyze_function_complexity(self, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _analyze_function_complexity(self, result: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Analyze complexity of functions in the code result."""
         findings = []
         content = result["content"]
         file_path = result["file_path"]
         
-        functions = self._extract_code_elements(content, "function")
+        functions = self._extract_code_elements(content, "function", result.get("language"))
         
         for func_info in functions:
             func_name = func_info["name"]
             func_content = func_info["content"]
             
             # Calculate complexity metrics
-            complexity_metrics = self._calculate_complexity_metrics(func_content)
+            complexity_metrics = self._calculate_complexity_metrics(func_content, func_info.get("node"))
             
             # Check for violations
             violations = self._check_complexity_violations(complexity_metrics)
@@ -140,14 +162,109 @@ class HighComplexityPlaybook(BasePlaybook):
         
         return findings
     
-    def _calculate_complexity_metrics(self, content: str) -> Dict[str, Any]:
-        """Calculate detailed complexity metrics for a function."""
+    def _calculate_complexity_metrics(self, content: str, node: Optional[ast.AST] = None) -> Dict[str, Any]:
+        """
+        Calculate detailed complexity metrics for a function.
+        
+        Python source is measured from its AST in one walk; content that does
+        not parse (other languages, partial chunks) falls back to keyword
+        counting.
+        
+        Args:
+            content: Function source
+            node: The function's AST node, if already parsed
+        """
         lines = content.split('\n')
         non_empty_lines = [line for line in lines if line.strip() and not line.strip().startswith('#')]
         
-        # Cyclomatic complexity (decision points + 1)
-        decision_keywords = ['if', 'elif', 'else', 'for', 'while', 'case', 'catch', 'except', 'and', 'or']
-        cyclomatic = 1 + sum(content.lower().count(keyword) for keyword in decision_keywords)
+        metrics = self._ast_complexity_metrics(content, node)
+        if metrics is None:
+            metrics = self._keyword_complexity_metrics(content, lines)
+        
+        return {
+            "lines": len(non_empty_lines),
+            **metrics,
+            "decision_points": metrics["cyclomatic"] - 1
+        }
+    
+    def _ast_complexity_metrics(self, content: str, node: Optional[ast.AST] = None) -> Optional[Dict[str, int]]:
+        """
+        Measure Python source from its AST.
+        
+        Args:
+            content: Function source, possibly indented (e.g. a method)
+            node: The function's AST node; content is parsed when omitted
+            
+        Returns:
+            Cyclomatic, cognitive, nesting and parameter counts, or None if the
+            content does not parse
+        """
+        if node is None:
+            tree = self._parse_python(textwrap.dedent(content))
+            if tree is None:
+                return None
+            node = next(
+                (child for child in tree.body if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))),
+                tree
+            )
+        
+        func = node if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) else None
+        root = node
+        
+        params = 0
+        if func is not None:
+            args = func.args
+            params = len(args.posonlyargs) + len(args.args) + len(args.kwonlyargs)
+            params += (args.vararg is not None) + (args.kwarg is not None)
+        
+        counts = {"cyclomatic": 1, "cognitive": 0, "nesting_depth": 0}
+        
+        def visit(node: ast.AST, depth: int) -> None:
+            # An elif is an If alone in its parent's else branch; it continues
+            # the chain at the parent's depth rather than nesting inside it
+            elif_node = (
+                node.orelse[0]
+                if isinstance(node, ast.If) and len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If)
+                else None
+            )
+            for child in ast.iter_child_nodes(node):
+                if isinstance(child, _SCOPE_NODES):
+                    continue
+                if child is elif_node:
+                    counts["cyclomatic"] += 1
+                    counts["cognitive"] += 1
+                    visit(child, depth)
+                    continue
+                child_depth = depth
+                if isinstance(child, _BRANCH_NODES):
+                    counts["cyclomatic"] += 1
+                    # Branches cost more the deeper they are nested
+                    counts["cognitive"] += 1 + depth
+                elif isinstance(child, ast.IfExp):
+                    counts["cyclomatic"] += 1
+                    counts["cognitive"] += 1
+                elif isinstance(child, ast.BoolOp):
+                    counts["cyclomatic"] += len(child.values) - 1
+                    counts["cognitive"] += 1
+                elif isinstance(child, ast.comprehension):
+                    counts["cyclomatic"] += 1 + len(child.ifs)
+                elif isinstance(child, (ast.Break, ast.Continue)):
+                    counts["cognitive"] += 1
+                if isinstance(child, _NESTING_NODES):
+                    child_depth = depth + 1
+                    counts["nesting_depth"] = max(counts["nesting_depth"], child_depth)
+                visit(child, child_depth)
+        
+        visit(root, 0)
+        counts["parameters"] = params
+        return counts
+    
+    def _keyword_complexity_metrics(self, content: str, lines: List[str]) -> Dict[str, int]:
+        """Approximate complexity metrics by counting keywords line by line."""
+        # Cyclomatic complexity (decision points + 1), from one tokenizing pass
+        # so keywords inside longer words ('or' in 'for') are not counted
+        word_counts = Counter(_WORD_RE.findall(content.lower()))
+        cyclomatic = 1 + sum(word_counts[keyword] for keyword in DECISION_KEYWORDS)
         
         # Nesting depth
         max_nesting = 0
@@ -181,12 +298,10 @@ class HighComplexityPlaybook(BasePlaybook):
                 cognitive += 1
         
         return {
-            "lines": len(non_empty_lines),
             "cyclomatic": cyclomatic,
             "cognitive": cognitive,
             "nesting_depth": max_nesting,
-            "parameters": params,
-            "decision_points": cyclomatic - 1
+            "parameters": params
         }
     
     def _check_complexity_violations(self, metrics: Dict[str, Any]) -> List[str]:
@@ -7,10 +7,81 @@ and related authorization bypass vulnerabilities.
 
 import re
 from typing import Dict, List, Any
+
+import re2
+
 from .base_playbook import BasePlaybook
 from ..services.ai_agent import AnalysisResult, AnalysisStatus, SeverityLevel, AgentContext
 
 
+# Common API endpoint patterns and the framework each indicates
+ENDPOINT_PATTERNS = tuple(
+    (re.compile(pattern, re.IGNORECASE), endpoint_type)
+    for pattern, endpoint_type in (
+        (r'@(Get|Post|Put|Delete)Mapping\s*\([^)]*\)', 'spring'),
+        (r'@app\.route\s*\([^)]*\)', 'flask'),
+        (r'router\.(get|post|put|delete)\s*\([^)]*\)', 'express'),
+        (r'def\s+(get|post|put|delete)_\w+\s*\(', 'function')
+    )
+)
+
+# RE2's \w, \s, \d and \b are ASCII-only; widen them so the prefilter set
+# still accepts everything Python's Unicode-aware re would match. Each class
+# is given as the members to splice into a [...] set, so it works both as a
+# standalone escape and inside an existing character class
+_RE2_UNICODE_CLASSES = {
+    "w": r"\p{L}\p{N}_",
+    "s": r"\s\p{Z}\x0b\x1c-\x1f\x85",
+    "d": r"\p{Nd}",
+}
+
+# Word boundaries RE2 would place differently around non-ASCII letters; an
+# empty replacement drops the assertion, which can only match more
+_RE2_DROPPED_ASSERTIONS = frozenset("bB")
+
+
+def _to_re2_superset(pattern: str) -> str:
+    """
+    Rewrite a re pattern so RE2 matches at least what re matches.
+    
+    Negated escapes (\\W, \\S, \\D) need no rewrite: RE2's ASCII versions
+    already match a superset of Python's. Inside a character class \\b is a
+    backspace, which RE2 only accepts spelled as \\x08.
+    """
+    parts = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\" and i + 1 < len(pattern):
+            escaped = pattern[i + 1]
+            members = _RE2_UNICODE_CLASSES.get(escaped)
+            if members is not None:
+                parts.append(members if in_class else f"[{members}]")
+            elif in_class and escaped == "b":
+                parts.append(r"\x08")
+            elif in_class or escaped not in _RE2_DROPPED_ASSERTIONS:
+                parts.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if char == "[" and not in_class:
+            # A ']' straight after '[' or '[^' is a literal member, not the end
+            in_class = True
+            start = i + 1
+            if pattern.startswith("^", start):
+                start += 1
+            if pattern.startswith("]", start):
+                start += 1
+            parts.append(pattern[i:start])
+            i = start
+            continue
+        if char == "]" and in_class:
+            in_class = False
+        parts.append(char)
+        i += 1
+    return "".join(parts)
+
+
 class IdorVulnerabilitiesPlaybook(BasePlaybook):
     """
     Playbook for detecting IDOR vulnerabilities and authorization issues.
@@ -56,6 +127,32 @@ class IdorVulnerabilitiesPlaybook(BasePlaybook):
                 r"@(Delete|Put|Post)Mapping[^{]*{[^}]*(?!.*auth|.*permission|.*check)"
             ]
         }
+        
+        # Compiled once here so a bad pattern fails at startup, not mid-scan
+        self._compiled_patterns = [
+            (vuln_type, re.compile(pattern, re.IGNORECASE | re.MULTILINE | re.DOTALL))
+            for vuln_type, patterns in self.idor_patterns.items()
+            for pattern in patterns
+        ]
+        
+        # One RE2 pass over a file reports which patterns match anywhere in it,
+        # so only those are rerun with re to locate matches. A single
+        # alternation would drop overlapping matches of different types and
+        # ran slower. RE2 has no lookarounds, so patterns it rejects are
+        # always run
+        options = re2.Options()
+        options.log_errors = False
+        self._pattern_set = re2.Set.SearchSet(options)
+        self._set_members = []  # set index -> _compiled_patterns index
+        self._always_scanned = []
+        for index, (_, compiled) in enumerate(self._compiled_patterns):
+            try:
+                self._pattern_set.Add("(?ims)" + _to_re2_superset(compiled.pattern))
+            except re2.error:
+                self._always_scanned.append(index)
+            else:
+                self._set_members.append(index)
+        self._pattern_set.Compile()
     
     async def execute(self, context: AgentContext, config: Dict[str, Any] = None) -> AnalysisResult:
         """Execute IDOR vulnerabilities detection analysis."""
@@ -128,33 +225,32 @@ class IdorVulnerabilitiesPlaybook(BasePlaybook):
         file_path = result["file_path"]
         lines = content.split('\n')
         
-        for vuln_type, patterns in self.idor_patterns.items():
-            for pattern in patterns:
-                try:
-                    matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE | re.DOTALL)
-                    for match in matches:
-                        line_num = content[:match.start()].count('\n') + 1
-                        matched_text = match.group(0)
-                        
-                        # Check if this is likely a vulnerability
-                        if self._is_likely_vulnerability(content, match.start(), vuln_type):
-                            findings.append({
-                                "type": "idor_vulnerability",
-                                "pattern": vuln_type,
-                                "severity": self._get_idor_severity(vuln_type),
-                                "file": file_path,
-                                "line": line_num,
-                                "message": self._generate_idor_message(vuln_type, matched_text),
-                                "content_preview": matched_text.strip()[:100],
-                                "metadata": {
-                                    "vulnerability_type": vuln_type,
-                                    "pattern_matched": pattern,
-                                    "context": self._extract_context(lines, line_num),
-                                    "risk_level": self._assess_risk_level(vuln_type, content)
-                                }
-                            })
-                except re.error:
-                    continue
+        matched = self._pattern_set.Match(content) or ()
+        candidates = sorted(self._always_scanned + [self._set_members[i] for i in matched])
+        
+        for index in candidates:
+            vuln_type, idor_re = self._compiled_patterns[index]
+            for match in idor_re.finditer(content):
+                line_num = content[:match.start()].count('\n') + 1
+                matched_text = match.group(0)
+                
+                # Check if this is likely a vulnerability
+                if self._is_likely_vulnerability(content, match.start(), vuln_type):
+                    findings.append({
+                        "type": "idor_vulnerability",
+                        "pattern": vuln_type,
+                        "severity": self._get_idor_severity(vuln_type),
+                        "file": file_path,
+                        "line": line_num,
+                        "message": self._generate_idor_message(vuln_type, matched_text),
+                        "content_preview": matched_text.strip()[:100],
+                        "metadata": {
+                            "vulnerability_type": vuln_type,
+                            "pattern_matched": idor_re.pattern,
+                            "context": self._extract_context(lines, line_num),
+                            "risk_level": self._assess_risk_level(vuln_type, content)
+                        }
+                    })
         
         return findings
     
@@ -223,17 +319,9 @@ class IdorVulnerabilitiesPlaybook(BasePlaybook):
         endpoints = []
         lines = content.split('\n')
         
-        # Common API endpoint patterns
-        endpoint_patterns = [
-            (r'@(Get|Post|Put|Delete)Mapping\s*\([^)]*\)', 'spring'),
-            (r'@app\.route\s*\([^)]*\)', 'flask'),
-            (r'router\.(get|post|put|delete)\s*\([^)]*\)', 'express'),
-            (r'def\s+(get|post|put|delete)_\w+\s*\(', 'function')
-        ]
-        
         for i, line in enumerate(lines):
-            for pattern, endpoint_type in endpoint_patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
+            for endpoint_re, endpoint_type in ENDPOINT_PATTERNS:
+                match = endpoint_re.search(line)
                 if match:
                     # Extract function/method content (simplified)
                     endpoint_content = self._extract_function_content(lines, i)
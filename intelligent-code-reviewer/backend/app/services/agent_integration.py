@@ -12,7 +12,7 @@ from datetime import datetime
 from .ai_agent import AIAgent, AgentContext, AnalysisResult
 from .agent_orchestrator import AgentOrchestrator, ExecutionStrategy
 from .rag_pipeline import RAGIngestionPipeline
-from .vector_store import VectorStore
+from .vector_store import get_vector_store
 from ..core.config import settings
 from ..db.database import DatabaseService
 
@@ -36,8 +36,8 @@ class AgentIntegrationService:
         # Initialize RAG pipeline
         self.rag_pipeline = RAGIngestionPipeline()
         
-        # Initialize vector store
-        self.vector_store = VectorStore()
+        # Share the process-wide vector store with the RAG pipeline and playbooks
+        self.vector_store = get_vector_store()
         
         # Initialize AI agent
         self.ai_agent = AIAgent(
@@ -344,7 +344,7 @@ class AgentIntegrationService:
                     return {
                         "task_id": task_id,
                         "status": job.status,
-                        "progress": job.metadata or {},
+                        "progress": job.analysis_metadata or {},
                         "message": "Analysis in progress" if job.status == "in_progress" else f"Job status: {job.status}"
                     }
                 else:
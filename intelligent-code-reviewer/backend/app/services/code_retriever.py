@@ -3,7 +3,7 @@ import shutil
 import tempfile
 import zipfile
 from pathlib import Path
-from typing import Optional, Union
+from typing import BinaryIO, Optional, Union
 from urllib.parse import urlparse
 
 import git
@@ -86,12 +86,13 @@ class CodeRetriever:
         except Exception as e:
             raise CodeRetrievalError(f"Failed to retrieve code from Git URL: {str(e)}")
     
-    def retrieve_from_zip_file(self, zip_file_path: Union[str, Path], task_id: str) -> Path:
+    def retrieve_from_zip_file(self, zip_file_path: Union[str, Path, BinaryIO], task_id: str) -> Path:
         """
         Extract a ZIP file to a temporary directory.
         
         Args:
-            zip_file_path: Path to the ZIP file
+            zip_file_path: Path to the ZIP file, or a seekable binary file object
+                (such as an upload's spooled file) to extract without a disk copy
             task_id: Unique identifier for the task
             
         Returns:
@@ -101,13 +102,17 @@ class CodeRetriever:
             CodeRetrievalError: If extraction fails
         """
         try:
-            zip_path = Path(zip_file_path)
-            
-            if not zip_path.exists():
-                raise CodeRetrievalError(f"ZIP file not found: {zip_file_path}")
-            
-            if not zip_path.is_file():
-                raise CodeRetrievalError(f"Path is not a file: {zip_file_path}")
+            if isinstance(zip_file_path, (str, Path)):
+                zip_path = Path(zip_file_path)
+                
+                if not zip_path.exists():
+                    raise CodeRetrievalError(f"ZIP file not found: {zip_file_path}")
+                
+                if not zip_path.is_file():
+                    raise CodeRetrievalError(f"Path is not a file: {zip_file_path}")
+            else:
+                zip_path = zip_file_path
+                zip_path.seek(0)
             
             # Create task-specific temporary directory
             task_temp_dir = self.temp_base_dir / f"zip_{task_id}"
@@ -1,3 +1,4 @@
+from sqlalchemy import Text, cast, select
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import Optional, Dict, Any
@@ -158,4 +159,22 @@ class DatabaseService:
         Returns:
             FinalReport or None: Report if found, None otherwise
         """
-        return db.query(FinalReport).filter(FinalReport.task_id == task_id).first() 
\ No newline at end of file
+        return db.query(FinalReport).filter(FinalReport.task_id == task_id).first()
+    
+    @staticmethod
+    def get_final_report_raw(db: Session, task_id: str) -> Optional[str]:
+        """
+        Retrieve the stored JSON text of a final report without decoding it.
+        
+        Lets the API send the report as-is instead of parsing it into Python
+        objects only to serialize it again.
+        
+        Args:
+            db: Database session
+            task_id: Task identifier
+            
+        Returns:
+            str or None: Report JSON if found, None otherwise
+        """
+        stmt = select(cast(FinalReport.report_content, Text)).where(FinalReport.task_id == task_id)
+        return db.execute(stmt).scalar_one_or_none()
@@ -4,8 +4,10 @@ Real-time progress tracking service for analysis jobs.
 
 import time
 import logging
-from datetime import datetime
+from collections import Counter
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from ..db.session import get_session
@@ -13,6 +15,8 @@ from ..models.analysis import AnalysisJob, AnalysisStep, AnalysisStatus
 
 logger = logging.getLogger(__name__)
 
+TERMINAL_STATUSES = (AnalysisStatus.COMPLETE, AnalysisStatus.FAILED, AnalysisStatus.CANCELLED)
+
 
 class ProgressTracker:
     """Real-time progress tracking for analysis jobs."""
@@ -20,15 +24,67 @@ class ProgressTracker:
     def __init__(self, task_id: str):
         self.task_id = task_id
         self.start_time = time.time()
+        # Read caches populated by batch_load(); cleared on any write
+        self._status_cache: Optional[Dict[str, Any]] = None
+        self._steps_cache: Optional[List[Dict[str, Any]]] = None
+        self._job_info_cache: Optional[Dict[str, Any]] = None
+        self._step_counts_cache: Optional[Dict[str, int]] = None
+    
+    @classmethod
+    def batch_load(cls, task_ids: List[str]) -> Dict[str, "ProgressTracker"]:
+        """
+        Load trackers for several jobs with their read caches prefetched.
+        
+        Issues one query for the jobs and one for all of their steps instead of
+        separate round-trips per job and per read.
+        
+        Args:
+            task_ids: Task identifiers to load
+            
+        Returns:
+            Mapping of task_id to tracker; unknown task_ids are omitted
+        """
+        trackers: Dict[str, ProgressTracker] = {}
+        if not task_ids:
+            return trackers
+        
+        with get_session() as db:
+            jobs = db.query(AnalysisJob).filter(AnalysisJob.task_id.in_(task_ids)).all()
+            for job in jobs:
+                tracker = cls(job.task_id)
+                tracker._status_cache = job.get_progress_details()
+                tracker._job_info_cache = _serialize_job_info(job)
+                tracker._steps_cache = []
+                tracker._step_counts_cache = Counter()
+                trackers[job.task_id] = tracker
+            
+            steps = db.query(AnalysisStep).filter(
+                AnalysisStep.task_id.in_(list(trackers))
+            ).order_by(AnalysisStep.task_id, AnalysisStep.started_at).all()
+            # The step summary is counted from these rows, not a separate GROUP BY
+            for step in steps:
+                tracker = trackers[step.task_id]
+                tracker._steps_cache.append(_serialize_step(step))
+                tracker._step_counts_cache[step.status] += 1
+        
+        return trackers
+    
+    def _invalidate_cache(self):
+        """Drop prefetched reads after this tracker writes to the job."""
+        self._status_cache = None
+        self._steps_cache = None
+        self._job_info_cache = None
+        self._step_counts_cache = None
         
     def update_status(self, status: AnalysisStatus, progress: float = None, step: str = None):
         """Update the analysis status with optional progress and step info."""
+        self._invalidate_cache()
         try:
             with get_session() as db:
                 job = db.query(AnalysisJob).filter(AnalysisJob.task_id == self.task_id).first()
                 if job:
                     job.status = status.value
-                    job.updated_at = datetime.utcnow()
+                    job.updated_at = datetime.now(timezone.utc)
                     
                     if progress is not None:
                         job.progress_percentage = min(100.0, max(0.0, progress))
@@ -38,11 +94,11 @@ class ProgressTracker:
                     
                     # Set started_at on first non-pending status
                     if status != AnalysisStatus.PENDING and not job.started_at:
-                        job.started_at = datetime.utcnow()
+                        job.started_at = datetime.now(timezone.utc)
                     
                     # Set completed_at on final status
-                    if status in [AnalysisStatus.COMPLETE, AnalysisStatus.FAILED, AnalysisStatus.CANCELLED]:
-                        job.completed_at = datetime.utcnow()
+                    if status in TERMINAL_STATUSES:
+                        job.completed_at = datetime.now(timezone.utc)
                     
                     db.commit()
                     
@@ -55,6 +111,7 @@ class ProgressTracker:
     
     def update_file_progress(self, processed: int, total: int):
         """Update file processing progress."""
+        self._invalidate_cache()
         try:
             with get_session() as db:
                 job = db.query(AnalysisJob).filter(AnalysisJob.task_id == self.task_id).first()
@@ -67,6 +124,7 @@ class ProgressTracker:
     
     def update_tool_progress(self, completed_tools: int):
         """Update tool execution progress."""
+        self._invalidate_cache()
         try:
             with get_session() as db:
                 job = db.query(AnalysisJob).filter(AnalysisJob.task_id == self.task_id).first()
@@ -86,6 +144,7 @@ class ProgressTracker:
     
     def log_step_start(self, step_name: str, step_type: str = "tool"):
         """Log the start of an analysis step."""
+        self._invalidate_cache()
         try:
             with get_session() as db:
                 step = AnalysisStep(
@@ -103,6 +162,7 @@ class ProgressTracker:
     
     def log_step_complete(self, step_name: str, success: bool = True, error: str = None, output: Dict = None):
         """Log the completion of an analysis step."""
+        self._invalidate_cache()
         try:
             with get_session() as db:
                 step = db.query(AnalysisStep).filter(
@@ -132,6 +192,7 @@ class ProgressTracker:
     
     def log_error(self, error_message: str, error_details: Dict = None):
         """Log an error for the analysis job."""
+        self._invalidate_cache()
         try:
             with get_session() as db:
                 job = db.query(AnalysisJob).filter(AnalysisJob.task_id == self.task_id).first()
@@ -139,7 +200,7 @@ class ProgressTracker:
                     job.status = AnalysisStatus.FAILED.value
                     job.error_message = error_message
                     job.error_details = error_details
-                    job.completed_at = datetime.utcnow()
+                    job.completed_at = datetime.now(timezone.utc)
                     db.commit()
                     
                     logger.error(f"Task {self.task_id}: ERROR - {error_message}")
@@ -148,16 +209,18 @@ class ProgressTracker:
     
     def add_warning(self, warning_message: str):
         """Add a warning to the analysis job."""
+        self._invalidate_cache()
         try:
             with get_session() as db:
                 job = db.query(AnalysisJob).filter(AnalysisJob.task_id == self.task_id).first()
                 if job:
-                    warnings = job.warnings or []
+                    warnings = list(job.warnings or [])
                     warnings.append({
                         "message": warning_message,
-                        "timestamp": datetime.utcnow().isoformat()
+                        "timestamp": datetime.now(timezone.utc).isoformat()
                     })
                     job.warnings = warnings
+                    job.warnings_count = len(warnings)
                     db.commit()
                     
                     logger.warning(f"Task {self.task_id}: WARNING - {warning_message}")
@@ -166,6 +229,8 @@ class ProgressTracker:
 
     def get_current_status(self) -> Dict[str, Any]:
         """Get the current status and progress of the analysis."""
+        if self._status_cache is not None:
+            return self._status_cache
         try:
             with get_session() as db:
                 job = db.query(AnalysisJob).filter(AnalysisJob.task_id == self.task_id).first()
@@ -178,25 +243,85 @@ class ProgressTracker:
     
     def get_step_history(self) -> List[Dict[str, Any]]:
         """Get the history of all analysis steps."""
+        if self._steps_cache is not None:
+            return self._steps_cache
         try:
             with get_session() as db:
                 steps = db.query(AnalysisStep).filter(
                     AnalysisStep.task_id == self.task_id
                 ).order_by(AnalysisStep.started_at).all()
                 
-                return [{
-                    "step_name": step.step_name,
-                    "step_type": step.step_type,
-                    "status": step.status,
-                    "duration": step.get_duration(),
-                    "success": step.success,
-                    "error": step.error_message,
-                    "started_at": step.started_at.isoformat() if step.started_at else None,
-                    "completed_at": step.completed_at.isoformat() if step.completed_at else None,
-                } for step in steps]
+                return [_serialize_step(step) for step in steps]
         except Exception as e:
             logger.error(f"Failed to get step history for task {self.task_id}: {e}")
             return []
+    
+    def get_step_summary(self) -> Dict[str, int]:
+        """Get step totals by status, aggregated in the database."""
+        counts = self._step_counts_cache
+        if counts is None:
+            with get_session() as db:
+                counts = {
+                    status: count
+                    for _, status, count in _step_counts_query(db, [self.task_id])
+                }
+        return {
+            "total_steps": sum(counts.values()),
+            "completed_steps": counts.get("completed", 0),
+            "failed_steps": counts.get("failed", 0),
+            "running_steps": counts.get("running", 0),
+        }
+    
+    def get_job_info(self) -> Optional[Dict[str, Any]]:
+        """Get descriptive job metadata, or None if the job does not exist."""
+        if self._job_info_cache is not None:
+            return self._job_info_cache
+        with get_session() as db:
+            job = db.query(AnalysisJob).filter(AnalysisJob.task_id == self.task_id).first()
+            return _serialize_job_info(job) if job else None
+
+
+def _step_counts_query(db: Session, task_ids: List[str]):
+    """Count steps per (task_id, status) in a single GROUP BY."""
+    return db.query(
+        AnalysisStep.task_id,
+        AnalysisStep.status,
+        func.count(AnalysisStep.id)
+    ).filter(
+        AnalysisStep.task_id.in_(task_ids)
+    ).group_by(AnalysisStep.task_id, AnalysisStep.status).all()
+
+
+def _serialize_job_info(job: AnalysisJob) -> Dict[str, Any]:
+    """Convert a job row into the admin job_info payload."""
+    return {
+        "task_id": job.task_id,
+        "status": job.status,
+        "source_type": job.input_source_type,
+        "source_identifier": job.input_source_path,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "updated_at": job.updated_at,
+        "completed_at": job.completed_at,
+        "error_message": job.error_message,
+        "error_details": job.error_details,
+        "warnings": job.warnings,
+        "metadata": job.analysis_metadata,
+    }
+
+
+def _serialize_step(step: AnalysisStep) -> Dict[str, Any]:
+    """Convert a step row into the step history payload."""
+    return {
+        "step_name": step.step_name,
+        "step_type": step.step_type,
+        "status": step.status,
+        "duration": step.get_duration(),
+        "success": step.success,
+        "error": step.error_message,
+        "started_at": step.started_at,
+        "completed_at": step.completed_at,
+    }
 
 
 def get_all_active_jobs() -> List[Dict[str, Any]]:
@@ -218,7 +343,7 @@ def get_all_active_jobs() -> List[Dict[str, Any]]:
                 "current_step": job.current_step,
                 "duration": job.get_duration(),
                 "source": job.input_source_path,
-                "created_at": job.created_at.isoformat(),
+                "created_at": job.created_at,
             } for job in active_jobs]
     except Exception as e:
         logger.error(f"Failed to get active jobs: {e}")
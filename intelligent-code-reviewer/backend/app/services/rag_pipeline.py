@@ -6,7 +6,7 @@ from datetime import datetime
 
 from .code_retriever import CodeRetriever, CodeRetrievalError
 from .code_splitter import CodeSplitter, CodeChunk
-from .vector_store import VectorStore, VectorStoreError
+from .vector_store import VectorStoreError, get_vector_store
 from .database import DatabaseService
 from ..core.config import settings
 
@@ -52,7 +52,7 @@ class RAGIngestionPipeline:
             chunk_size=settings.max_file_size_mb * 1024,  # Convert MB to characters (rough estimate)
             chunk_overlap=200
         )
-        self.vector_store = VectorStore()
+        self.vector_store = get_vector_store()
         self.db_service = DatabaseService()
     
     async def process_git_repository(self, task_id: str, git_url: str, db_session) -> RAGPipelineResult:
@@ -110,7 +110,7 @@ class RAGIngestionPipeline:
         
         Args:
             task_id: Unique identifier for the analysis task
-            zip_file_path: Path to the ZIP file
+            zip_file_path: Path to the ZIP file, or to its already-extracted directory
             db_session: Database session for status updates
             
         Returns:
@@ -122,8 +122,11 @@ class RAGIngestionPipeline:
             # Update job status to PROCESSING_RAG
             self.db_service.update_job_status(db_session, task_id, "PROCESSING_RAG")
             
-            # Step 1: Extract ZIP file
-            project_directory = self.code_retriever.retrieve_from_zip_file(zip_file_path, task_id)
+            # Step 1: Extract ZIP file (uploads are already extracted at request time)
+            if Path(zip_file_path).is_dir():
+                project_directory = Path(zip_file_path)
+            else:
+                project_directory = self.code_retriever.retrieve_from_zip_file(zip_file_path, task_id)
             
             # Step 2: Process the extracted code
             result = await self._process_project_directory(task_id, project_directory, db_session)
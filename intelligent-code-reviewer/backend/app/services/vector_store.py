@@ -1,4 +1,6 @@
+import itertools
 import uuid
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
@@ -15,6 +17,13 @@ class VectorStoreError(Exception):
     pass
 
 
+# Generation of each task's collection, shared by every VectorStore in the
+# process. It changes whenever the collection is rebuilt, extended or deleted,
+# so callers caching search results can key them on it
+_collection_generations: Dict[str, int] = {}
+_generation_counter = itertools.count(1)
+
+
 class VectorStore:
     """
     Vector database service using ChromaDB for storing and querying code embeddings.
@@ -66,6 +75,14 @@ class VectorStore:
         except Exception as e:
             raise VectorStoreError(f"Failed to initialize embedding model: {str(e)}")
     
+    def collection_generation(self, task_id: str) -> int:
+        """Return a number that changes whenever the task's collection content changes."""
+        return _collection_generations.get(task_id, 0)
+    
+    def _bump_generation(self, task_id: str) -> None:
+        """Mark the task's collection as changed; next() on a count is atomic."""
+        _collection_generations[task_id] = next(_generation_counter)
+    
     def create_collection(self, task_id: str) -> str:
         """
         Create a new collection for a specific analysis task.
@@ -88,6 +105,7 @@ class VectorStore:
             except ValueError:
                 # Collection doesn't exist, which is fine
                 pass
+            self._bump_generation(task_id)
             
             # Create new collection
             collection = self.client.create_collection(
@@ -122,6 +140,8 @@ class VectorStore:
             except ValueError:
                 # Collection doesn't exist
                 return False
+            finally:
+                self._bump_generation(task_id)
                 
         except Exception as e:
             raise VectorStoreError(f"Failed to delete collection for task {task_id}: {str(e)}")
@@ -193,6 +213,7 @@ class VectorStore:
                 
                 added_count += len(batch_docs)
             
+            self._bump_generation(task_id)
             return added_count
             
         except Exception as e:
@@ -252,6 +273,84 @@ class VectorStore:
         except Exception as e:
             raise VectorStoreError(f"Failed to query similar code for task {task_id}: {str(e)}")
     
+    def search(self, task_id: str, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Semantic search for a single query.
+        
+        Args:
+            task_id: Unique identifier for the analysis task
+            query: Natural language or code query
+            k: Maximum number of results to return
+            
+        Returns:
+            List[Dict]: Matching chunks with content, metadata and similarity score
+            
+        Raises:
+            VectorStoreError: If the search fails
+        """
+        return self.batch_search(task_id, [query], k=k)[0]
+    
+    def batch_search(self, task_id: str, queries: List[str], k: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Semantic search for several queries in one round-trip.
+        
+        All queries are embedded in a single model call and sent to ChromaDB
+        as one multi-vector query, instead of one encode + query per query.
+        
+        Args:
+            task_id: Unique identifier for the analysis task
+            queries: Natural language or code queries
+            k: Maximum number of results per query
+            
+        Returns:
+            List[List[Dict]]: Results for each query, in the order of queries
+            
+        Raises:
+            VectorStoreError: If the search fails
+        """
+        if not queries:
+            return []
+        
+        try:
+            collection_name = f"task_{task_id}"
+            
+            # Get the collection
+            try:
+                collection = self.client.get_collection(collection_name)
+            except ValueError:
+                raise VectorStoreError(f"Collection for task {task_id} does not exist")
+            
+            query_embeddings = self._generate_embeddings(queries)
+            
+            results = collection.query(
+                query_embeddings=query_embeddings,
+                n_results=min(k, 100),  # ChromaDB limit
+                include=["documents", "metadatas", "distances"]
+            )
+            
+            # Format results; ChromaDB returns one list per query embedding
+            batched_results = []
+            for documents, metadatas, distances in zip(
+                results["documents"] or [[] for _ in queries],
+                results["metadatas"] or [[] for _ in queries],
+                results["distances"] or [[] for _ in queries]
+            ):
+                batched_results.append([
+                    {
+                        "content": document,
+                        "metadata": metadata,
+                        "similarity_score": 1 - distance  # Convert distance to similarity
+                    }
+                    for document, metadata, distance in zip(documents, metadatas, distances)
+                ])
+            
+            return batched_results
+            
+        except VectorStoreError:
+            raise
+        except Exception as e:
+            raise VectorStoreError(f"Failed to search for task {task_id}: {str(e)}")
+    
     def query_by_filters(self, task_id: str, filters: Dict[str, Any], n_results: int = 10) -> List[Dict[str, Any]]:
         """
         Query code chunks by metadata filters.
@@ -426,4 +525,10 @@ class VectorStore:
                 "client_initialized": self.client is not None,
                 "embedding_model_initialized": self.embedding_model is not None,
                 "test_operations_successful": False
-            } 
\ No newline at end of file
+            }
+
+
+@lru_cache(maxsize=1)
+def get_vector_store() -> VectorStore:
+    """Return the process-wide VectorStore, creating the client and model on first use."""
+    return VectorStore()
@@ -96,6 +96,20 @@ class SecurityScanner(BaseTool):
                 r"__import__\s*\("
             ]
         }
+        
+        # Compiled once here so a bad pattern fails at startup instead of
+        # being skipped on every file; the source strings are kept for
+        # reporting which pattern matched
+        self._compiled_secret_patterns = [
+            (secret_type, pattern, re.compile(pattern, re.IGNORECASE | re.MULTILINE))
+            for secret_type, patterns in self.secret_patterns.items()
+            for pattern in patterns
+        ]
+        self._compiled_vulnerability_patterns = [
+            (vuln_type, pattern, re.compile(pattern, re.IGNORECASE | re.MULTILINE))
+            for vuln_type, patterns in self.vulnerability_patterns.items()
+            for pattern in patterns
+        ]
     
     async def analyze(self, context: AgentContext, config: Dict[str, Any] = None) -> AnalysisResult:
         """Perform security analysis on the codebase."""
@@ -210,34 +224,29 @@ class SecurityScanner(BaseTool):
             
             lines = content.split("\n")
             
-            for secret_type, patterns in self.secret_patterns.items():
-                for pattern in patterns:
-                    try:
-                        matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
-                        for match in matches:
-                            # Find line number
-                            line_num = content[:match.start()].count('\n') + 1
-                            
-                            # Extract matched content (mask sensitive parts)
-                            matched_text = match.group(0)
-                            masked_text = self._mask_sensitive_data(matched_text)
-                            
-                            secret_findings.append({
-                                "type": "security_secret",
-                                "pattern": secret_type,
-                                "severity": "critical" if secret_type in ["password", "private_key"] else "high",
-                                "file": file_path,
-                                "line": line_num,
-                                "message": f"Hardcoded {secret_type.replace('_', ' ')} detected",
-                                "content_preview": masked_text,
-                                "metadata": {
-                                    "secret_type": secret_type,
-                                    "pattern_matched": pattern,
-                                    "confidence": 0.9
-                                }
-                            })
-                    except re.error:
-                        continue
+            for secret_type, pattern, secret_re in self._compiled_secret_patterns:
+                for match in secret_re.finditer(content):
+                    # Find line number
+                    line_num = content[:match.start()].count('\n') + 1
+                    
+                    # Extract matched content (mask sensitive parts)
+                    matched_text = match.group(0)
+                    masked_text = self._mask_sensitive_data(matched_text)
+                    
+                    secret_findings.append({
+                        "type": "security_secret",
+                        "pattern": secret_type,
+                        "severity": "critical" if secret_type in ["password", "private_key"] else "high",
+                        "file": file_path,
+                        "line": line_num,
+                        "message": f"Hardcoded {secret_type.replace('_', ' ')} detected",
+                        "content_preview": masked_text,
+                        "metadata": {
+                            "secret_type": secret_type,
+                            "pattern_matched": pattern,
+                            "confidence": 0.9
+                        }
+                    })
         
         return secret_findings
     
@@ -250,30 +259,25 @@ class SecurityScanner(BaseTool):
             file_path = result["file_path"]
             lines = content.split("\n")
             
-            for vuln_type, patterns in self.vulnerability_patterns.items():
-                for pattern in patterns:
-                    try:
-                        matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
-                        for match in matches:
-                            line_num = content[:match.start()].count('\n') + 1
-                            matched_line = lines[line_num - 1] if line_num <= len(lines) else ""
-                            
-                            vulnerability_findings.append({
-                                "type": "security_vulnerability",
-                                "pattern": vuln_type,
-                                "severity": self._get_vulnerability_severity(vuln_type),
-                                "file": file_path,
-                                "line": line_num,
-                                "message": f"Potential {vuln_type.replace('_', ' ')} vulnerability",
-                                "content_preview": matched_line.strip()[:100],
-                                "metadata": {
-                                    "vulnerability_type": vuln_type,
-                                    "pattern_matched": pattern,
-                                    "confidence": 0.8
-                                }
-                            })
-                    except re.error:
-                        continue
+            for vuln_type, pattern, vuln_re in self._compiled_vulnerability_patterns:
+                for match in vuln_re.finditer(content):
+                    line_num = content[:match.start()].count('\n') + 1
+                    matched_line = lines[line_num - 1] if line_num <= len(lines) else ""
+                    
+                    vulnerability_findings.append({
+                        "type": "security_vulnerability",
+                        "pattern": vuln_type,
+                        "severity": self._get_vulnerability_severity(vuln_type),
+                        "file": file_path,
+                        "line": line_num,
+                        "message": f"Potential {vuln_type.replace('_', ' ')} vulnerability",
+                        "content_preview": matched_line.strip()[:100],
+                        "metadata": {
+                            "vulnerability_type": vuln_type,
+                            "pattern_matched": pattern,
+                            "confidence": 0.8
+                        }
+                    })
         
         return vulnerability_findings
     
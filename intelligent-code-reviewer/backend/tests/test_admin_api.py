@@ -0,0 +1,98 @@
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api import admin
+from app.models import AnalysisJob, AnalysisStep
+
+
+def make_admin_client(monkeypatch, session_factory) -> TestClient:
+    """Create a test client serving the admin router on the given sessions."""
+    monkeypatch.setattr(admin, "SessionLocal", session_factory)
+    test_app = FastAPI()
+    test_app.include_router(admin.router, prefix="/api")
+    return TestClient(test_app)
+
+
+@pytest.fixture
+def admin_client(test_db: Session, monkeypatch) -> TestClient:
+    """Create an admin test client backed by the test database."""
+    return make_admin_client(monkeypatch, sessionmaker(bind=test_db.get_bind()))
+
+
+@pytest.fixture
+def broken_admin_client(monkeypatch) -> TestClient:
+    """Create an admin test client whose database has no tables."""
+    empty_engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    return make_admin_client(monkeypatch, sessionmaker(bind=empty_engine))
+
+
+class TestAdminJobStream:
+    """Test the NDJSON job listing."""
+
+    def test_jobs_streamed_as_ndjson(self, admin_client: TestClient, test_db: Session, sample_task_id: str, sample_git_url: str):
+        """Test each job is returned as one JSON line."""
+        test_db.add(AnalysisJob(
+            task_id=sample_task_id,
+            status="PENDING",
+            input_source_type="git_url",
+            input_source_path=sample_git_url
+        ))
+        test_db.commit()
+
+        response = admin_client.get("/api/admin/jobs/all")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        jobs = [orjson.loads(line) for line in response.content.splitlines()]
+        assert [job["task_id"] for job in jobs] == [sample_task_id]
+        assert jobs[0]["source"] == sample_git_url
+
+    def test_query_error_returns_500(self, broken_admin_client: TestClient):
+        """Test a failing query is reported before streaming starts."""
+        response = broken_admin_client.get("/api/admin/jobs/all")
+
+        assert response.status_code == 500
+        assert "Failed to get jobs" in response.json()["detail"]
+
+
+class TestAdminJobLogs:
+    """Test the NDJSON step log stream."""
+
+    def test_step_logs_streamed_in_order(self, admin_client: TestClient, test_db: Session, sample_task_id: str):
+        """Test a finished step yields a start entry followed by its completion."""
+        started_at = datetime(2024, 1, 1, 12, 0, 0)
+        test_db.add(AnalysisStep(
+            task_id=sample_task_id,
+            step_name="Clone repository",
+            step_type="rag",
+            status="completed",
+            started_at=started_at,
+            completed_at=started_at + timedelta(seconds=5),
+            success=True
+        ))
+        test_db.commit()
+
+        response = admin_client.get(f"/api/admin/jobs/{sample_task_id}/logs")
+
+        assert response.status_code == 200
+        entries = [orjson.loads(line) for line in response.content.splitlines()]
+        assert [entry["type"] for entry in entries] == ["step_start", "step_complete"]
+        assert entries[0]["message"] == "Started rag: Clone repository"
+        assert entries[1]["duration"] == pytest.approx(5.0, abs=1e-3)
+
+    def test_query_error_returns_500(self, broken_admin_client: TestClient, sample_task_id: str):
+        """Test a failing query is reported before streaming starts."""
+        response = broken_admin_client.get(f"/api/admin/jobs/{sample_task_id}/logs")
+
+        assert response.status_code == 500
+        assert "Failed to get logs" in response.json()["detail"]
@@ -0,0 +1,152 @@
+import io
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pathlib import Path
+from types import SimpleNamespace
+
+# GitPython is a runtime dependency of the code retriever the router imports
+pytest.importorskip("git")
+
+from app.api import analysis
+from app.db.database import get_db_service
+
+
+class RecordingDatabaseService:
+    """Stand-in for DatabaseService that records created jobs."""
+
+    def __init__(self):
+        self.jobs = []
+
+    async def create_job(self, **job):
+        self.jobs.append(job)
+
+
+class RecordingAgentService:
+    """Stand-in for AgentIntegrationService that records analysis runs."""
+
+    def __init__(self, project_dir: Path, error: Exception = None):
+        self.project_dir = project_dir
+        self.error = error
+        self.jobs = []
+        self.extracted = []
+        self.rag_pipeline = SimpleNamespace(
+            code_retriever=SimpleNamespace(retrieve_from_zip_file=self.retrieve_from_zip_file)
+        )
+
+    def retrieve_from_zip_file(self, upload, task_id: str) -> Path:
+        self.extracted.append((upload.read(), task_id))
+        return self.project_dir
+
+    async def process_analysis_job(self, **job):
+        self.jobs.append(job)
+        if self.error:
+            raise self.error
+        return {"task_id": job["task_id"], "status": "completed"}
+
+
+@pytest.fixture
+def agent_service(monkeypatch, tmp_path: Path) -> RecordingAgentService:
+    """Serve the analysis router from a recording agent service."""
+    service = RecordingAgentService(tmp_path)
+    monkeypatch.setattr(analysis, "get_agent_service", lambda: service)
+    return service
+
+
+@pytest.fixture
+def db_service() -> RecordingDatabaseService:
+    """Return a database service that records created jobs."""
+    return RecordingDatabaseService()
+
+
+@pytest.fixture
+def analysis_client(db_service: RecordingDatabaseService, agent_service: RecordingAgentService) -> TestClient:
+    """Create a test client serving only the analysis router."""
+    test_app = FastAPI()
+    test_app.include_router(analysis.router, prefix="/api")
+
+    async def override_get_db_service():
+        yield db_service
+
+    test_app.dependency_overrides[get_db_service] = override_get_db_service
+
+    with TestClient(test_app) as test_client:
+        yield test_client
+
+
+class TestAnalysisJobScheduling:
+    """Test that the analysis endpoints run the analysis job in the background."""
+
+    def test_analyze_url_runs_job(self, analysis_client: TestClient, db_service, agent_service, sample_git_url: str):
+        """Test /api/analyze/url records the job and runs its analysis."""
+        response = analysis_client.post("/api/analyze/url", json={"git_url": sample_git_url})
+
+        assert response.status_code == 200
+        task_id = response.json()["task_id"]
+
+        assert [job["task_id"] for job in db_service.jobs] == [task_id]
+        assert agent_service.jobs == [{
+            "task_id": task_id,
+            "source_type": "url",
+            "source_location": sample_git_url,
+            "db_service": db_service,
+            "analysis_requirements": None,
+        }]
+
+    def test_analyze_zip_runs_job(self, analysis_client: TestClient, db_service, agent_service, tmp_path: Path):
+        """Test /api/analyze/zip extracts the upload and runs its analysis."""
+        zip_file = ("test.zip", io.BytesIO(b"PK\x03\x04"), "application/zip")
+
+        response = analysis_client.post("/api/analyze/zip", files={"file": zip_file})
+
+        assert response.status_code == 200
+        task_id = response.json()["task_id"]
+
+        assert agent_service.extracted == [(b"PK\x03\x04", task_id)]
+        assert [job["task_id"] for job in db_service.jobs] == [task_id]
+        assert agent_service.jobs == [{
+            "task_id": task_id,
+            "source_type": "zip",
+            "source_location": str(tmp_path),
+            "db_service": db_service,
+            "analysis_requirements": None,
+        }]
+
+    def test_analyze_zip_rejects_other_files(self, analysis_client: TestClient, agent_service):
+        """Test non-ZIP uploads are refused without starting a job."""
+        upload = ("code.tar", io.BytesIO(b"data"), "application/x-tar")
+
+        response = analysis_client.post("/api/analyze/zip", files={"file": upload})
+
+        assert response.status_code == 400
+        assert agent_service.jobs == []
+
+
+class TestRunAnalysisJob:
+    """Test the background analysis job runner."""
+
+    async def test_runs_integrated_analysis(self, agent_service, db_service, sample_git_url: str):
+        """Test the job hands its arguments to the agent integration service."""
+        await analysis.run_analysis_job(
+            task_id="git_1234abcd",
+            source_type="url",
+            source_location=sample_git_url,
+            db_service=db_service,
+            analysis_requirements=["security"]
+        )
+
+        assert agent_service.jobs == [{
+            "task_id": "git_1234abcd",
+            "source_type": "url",
+            "source_location": sample_git_url,
+            "db_service": db_service,
+            "analysis_requirements": ["security"],
+        }]
+
+    async def test_failure_does_not_propagate(self, agent_service, db_service, sample_git_url: str):
+        """Test a failing analysis is logged rather than raised from the background task."""
+        agent_service.error = RuntimeError("clone failed")
+
+        await analysis.run_analysis_job("git_1234abcd", "url", sample_git_url, db_service)
+
+        assert len(agent_service.jobs) == 1
@@ -0,0 +1,253 @@
+import pytest
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db import database
+from app.db.database import AgentLogBuffer, DatabaseService
+from app.models import Base, AnalysisJob, AgentLog, FinalReport
+
+
+@pytest.fixture
+async def db_service():
+    """
+    Create a DatabaseService on a fresh in-memory async database.
+
+    The connection PRAGMAs are not registered here, so SQLite leaves
+    foreign key enforcement off.
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield DatabaseService(session)
+
+    await engine.dispose()
+
+
+async def count_rows(db_service: DatabaseService, model, task_id: str) -> int:
+    """Count the rows of a model that belong to a task."""
+    result = await db_service.session.execute(
+        select(func.count()).select_from(model).where(model.task_id == task_id)
+    )
+    return result.scalar_one()
+
+
+async def add_job(db_service: DatabaseService, task_id: str, created_at: str, status: str = "PENDING"):
+    """Insert a job with created_at in the format SQLite's server default stores."""
+    await db_service.session.execute(
+        insert(AnalysisJob).values(
+            task_id=task_id,
+            status=status,
+            input_source_type="git_url",
+            input_source_path="https://github.com/test/repo.git",
+            created_at=func.datetime(created_at)
+        )
+    )
+    await db_service.session.commit()
+
+
+async def collect_pages(db_service: DatabaseService, limit: int, **filters) -> list:
+    """Follow list_jobs cursors to the end and return the task ids of each page."""
+    pages = []
+    cursor = None
+    while True:
+        jobs, cursor = await db_service.list_jobs(limit=limit, cursor=cursor, **filters)
+        pages.append([job.task_id for job in jobs])
+        if cursor is None:
+            return pages
+
+
+class FakeClock:
+    """Manually advanced stand-in for time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestDeleteJob:
+    """Test DatabaseService.delete_job."""
+
+    async def test_delete_job_removes_logs_and_report(self, db_service: DatabaseService, sample_task_id: str, sample_git_url: str, sample_report_content: dict):
+        """Test deleting a job also deletes its agent logs and final report."""
+        await db_service.create_job(sample_task_id, "git_url", sample_git_url)
+        await db_service.log_agent_action(sample_task_id, 1, "Thought", "tool", "input", "output")
+        await db_service.log_agent_action(sample_task_id, 2, "Thought", "tool", "input", "output")
+        await db_service.create_final_report(sample_task_id, sample_report_content)
+
+        assert await db_service.delete_job(sample_task_id) is True
+
+        assert await count_rows(db_service, AnalysisJob, sample_task_id) == 0
+        assert await count_rows(db_service, AgentLog, sample_task_id) == 0
+        assert await count_rows(db_service, FinalReport, sample_task_id) == 0
+
+    async def test_delete_job_keeps_other_jobs(self, db_service: DatabaseService, sample_task_id: str, sample_git_url: str):
+        """Test deleting a job leaves other jobs and their logs untouched."""
+        await db_service.create_job(sample_task_id, "git_url", sample_git_url)
+        await db_service.create_job("other-task", "git_url", sample_git_url)
+        await db_service.log_agent_action("other-task", 1, "Thought", "tool", "input", "output")
+
+        await db_service.delete_job(sample_task_id)
+
+        assert await count_rows(db_service, AnalysisJob, "other-task") == 1
+        assert await count_rows(db_service, AgentLog, "other-task") == 1
+
+    async def test_delete_missing_job(self, db_service: DatabaseService):
+        """Test deleting an unknown job reports nothing was deleted."""
+        assert await db_service.delete_job("nonexistent-task-id") is False
+
+
+class TestListJobs:
+    """Test keyset pagination in DatabaseService.list_jobs."""
+
+    @pytest.fixture
+    async def tied_jobs(self, db_service: DatabaseService) -> DatabaseService:
+        """Add five jobs whose created_at values tie in two groups."""
+        await add_job(db_service, "job-1", "2024-01-01 12:00:00", status="COMPLETE")
+        await add_job(db_service, "job-2", "2024-01-01 12:00:00")
+        await add_job(db_service, "job-3", "2024-01-01 12:00:01", status="COMPLETE")
+        await add_job(db_service, "job-4", "2024-01-01 12:00:01")
+        await add_job(db_service, "job-5", "2024-01-01 12:00:01", status="COMPLETE")
+        return db_service
+
+    async def test_pages_split_across_tied_timestamps(self, tied_jobs: DatabaseService):
+        """Test pages break ties by task_id so no job is skipped or repeated."""
+        pages = await collect_pages(tied_jobs, limit=2)
+
+        assert pages == [["job-5", "job-4"], ["job-3", "job-2"], ["job-1"]]
+
+    async def test_page_size_one_walks_every_job(self, tied_jobs: DatabaseService):
+        """Test single-row pages resume correctly inside each tie group."""
+        pages = await collect_pages(tied_jobs, limit=1)
+
+        assert pages == [["job-5"], ["job-4"], ["job-3"], ["job-2"], ["job-1"], []]
+
+    async def test_status_filter_with_ties(self, tied_jobs: DatabaseService):
+        """Test the status filter and the cursor combine across tied timestamps."""
+        pages = await collect_pages(tied_jobs, limit=2, status_filter="COMPLETE")
+
+        assert pages == [["job-5", "job-3"], ["job-1"]]
+
+    async def test_cursor_for_full_page_only(self, tied_jobs: DatabaseService):
+        """Test a cursor is returned only when the page was full."""
+        jobs, cursor = await tied_jobs.list_jobs(limit=5)
+
+        assert len(jobs) == 5
+        assert cursor == (jobs[-1].created_at, "job-1")
+
+        jobs, cursor = await tied_jobs.list_jobs(limit=6)
+
+        assert len(jobs) == 5
+        assert cursor is None
+
+
+class TestAgentLogBuffer:
+    """Test AgentLogBuffer flushing."""
+
+    @pytest.fixture
+    async def job_service(self, db_service: DatabaseService, sample_task_id: str, sample_git_url: str) -> DatabaseService:
+        """Create the job the buffered logs belong to."""
+        await db_service.create_job(sample_task_id, "git_url", sample_git_url)
+        return db_service
+
+    @pytest.fixture
+    def clock(self, monkeypatch) -> FakeClock:
+        """Drive the buffer's age checks from a fake clock."""
+        fake = FakeClock()
+        monkeypatch.setattr(database.time, "monotonic", fake)
+        return fake
+
+    async def add_steps(self, buffer: AgentLogBuffer, task_id: str, *step_indexes: int):
+        """Queue one log row per step index."""
+        for step_index in step_indexes:
+            await buffer.add(task_id, step_index, "Thought", "tool", "input", "output")
+
+    async def test_flushes_when_max_size_reached(self, job_service: DatabaseService, clock: FakeClock, sample_task_id: str):
+        """Test rows stay pending until max_size are queued, then are written together."""
+        buffer = AgentLogBuffer(job_service, max_size=3, max_delay=60)
+
+        await self.add_steps(buffer, sample_task_id, 1, 2)
+        assert await count_rows(job_service, AgentLog, sample_task_id) == 0
+
+        await self.add_steps(buffer, sample_task_id, 3)
+        assert await count_rows(job_service, AgentLog, sample_task_id) == 3
+
+    async def test_flushes_when_max_delay_elapsed(self, job_service: DatabaseService, clock: FakeClock, sample_task_id: str):
+        """Test a row added after the oldest pending row goes stale flushes the batch."""
+        buffer = AgentLogBuffer(job_service, max_size=100, max_delay=0.25)
+
+        await self.add_steps(buffer, sample_task_id, 1)
+        clock.now += 0.2
+        await self.add_steps(buffer, sample_task_id, 2)
+        assert await count_rows(job_service, AgentLog, sample_task_id) == 0
+
+        clock.now += 0.05
+        await self.add_steps(buffer, sample_task_id, 3)
+        assert await count_rows(job_service, AgentLog, sample_task_id) == 3
+
+        # The age is measured from the oldest row of the new batch
+        await self.add_steps(buffer, sample_task_id, 4)
+        assert await count_rows(job_service, AgentLog, sample_task_id) == 3
+
+    async def test_flushes_on_context_exit(self, job_service: DatabaseService, clock: FakeClock, sample_task_id: str):
+        """Test leaving the context writes the remaining rows in step order."""
+        async with AgentLogBuffer(job_service, max_size=100, max_delay=60) as buffer:
+            await self.add_steps(buffer, sample_task_id, 1, 2)
+            assert await count_rows(job_service, AgentLog, sample_task_id) == 0
+
+        logs = await job_service.get_agent_logs(sample_task_id)
+        assert [log.step_index for log in logs] == [1, 2]
+
+    async def test_flushes_on_context_exit_after_error(self, job_service: DatabaseService, clock: FakeClock, sample_task_id: str):
+        """Test pending rows are still written when the block raises."""
+        with pytest.raises(RuntimeError):
+            async with AgentLogBuffer(job_service, max_size=100, max_delay=60) as buffer:
+                await self.add_steps(buffer, sample_task_id, 1)
+                raise RuntimeError("agent failed")
+
+        assert await count_rows(job_service, AgentLog, sample_task_id) == 1
+
+
+class TestUpdateJobStatus:
+    """Test DatabaseService.update_job_status metadata merging."""
+
+    async def stored_metadata(self, db_service: DatabaseService, task_id: str) -> dict:
+        """Read the job's metadata column straight from the database."""
+        result = await db_service.session.execute(
+            select(AnalysisJob.analysis_metadata).where(AnalysisJob.task_id == task_id)
+        )
+        return result.scalar_one()
+
+    async def test_metadata_merge_is_shallow(self, db_service: DatabaseService, sample_task_id: str, sample_git_url: str):
+        """Test top-level keys replace nested objects whole and None is kept as null, like dict.update."""
+        await db_service.create_job(sample_task_id, "git_url", sample_git_url)
+        await db_service.update_job_status(sample_task_id, "RUNNING", {
+            "progress": {"step": 1, "total": 5},
+            "error": "clone failed",
+            "source": "git",
+        })
+
+        await db_service.update_job_status(sample_task_id, "RUNNING", {
+            "progress": {"step": 2},
+            "error": None,
+            "tags": ["retry"],
+        })
+
+        assert await self.stored_metadata(db_service, sample_task_id) == {
+            "progress": {"step": 2},
+            "error": None,
+            "source": "git",
+            "tags": ["retry"],
+        }
+
+    async def test_metadata_merge_into_empty_column(self, db_service: DatabaseService, sample_task_id: str, sample_git_url: str):
+        """Test merging into a job without metadata stores the patch as given."""
+        await db_service.create_job(sample_task_id, "git_url", sample_git_url)
+
+        assert await db_service.update_job_status(sample_task_id, "RUNNING", {"flag": True, "count": 0}) is True
+
+        assert await self.stored_metadata(db_service, sample_task_id) == {"flag": True, "count": 0}
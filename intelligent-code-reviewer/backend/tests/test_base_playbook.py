@@ -0,0 +1,102 @@
+import pytest
+from types import SimpleNamespace
+
+# The playbooks pull in the agent/RAG stack; skip only where its packages are missing
+for _package in ("openai", "chromadb", "git", "sentence_transformers", "langchain_text_splitters"):
+    pytest.importorskip(_package)
+
+from app.playbooks import base_playbook
+from app.playbooks.high_complexity import HighComplexityPlaybook
+
+
+class RecordingVectorStore:
+    """Stand-in for VectorStore that counts searches and tracks one collection's generation."""
+
+    def __init__(self):
+        self.generation = 1
+        self.searches = []
+
+    def collection_generation(self, task_id: str) -> int:
+        return self.generation
+
+    def batch_search(self, task_id: str, queries: list, k: int = 5) -> list:
+        self.searches.append(list(queries))
+        return [
+            [{"content": f"{query} v{self.generation}", "metadata": {"file_path": "app/main.py"}}]
+            for query in queries
+        ]
+
+
+@pytest.fixture
+def vector_store(monkeypatch) -> RecordingVectorStore:
+    """Serve pattern searches from a recording store with an empty cache."""
+    store = RecordingVectorStore()
+    monkeypatch.setattr(base_playbook, "get_vector_store", lambda: store)
+    base_playbook._pattern_cache.clear()
+    yield store
+    base_playbook._pattern_cache.clear()
+
+
+@pytest.fixture
+def playbook() -> HighComplexityPlaybook:
+    """Create a concrete playbook to run the shared search helper."""
+    return HighComplexityPlaybook()
+
+
+CONTEXT = SimpleNamespace(vector_store_collection="task_1")
+
+
+class TestSearchPatternsCache:
+    """Test the pattern search cache in BasePlaybook._search_patterns."""
+
+    async def test_repeated_queries_served_from_cache(self, playbook, vector_store):
+        """Test only queries not seen before reach the vector store."""
+        await playbook._search_patterns(CONTEXT, ["def", "class"])
+        results = await playbook._search_patterns(CONTEXT, ["def", "import"])
+
+        assert vector_store.searches == [["def", "class"], ["import"]]
+        assert [r["content"] for r in results] == ["def v1", "import v1"]
+
+    async def test_rebuilt_collection_not_served_stale_results(self, playbook, vector_store):
+        """Test a new collection generation bypasses results cached before it."""
+        await playbook._search_patterns(CONTEXT, ["def"])
+        vector_store.generation = 2
+
+        results = await playbook._search_patterns(CONTEXT, ["def"])
+
+        assert vector_store.searches == [["def"], ["def"]]
+        assert [r["content"] for r in results] == ["def v2"]
+
+    async def test_callers_cannot_mutate_cache(self, playbook, vector_store):
+        """Test changing a returned result's metadata leaves the cached entry intact."""
+        first = await playbook._search_patterns(CONTEXT, ["def"])
+        first[0]["metadata"]["file_path"] = "changed.py"
+
+        second = await playbook._search_patterns(CONTEXT, ["def"])
+
+        assert second[0]["metadata"]["file_path"] == "app/main.py"
+        assert len(vector_store.searches) == 1
+
+
+class TestCollectionGeneration:
+    """Test VectorStore bumps a collection's generation whenever its content changes."""
+
+    @pytest.fixture
+    def store(self):
+        """Create a VectorStore on a client stand-in, skipping the model load."""
+        from app.services.vector_store import VectorStore
+
+        store = VectorStore.__new__(VectorStore)
+        store.client = SimpleNamespace(delete_collection=lambda name: None, create_collection=lambda **kwargs: None)
+        return store
+
+    def test_rebuild_and_delete_bump_generation(self, store):
+        """Test recreating and deleting a collection each give it a new generation."""
+        seen = [store.collection_generation("gen-task")]
+        store.create_collection("gen-task")
+        seen.append(store.collection_generation("gen-task"))
+        store.delete_collection("gen-task")
+        seen.append(store.collection_generation("gen-task"))
+
+        assert len(set(seen)) == 3
+        assert store.collection_generation("other-task") == 0
@@ -0,0 +1,146 @@
+import pytest
+
+from app.core import cache
+from app.core.cache import LRUCache
+
+
+class FakeClock:
+    """Manually advanced stand-in for time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    """Drive the cache's expiry checks from a fake clock."""
+    fake = FakeClock()
+    monkeypatch.setattr(cache.time, "monotonic", fake)
+    return fake
+
+
+class TestLRUCache:
+    """Test the LRUCache class."""
+
+    def test_get_returns_stored_value(self):
+        """Test a stored value is returned and a missing key gives the default."""
+        lru = LRUCache(maxsize=2)
+        lru.set("a", 1)
+
+        assert lru.get("a") == 1
+        assert lru.get("missing") is None
+        assert lru.get("missing", "default") == "default"
+
+    def test_entry_expires_after_ttl(self, clock: FakeClock):
+        """Test an entry is served until its TTL passes and then dropped."""
+        lru = LRUCache(maxsize=2, ttl=5)
+        lru.set("a", 1)
+
+        clock.now += 4.9
+        assert lru.get("a") == 1
+
+        clock.now += 0.1
+        assert lru.get("a") is None
+        assert len(lru) == 0
+
+    def test_no_ttl_never_expires(self, clock: FakeClock):
+        """Test entries without a TTL survive any amount of time."""
+        lru = LRUCache(maxsize=2)
+        lru.set("a", 1)
+
+        clock.now += 10 ** 9
+        assert lru.get("a") == 1
+
+    def test_set_refreshes_ttl(self, clock: FakeClock):
+        """Test overwriting an entry restarts its TTL."""
+        lru = LRUCache(maxsize=2, ttl=5)
+        lru.set("a", 1)
+        clock.now += 4
+        lru.set("a", 2)
+
+        clock.now += 4
+        assert lru.get("a") == 2
+
+    def test_evicts_least_recently_used(self):
+        """Test the entry evicted when full is the least recently read or written."""
+        lru = LRUCache(maxsize=3)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.set("c", 3)
+
+        # Reading "a" makes "b" the least recently used
+        lru.get("a")
+        lru.set("d", 4)
+
+        assert lru.get("b") is None
+        assert [lru.get(key) for key in ("a", "c", "d")] == [1, 3, 4]
+
+        # Overwriting "c" makes "a" the least recently used
+        lru.set("c", 30)
+        lru.set("e", 5)
+
+        assert lru.get("a") is None
+        assert [lru.get(key) for key in ("c", "d", "e")] == [30, 4, 5]
+
+    def test_get_or_set_calls_factory_once(self):
+        """Test get_or_set only computes the value on a miss."""
+        lru = LRUCache(maxsize=2)
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return "value"
+
+        assert lru.get_or_set("a", factory) == "value"
+        assert lru.get_or_set("a", factory) == "value"
+        assert len(calls) == 1
+
+    def test_pop_removes_entry(self):
+        """Test pop returns the value and removes the key."""
+        lru = LRUCache(maxsize=2)
+        lru.set("a", 1)
+
+        assert lru.pop("a") == 1
+        assert lru.pop("a", "gone") == "gone"
+        assert len(lru) == 0
+
+    def test_invalidate_removes_matching_keys(self):
+        """Test invalidate drops only keys matching the predicate and counts them."""
+        lru = LRUCache(maxsize=10)
+        for key in ("admin:stats", "admin:jobs", "report:1"):
+            lru.set(key, key)
+
+        removed = lru.invalidate(lambda key: key.startswith("admin:"))
+
+        assert removed == 2
+        assert lru.get("admin:stats") is None
+        assert lru.get("admin:jobs") is None
+        assert lru.get("report:1") == "report:1"
+        assert lru.invalidate(lambda key: False) == 0
+
+    def test_stats_counts_hits_misses_and_evictions(self, clock: FakeClock):
+        """Test the counters track hits, misses (including expiry) and evictions."""
+        lru = LRUCache(maxsize=2, ttl=5)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.set("c", 3)  # evicts "a"
+
+        lru.get("b")  # hit
+        lru.get("a")  # miss: evicted
+        clock.now += 5
+        lru.get("c")  # miss: expired
+
+        assert lru.stats() == {"size": 1, "hits": 1, "misses": 2, "evictions": 1}
+
+    def test_clear_keeps_counters(self):
+        """Test clear empties the cache without resetting its statistics."""
+        lru = LRUCache(maxsize=2)
+        lru.set("a", 1)
+        lru.get("a")
+        lru.clear()
+
+        assert len(lru) == 0
+        assert lru.stats()["hits"] == 1
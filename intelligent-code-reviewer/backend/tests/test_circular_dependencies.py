@@ -0,0 +1,105 @@
+import pytest
+
+# The playbooks pull in the agent/RAG stack; skip where it cannot load
+circular_dependencies = pytest.importorskip("app.playbooks.circular_dependencies")
+
+
+@pytest.fixture(scope="module")
+def playbook():
+    """Create one circular dependency playbook for the module."""
+    return circular_dependencies.CircularDependenciesPlaybook()
+
+
+def reachable(adjacency, start: int) -> set:
+    """Return every node reachable from start, including start."""
+    seen = {start}
+    pending = [start]
+    while pending:
+        for neighbor in adjacency[pending.pop()]:
+            if neighbor not in seen:
+                seen.add(neighbor)
+                pending.append(neighbor)
+    return seen
+
+
+def brute_force_components(adjacency) -> set:
+    """Group nodes that reach each other, for checking Tarjan's output."""
+    reach = [reachable(adjacency, node) for node in range(len(adjacency))]
+    return {
+        frozenset(other for other in reach[node] if node in reach[other])
+        for node in range(len(adjacency))
+    }
+
+
+class TestStronglyConnectedComponents:
+    """Test the iterative Tarjan SCC pass."""
+
+    # 0 -> 1 -> 2 -> 0 with the shorter 0 <-> 1 cycle nested inside it
+    # 3 -> 4 -> 5 -> 3 with the shorter 3 <-> 4 cycle nested inside it
+    # 6 imports itself, 7 is isolated, 8 <-> 9 feeds into the first cycle
+    ADJACENCY = [
+        [1],        # 0
+        [0, 2],     # 1
+        [0, 3],     # 2
+        [4],        # 3
+        [3, 5],     # 4
+        [3, 6],     # 5
+        [6],        # 6
+        [],         # 7
+        [0, 9],     # 8
+        [8],        # 9
+    ]
+
+    def test_multiple_and_nested_cycles(self, playbook):
+        """Test each cycle group, nested cycles included, forms one component."""
+        components = playbook._strongly_connected_components(self.ADJACENCY)
+
+        assert {frozenset(c) for c in components} == {
+            frozenset({0, 1, 2}),
+            frozenset({3, 4, 5}),
+            frozenset({6}),
+            frozenset({7}),
+            frozenset({8, 9}),
+        }
+        assert sorted(node for c in components for node in c) == list(range(10))
+
+    def test_matches_brute_force(self, playbook):
+        """Test the components agree with mutual reachability."""
+        components = playbook._strongly_connected_components(self.ADJACENCY)
+
+        assert {frozenset(c) for c in components} == brute_force_components(self.ADJACENCY)
+
+    def test_components_in_reverse_topological_order(self, playbook):
+        """Test a component is emitted only after every component it imports."""
+        components = playbook._strongly_connected_components(self.ADJACENCY)
+        position = {node: i for i, c in enumerate(components) for node in c}
+
+        for node, neighbors in enumerate(self.ADJACENCY):
+            for neighbor in neighbors:
+                assert position[neighbor] <= position[node]
+
+    def test_long_cycle_does_not_recurse(self, playbook):
+        """Test a cycle deeper than the recursion limit is found as one component."""
+        size = 5000
+        adjacency = [[(node + 1) % size] for node in range(size)]
+
+        components = playbook._strongly_connected_components(adjacency)
+
+        assert len(components) == 1
+        assert sorted(components[0]) == list(range(size))
+
+    def test_detect_cycles_reports_each_cycle_group(self, playbook):
+        """Test one finding per cyclic component, using its shortest cycle."""
+        module_names = [f"pkg.m{node}" for node in range(len(self.ADJACENCY))]
+
+        cycles = [
+            finding["metadata"]["cycle"]
+            for finding in playbook._detect_cycles(self.ADJACENCY, module_names)
+        ]
+
+        assert sorted(cycles) == [
+            ["pkg.m0", "pkg.m1", "pkg.m0"],
+            ["pkg.m3", "pkg.m4", "pkg.m3"],
+            ["pkg.m6", "pkg.m6"],
+            ["pkg.m8", "pkg.m9", "pkg.m8"],
+        ]
@@ -1,3 +1,4 @@
+import json
 import pytest
 from sqlalchemy.orm import Session
 
@@ -244,6 +245,26 @@ class TestDatabaseService:
         result = DatabaseService.get_final_report(test_db, "nonexistent-task-id")
         assert result is None
     
+    def test_get_final_report_raw(self, test_db: Session, sample_task_id: str, sample_git_url: str, sample_report_content: dict):
+        """Test retrieving a final report as its stored JSON text."""
+        DatabaseService.create_analysis_job(
+            db=test_db,
+            task_id=sample_task_id,
+            input_source_type="git_url",
+            input_source_path=sample_git_url
+        )
+        DatabaseService.create_final_report(
+            db=test_db,
+            task_id=sample_task_id,
+            report_content=sample_report_content
+        )
+        
+        raw = DatabaseService.get_final_report_raw(test_db, sample_task_id)
+        
+        assert isinstance(raw, str)
+        assert json.loads(raw) == sample_report_content
+        assert DatabaseService.get_final_report_raw(test_db, "nonexistent-task-id") is None
+    
     def test_end_to_end_workflow(self, test_db: Session, sample_task_id: str, sample_git_url: str, sample_report_content: dict):
         """Test a complete end-to-end workflow using DatabaseService."""
         # 1. Create analysis job
@@ -0,0 +1,148 @@
+import pytest
+
+# The playbooks pull in the agent/RAG stack; skip only where its packages are missing
+for _package in ("openai", "chromadb", "git", "sentence_transformers", "langchain_text_splitters"):
+    pytest.importorskip(_package)
+
+from app.playbooks import base_playbook, dependency_health
+from app.playbooks.dependency_health import DependencyHealthPlaybook
+from app.services.ai_agent import AgentContext, AnalysisStatus, SeverityLevel
+
+# A small project as the vector store returns it: one chunk per file
+PROJECT = {
+    "web/package.json": """{
+  "name": "demo-web",
+  "dependencies": {"express": "4.18.2", "debug-utils": "^1.0.0", "lodash": "latest"},
+  "devDependencies": {"jest": "29.0.0"}
+}""",
+    "web/legacy/package.json": "{not valid json",
+    "requirements.txt": "requests==2.31.0\nflask\n# test tooling\npytest-mock>=3.0\n",
+    "pyproject.toml": '[project]\nname = "demo"\ndependencies = ["fastapi>=0.100", "beta-client"]\n',
+    "app/main.py": "import flask\n\napp = flask.Flask(__name__)\n",
+}
+
+
+class ProjectVectorStore:
+    """Stand-in for VectorStore that returns the fixture project for the first query only."""
+
+    def __init__(self, files: dict):
+        self.files = files
+
+    def collection_generation(self, task_id: str) -> int:
+        return 0
+
+    def batch_search(self, task_id: str, queries: list, k: int = 5) -> list:
+        chunks = [
+            {"content": content, "metadata": {"file_path": path, "chunk_type": "file"}}
+            for path, content in self.files.items()
+        ]
+        return [chunks] + [[] for _ in queries[1:]]
+
+
+@pytest.fixture
+def project(monkeypatch) -> dict:
+    """Serve the fixture project from the vector store, with empty caches."""
+    monkeypatch.setattr(base_playbook, "get_vector_store", lambda: ProjectVectorStore(PROJECT))
+    for cache in (base_playbook._pattern_cache, dependency_health._parsed_package_json, dependency_health._setup_dependencies):
+        cache.clear()
+    return PROJECT
+
+
+@pytest.fixture
+def playbook() -> DependencyHealthPlaybook:
+    """Create a dependency health playbook."""
+    return DependencyHealthPlaybook()
+
+
+def make_context() -> AgentContext:
+    """Build the context the playbooks receive from the agent."""
+    return AgentContext(
+        task_id="deps-task",
+        project_info={},
+        vector_store_collection="deps-task",
+        analysis_requirements=["dependencies"]
+    )
+
+
+def cache_hits(cache) -> int:
+    """Return a parse cache's hit count; clear() keeps the counters, so tests compare deltas."""
+    return cache.stats()["hits"]
+
+
+def summarize(findings: list) -> list:
+    """Return the (file, pattern, line, package) of each finding, in order."""
+    return [
+        (f["file"], f["pattern"], f["line"], f["metadata"].get("package_name"))
+        for f in findings
+    ]
+
+
+class TestDependencyHealthProject:
+    """Test the dependency health findings for the fixture project."""
+
+    async def test_findings(self, playbook, project):
+        """Test each manifest yields its findings and other files are ignored."""
+        result = await playbook.execute(make_context())
+
+        assert result.status == AnalysisStatus.COMPLETED
+        assert summarize(result.findings) == [
+            ("web/package.json", "problematic_package", None, "debug-utils"),
+            ("web/legacy/package.json", "invalid_package_json", 1, None),
+            ("requirements.txt", "problematic_package", 4, "pytest-mock"),
+            ("requirements.txt", "unpinned_python_versions", None, None),
+            ("pyproject.toml", "problematic_package", None, "beta-client"),
+        ]
+        assert result.metadata["dependency_files_analyzed"] == 4
+        assert result.severity == SeverityLevel.MEDIUM
+
+    async def test_requirement_pins(self, playbook, project):
+        """Test the package name ends at the first pin and unpinned lines are counted."""
+        result = await playbook.execute(make_context())
+
+        unpinned = next(f for f in result.findings if f["pattern"] == "unpinned_python_versions")
+        assert unpinned["metadata"] == {"unpinned_count": 1, "total_count": 3}
+
+    def test_npm_unpinned_versions(self, playbook, project):
+        """Test ranges and tags count as unpinned once they are over half the dependencies."""
+        content = '{"dependencies": {"a": "^1.0.0", "b": "~2.1.0", "c": "latest", "d": "1.2.3"}}'
+
+        findings = playbook._analyze_npm_dependencies(content, "package.json")
+
+        assert [f["metadata"] for f in findings] == [{"unpinned_count": 3, "total_count": 4}]
+
+
+class TestManifestParseCaches:
+    """Test the digest-keyed manifest parse caches."""
+
+    def test_identical_manifests_parsed_once(self, playbook, project):
+        """Test identical content is parsed once and each file keeps its own findings."""
+        content = project["web/package.json"]
+        hits = cache_hits(dependency_health._parsed_package_json)
+
+        first = playbook._analyze_npm_dependencies(content, "a/package.json")
+        second = playbook._analyze_npm_dependencies(content, "b/package.json")
+
+        assert cache_hits(dependency_health._parsed_package_json) == hits + 1
+        assert [f["file"] for f in first] == ["a/package.json"]
+        assert [f["file"] for f in second] == ["b/package.json"]
+
+    def test_invalid_json_cached(self, playbook, project):
+        """Test malformed content is cached as invalid and reported on every file."""
+        hits = cache_hits(dependency_health._parsed_package_json)
+
+        for path in ("a/package.json", "b/package.json"):
+            findings = playbook._analyze_npm_dependencies("{oops", path)
+            assert summarize(findings) == [(path, "invalid_package_json", 1, None)]
+
+        assert cache_hits(dependency_health._parsed_package_json) == hits + 1
+
+    def test_setup_dependencies_cached(self, playbook, project):
+        """Test setup.py dependency names are extracted once per distinct content."""
+        content = 'install_requires=["requests>=2", "mock-server"]'
+        hits = cache_hits(dependency_health._setup_dependencies)
+
+        for path in ("setup.py", "tools/setup.py"):
+            findings = playbook._analyze_python_setup(content, path)
+            assert summarize(findings) == [(path, "problematic_package", None, "mock-server")]
+
+        assert cache_hits(dependency_health._setup_dependencies) == hits + 1
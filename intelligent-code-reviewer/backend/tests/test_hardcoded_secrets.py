@@ -0,0 +1,132 @@
+import pytest
+
+# The playbooks pull in the agent/RAG stack; skip only where its packages are missing
+for _package in ("openai", "chromadb", "git", "sentence_transformers", "langchain_text_splitters"):
+    pytest.importorskip(_package)
+
+from app.playbooks import hardcoded_secrets
+from app.playbooks.hardcoded_secrets import HardcodedSecretsPlaybook
+
+# 32 random-looking characters that none of the placeholder fragments match
+RANDOM_KEY = "Zq8vR2nL5wK9pT4yH7mJ3xC6bF1dG0sE"
+
+
+@pytest.fixture(scope="module")
+def playbook() -> HardcodedSecretsPlaybook:
+    """Create one secrets playbook for the module."""
+    return HardcodedSecretsPlaybook()
+
+
+def scan(playbook: HardcodedSecretsPlaybook, content: str, file_path: str = "app/settings.py") -> list:
+    """Run the secret scan over a single file's content."""
+    return playbook._scan_for_secrets({"content": content, "file_path": file_path})
+
+
+def patterns(findings: list) -> set:
+    """Return the (line, secret type) pairs of the findings."""
+    return {(finding["line"], finding["pattern"]) for finding in findings}
+
+
+class TestSecretKeyNames:
+    """Test key names that end in a secret keyword are still reported."""
+
+    @pytest.mark.parametrize("line, secret_type", [
+        ('mypassword = "Str0ng!Passw"', "password"),
+        ('user_password = "Str0ng!Passw"', "password"),
+        ('DB_PASSWORD = "Str0ng!Passw"', "password"),
+        (f'secretkey = "{RANDOM_KEY}"', "api_key"),
+        (f'SECRETKEY = "{RANDOM_KEY}"', "api_key"),
+        (f'secretKey: "{RANDOM_KEY}"', "api_key"),
+        (f'authtoken = "{RANDOM_KEY}"', "token"),
+    ])
+    def test_suffixed_key_name_reported(self, playbook, line: str, secret_type: str):
+        """Test a secret is found when its key name is a suffix of a longer identifier."""
+        assert (1, secret_type) in patterns(scan(playbook, line))
+
+    def test_key_and_value_on_different_lines_ignored(self, playbook):
+        """Test a key name does not pair with a value further down the file."""
+        content = 'password =\n\n"Str0ng!Passw"\n'
+
+        assert scan(playbook, content) == []
+
+
+class TestScanForSecrets:
+    """Test line mapping, deduplication and limits of the secret scan."""
+
+    AWS_KEY = "AKIAZ7Q4RW2N5V8K3JHP"
+
+    def test_clean_file_has_no_findings(self, playbook):
+        """Test a file without secrets yields nothing."""
+        assert scan(playbook, "import os\n\nprint(os.getcwd())\n") == []
+
+    def test_line_number_and_content_in_multiline_file(self, playbook):
+        """Test a finding reports its 1-based line and that line, stripped."""
+        content = 'import os\n\n    password = "Str0ng!Passw"  \nprint(password)\n'
+
+        findings = scan(playbook, content)
+
+        assert [(f["line"], f["pattern"]) for f in findings] == [(3, "password")]
+        assert findings[0]["metadata"]["line_content"] == 'password = "Str0ng!Passw"'
+        assert findings[0]["content_preview"] == 'pas*******************sw"'
+
+    def test_non_ascii_content(self, playbook):
+        """Test lines and previews stay aligned when earlier lines hold multi-byte characters."""
+        content = '# Konfigürätion für 日本語\nname = "Zoë"\npassword = "Stärk!Pässwört"\n'
+
+        findings = scan(playbook, content)
+
+        assert [(f["line"], f["pattern"]) for f in findings] == [(3, "password")]
+        assert findings[0]["metadata"]["line_content"] == 'password = "Stärk!Pässwört"'
+        assert findings[0]["content_preview"] == 'pas*********************rt"'
+
+    def test_match_at_first_byte(self, playbook):
+        """Test a secret starting the file is placed on line 1."""
+        findings = scan(playbook, f"{self.AWS_KEY} is the deploy key\nsecond line\n")
+
+        assert patterns(findings) == {(1, "aws_credential")}
+        assert findings[0]["metadata"]["line_content"] == f"{self.AWS_KEY} is the deploy key"
+
+    def test_match_at_last_byte(self, playbook):
+        """Test a secret ending a file without a trailing newline is placed on the last line."""
+        findings = scan(playbook, f"first line\nsecond line\ndeploy_key={self.AWS_KEY}")
+
+        assert patterns(findings) == {(3, "aws_credential")}
+        assert findings[0]["metadata"]["line_content"] == f"deploy_key={self.AWS_KEY}"
+
+    def test_single_line_file(self, playbook):
+        """Test a one-line file with the secret filling it entirely."""
+        findings = scan(playbook, self.AWS_KEY)
+
+        assert patterns(findings) == {(1, "aws_credential")}
+        assert findings[0]["metadata"]["line_content"] == self.AWS_KEY
+
+    def test_repeats_on_one_line_reported_once(self, playbook):
+        """Test one finding per line and secret type, however often it matches there."""
+        content = f"keys = ['{self.AWS_KEY}', '{self.AWS_KEY}']\n"
+
+        assert len(scan(playbook, content)) == 1
+
+    def test_same_secret_on_different_lines_reported_each_time(self, playbook):
+        """Test each line keeps its own finding."""
+        content = f"primary = '{self.AWS_KEY}'\nbackup = '{self.AWS_KEY}'\n"
+
+        assert patterns(scan(playbook, content)) == {(1, "aws_credential"), (2, "aws_credential")}
+
+    def test_different_types_on_one_line_all_reported(self, playbook):
+        """Test overlapping matches of different types on one line are all kept."""
+        findings = scan(playbook, 'db_password = "Str0ng!Passw"\n')
+
+        assert patterns(findings) == {(1, "password"), (1, "database_credential")}
+
+    def test_placeholder_values_ignored(self, playbook):
+        """Test values containing placeholder fragments are not reported."""
+        assert scan(playbook, 'password = "your_password_here"\n') == []
+
+    def test_findings_capped_per_file(self, playbook, monkeypatch):
+        """Test the scan stops once a file reaches MAX_FINDINGS_PER_FILE findings."""
+        monkeypatch.setattr(hardcoded_secrets, "MAX_FINDINGS_PER_FILE", 3)
+        content = "".join(f"key_{i} = '{self.AWS_KEY}'\n" for i in range(10))
+
+        findings = scan(playbook, content)
+
+        assert [f["line"] for f in findings] == [1, 2, 3]
@@ -0,0 +1,179 @@
+import ast
+import textwrap
+import pytest
+
+# The playbooks pull in the agent/RAG stack; skip only where its packages are missing
+for _package in ("openai", "chromadb", "git", "sentence_transformers", "langchain_text_splitters"):
+    pytest.importorskip(_package)
+
+from app.playbooks.high_complexity import HighComplexityPlaybook
+
+
+@pytest.fixture(scope="module")
+def playbook() -> HighComplexityPlaybook:
+    """Create one complexity playbook for the module."""
+    return HighComplexityPlaybook()
+
+
+def measure(playbook: HighComplexityPlaybook, source: str) -> dict:
+    """Return complexity metrics for a snippet, without the line counts."""
+    metrics = playbook._calculate_complexity_metrics(textwrap.dedent(source).strip("\n"))
+    return {key: metrics[key] for key in ("cyclomatic", "cognitive", "nesting_depth", "parameters")}
+
+
+class TestAstComplexityMetrics:
+    """Test complexity measured from the Python AST."""
+
+    def test_straight_line_function(self, playbook):
+        """Test a function without branches has the base complexity."""
+        assert measure(playbook, """
+            def add(a, b):
+                total = a + b
+                return total
+        """) == {"cyclomatic": 1, "cognitive": 0, "nesting_depth": 0, "parameters": 2}
+
+    def test_elif_chain_does_not_nest(self, playbook):
+        """Test each elif adds one branch at the depth of its if."""
+        assert measure(playbook, """
+            def grade(score):
+                if score > 90:
+                    return "A"
+                elif score > 80:
+                    return "B"
+                elif score > 70:
+                    return "C"
+                else:
+                    return "F"
+        """) == {"cyclomatic": 4, "cognitive": 3, "nesting_depth": 1, "parameters": 1}
+
+    def test_bool_ops_count_each_operator(self, playbook):
+        """Test a BoolOp adds one path per extra operand and one cognitive point per sequence."""
+        assert measure(playbook, """
+            def allowed(user, admin, owner, public):
+                return user and admin and owner or public
+        """) == {"cyclomatic": 4, "cognitive": 2, "nesting_depth": 0, "parameters": 4}
+
+    def test_bool_op_inside_condition(self, playbook):
+        """Test a condition's operators are counted on top of its branch."""
+        assert measure(playbook, """
+            def check(a, b):
+                if a and b:
+                    return True
+                return False
+        """) == {"cyclomatic": 3, "cognitive": 2, "nesting_depth": 1, "parameters": 2}
+
+    def test_comprehension_clauses(self, playbook):
+        """Test every for and if clause of a comprehension adds a path without nesting."""
+        assert measure(playbook, """
+            def evens(rows):
+                return [x for row in rows for x in row if x % 2 == 0 if x]
+        """) == {"cyclomatic": 5, "cognitive": 0, "nesting_depth": 0, "parameters": 1}
+
+    def test_conditional_expression(self, playbook):
+        """Test a ternary adds one path and one cognitive point."""
+        assert measure(playbook, """
+            def sign(x):
+                return 1 if x >= 0 else -1
+        """) == {"cyclomatic": 2, "cognitive": 1, "nesting_depth": 0, "parameters": 1}
+
+    def test_try_except(self, playbook):
+        """Test each except handler is a branch and try/with blocks deepen nesting."""
+        assert measure(playbook, """
+            def load(path):
+                try:
+                    with open(path) as handle:
+                        return handle.read()
+                except FileNotFoundError:
+                    return None
+                except OSError:
+                    raise
+                finally:
+                    pass
+        """) == {"cyclomatic": 3, "cognitive": 4, "nesting_depth": 2, "parameters": 1}
+
+    def test_nested_branches_cost_more(self, playbook):
+        """Test cognitive complexity grows with nesting depth and counts break."""
+        assert measure(playbook, """
+            def walk(rows):
+                for row in rows:
+                    if row:
+                        while row:
+                            break
+        """) == {"cyclomatic": 4, "cognitive": 7, "nesting_depth": 3, "parameters": 1}
+
+    def test_nested_definitions_excluded(self, playbook):
+        """Test nested functions, lambdas and classes are not charged to the enclosing function."""
+        assert measure(playbook, """
+            def outer(items):
+                def inner(x):
+                    if x:
+                        return x
+                    return None
+
+                class Local:
+                    def method(self):
+                        while True:
+                            pass
+
+                fallback = lambda y: y if y else 0
+                for item in items:
+                    inner(item)
+        """) == {"cyclomatic": 2, "cognitive": 1, "nesting_depth": 1, "parameters": 1}
+
+    def test_all_parameter_kinds(self, playbook):
+        """Test positional-only, keyword-only and variadic parameters are all counted."""
+        assert measure(playbook, """
+            def configure(a, /, b, *args, c, **kwargs):
+                return a
+        """)["parameters"] == 5
+
+    def test_indented_method(self, playbook):
+        """Test a method's indented source is dedented before parsing."""
+        metrics = playbook._calculate_complexity_metrics(
+            "    def run(self):\n        if self.ready:\n            return True\n"
+        )
+
+        assert (metrics["cyclomatic"], metrics["parameters"]) == (2, 1)
+
+    def test_prepared_node_matches_parsed_source(self, playbook):
+        """Test passing the parsed node gives the same metrics as parsing the content."""
+        source = "def f(a):\n    for x in a:\n        if x or a:\n            return x\n"
+        node = ast.parse(source).body[0]
+
+        assert playbook._calculate_complexity_metrics(source, node) == playbook._calculate_complexity_metrics(source)
+
+    def test_line_and_decision_point_counts(self, playbook):
+        """Test blank and comment lines are not counted and decision points are cyclomatic - 1."""
+        metrics = playbook._calculate_complexity_metrics(
+            "def f(a):\n    # check\n\n    if a:\n        return 1\n    return 0\n"
+        )
+
+        assert metrics["lines"] == 4
+        assert metrics["decision_points"] == 1
+
+
+class TestKeywordFallback:
+    """Test the keyword-counting path for source that does not parse."""
+
+    JS_FUNCTION = (
+        "function check(a, b) {\n"
+        "    if (a && b) {\n"
+        "        for (let i = 0; i < 3; i++) { }\n"
+        "    }\n"
+        "    return a || b;\n"
+        "}"
+    )
+
+    def test_unparseable_source_uses_keywords(self, playbook):
+        """Test non-Python source is measured by counting decision keywords."""
+        assert measure(playbook, self.JS_FUNCTION) == {
+            "cyclomatic": 3, "cognitive": 3, "nesting_depth": 2, "parameters": 2
+        }
+
+    def test_keywords_inside_words_ignored(self, playbook):
+        """Test keywords inside longer words, such as 'or' in 'format' and 'order', are not counted."""
+        metrics = playbook._calculate_complexity_metrics(
+            "function format(order, notify) {\n    return order;\n"
+        )
+
+        assert metrics["cyclomatic"] == 1
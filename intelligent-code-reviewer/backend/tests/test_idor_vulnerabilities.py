@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+
+# The playbooks pull in the agent/RAG stack; skip where it cannot load
+idor_vulnerabilities = pytest.importorskip("app.playbooks.idor_vulnerabilities")
+
+
+@pytest.fixture(scope="module")
+def playbook():
+    """Create one IDOR playbook for the module."""
+    return idor_vulnerabilities.IdorVulnerabilitiesPlaybook()
+
+
+def scan(playbook, content: str) -> list:
+    """Run the IDOR pattern scan over a single file's content."""
+    result = {"content": content, "file_path": "app/users.php"}
+    return asyncio.run(playbook._scan_for_idor_patterns(result))
+
+
+class TestIdorPatternScan:
+    """Test the RE2 prefilter in front of the IDOR patterns."""
+
+    def test_ascii_identifier_detected(self, playbook):
+        """Test a plain getter taking a raw request value is reported."""
+        findings = scan(playbook, "$user = getUserById($id);")
+
+        assert [f["pattern"] for f in findings] == ["direct_database_access"]
+
+    def test_non_ascii_identifier_detected(self, playbook):
+        """Test the prefilter does not drop matches whose \\w spans non-ASCII letters."""
+        findings = scan(playbook, "$user = getÜserById($id);")
+
+        assert [f["pattern"] for f in findings] == ["direct_database_access"]
+        assert findings[0]["content_preview"] == "getÜserById($"
+
+    def test_non_ascii_whitespace_detected(self, playbook):
+        """Test the prefilter does not drop matches whose \\s spans Unicode spaces."""
+        findings = scan(playbook, "$user = findById( $id);")
+
+        assert [f["pattern"] for f in findings] == ["direct_database_access"]
+
+    def test_prefilter_accepts_unicode_classes(self):
+        """Test the RE2 rewrite of \\w and \\s covers what Python's re matches."""
+        rewrite = idor_vulnerabilities._to_re2_superset
+
+        assert rewrite(r"get\w*ById\s*\(") == r"get[\p{L}\p{N}_]*ById[\s\p{Z}\x0b\x1c-\x1f\x85]*\("
+        assert rewrite(r"req\.params\.id") == r"req\.params\.id"
+
+
+class TestRe2Superset:
+    """Test _to_re2_superset keeps the RE2 prefilter a superset of re."""
+
+    # Identifiers, digits and spaces from outside ASCII next to ASCII ones
+    SAMPLES = ("user_1", "ÜserId", "naïve-name", "id ٣", "a b", "x = y", "é-é", "[]", "a\bb")
+
+    @pytest.mark.parametrize("pattern, expected", [
+        (r"[\w-]+", r"[\p{L}\p{N}_-]+"),
+        (r"[^\s]", r"[^\s\p{Z}\x0b\x1c-\x1f\x85]"),
+        (r"\d+", r"[\p{Nd}]+"),
+        (r"[\d.]", r"[\p{Nd}.]"),
+        (r"\bid\B", r"id"),
+        (r"[\b]", r"[\x08]"),
+        (r"[]\w]", r"[]\p{L}\p{N}_]"),
+        (r"[^]\d]", r"[^]\p{Nd}]"),
+        (r"\W\S\D\.", r"\W\S\D\."),
+    ])
+    def test_rewrite(self, pattern: str, expected: str):
+        """Test escapes are widened in and out of character classes and \\b is dropped outside them."""
+        assert idor_vulnerabilities._to_re2_superset(pattern) == expected
+
+    @pytest.mark.parametrize("pattern", [
+        r"[\w-]+", r"\w+\s*=\s*\w+", r"id\s\d", r"\b\w+\b", r"[^\s\d]+", r"[\b]", r"[]\w]+", r"\W+",
+    ])
+    def test_rewrite_matches_superset(self, pattern: str):
+        """Test RE2 finds a match wherever re does, with the flags the playbook uses."""
+        re2 = pytest.importorskip("re2")
+        flags = idor_vulnerabilities.re.IGNORECASE | idor_vulnerabilities.re.MULTILINE | idor_vulnerabilities.re.DOTALL
+        python_re = idor_vulnerabilities.re.compile(pattern, flags)
+        prefilter = re2.compile("(?ims)" + idor_vulnerabilities._to_re2_superset(pattern))
+
+        for sample in self.SAMPLES:
+            if python_re.search(sample):
+                assert prefilter.search(sample), sample
+
+    def test_every_pattern_prefiltered_or_always_scanned(self, playbook):
+        """Test each IDOR pattern either compiles into the RE2 set or is always rerun with re."""
+        assert sorted(playbook._set_members + playbook._always_scanned) == list(range(len(playbook._compiled_patterns)))
@@ -1,5 +1,5 @@
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 
 from app.models.sql_models import AnalysisJob, AgentLog, FinalReport
@@ -73,6 +73,28 @@ class TestAnalysisJob:
         assert found_job is not None
         assert found_job.task_id == sample_task_id
         assert found_job.status == "PENDING"
+    
+    def test_timestamp_columns_timezone_aware(self):
+        """Test every job timestamp column stores its timezone, so they can be subtracted."""
+        columns = AnalysisJob.__table__.c
+        
+        for name in ("created_at", "started_at", "updated_at", "completed_at"):
+            assert columns[name].type.timezone, name
+    
+    def test_duration_of_finished_job(self):
+        """Test the duration of a job whose start came back naive, as SQLite returns it."""
+        job = AnalysisJob(
+            started_at=datetime(2024, 1, 1, 12, 0, 0),
+            completed_at=datetime(2024, 1, 1, 12, 1, 30, tzinfo=timezone.utc)
+        )
+        
+        assert job.get_duration() == 90.0
+    
+    def test_duration_of_running_job(self):
+        """Test a running job's duration is measured up to now in UTC."""
+        job = AnalysisJob(started_at=datetime.now(timezone.utc) - timedelta(seconds=30))
+        
+        assert 30 <= job.get_duration() < 60
 
 
 class TestAgentLog:
@@ -329,4 +351,33 @@ class TestModelRelationships:
         
         # Verify report was cascaded deleted
         report_count = test_db.query(FinalReport).filter(FinalReport.task_id == sample_task_id).count()
-        assert report_count == 0 
\ No newline at end of file
+        assert report_count == 0 
+
+class TestSharedMetadata:
+    """Test that every model registers on the single shared Base."""
+    
+    def test_all_tables_on_one_metadata(self):
+        """Test that job, log, report and step tables share one metadata."""
+        from app.models import Base
+        from app.models.analysis import AnalysisJob as TrackedJob, AnalysisStep
+        
+        assert TrackedJob is AnalysisJob
+        assert AnalysisStep.metadata is AnalysisJob.metadata is Base.metadata
+        assert {"analysis_jobs", "agent_logs", "final_reports", "analysis_steps"} <= set(Base.metadata.tables)
+    
+    def test_progress_columns_default(self, test_db: Session, sample_task_id: str):
+        """Test that the progress tracking columns get their defaults."""
+        job = AnalysisJob(
+            task_id=sample_task_id,
+            input_source_type="git_url",
+            input_source_path="https://github.com/test/repo.git"
+        )
+        test_db.add(job)
+        test_db.commit()
+        test_db.refresh(job)
+        
+        assert job.progress_percentage == 0.0
+        assert job.total_tools == 13
+        assert job.warnings_count == 0
+        assert job.updated_at is not None
+        assert job.get_duration() is None
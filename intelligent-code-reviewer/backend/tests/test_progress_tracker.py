@@ -0,0 +1,130 @@
+import pytest
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models import AnalysisJob, AnalysisStatus, AnalysisStep
+from app.services import progress_tracker
+from app.services.progress_tracker import ProgressTracker
+
+
+@pytest.fixture
+def tracker_db(test_db: Session, monkeypatch) -> Session:
+    """Point the progress tracker's sessions at the test database."""
+    factory = sessionmaker(bind=test_db.get_bind())
+
+    @contextmanager
+    def test_session():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setattr(progress_tracker, "get_session", test_session)
+    return test_db
+
+
+class TestProgressTrackerBatchLoad:
+    """Test ProgressTracker.batch_load prefetching."""
+
+    def test_batch_load_prefetches_fresh_trackers(self, tracker_db: Session, sample_task_id: str, sample_git_url: str):
+        """Test every load returns its own tracker with the job snapshot prefetched."""
+        tracker_db.add(AnalysisJob(
+            task_id=sample_task_id,
+            status="RUNNING_TOOLS",
+            input_source_type="git_url",
+            input_source_path=sample_git_url
+        ))
+        tracker_db.commit()
+
+        first = ProgressTracker.batch_load([sample_task_id])[sample_task_id]
+        second = ProgressTracker.batch_load([sample_task_id])[sample_task_id]
+
+        assert first is not second
+        assert first.get_current_status()["status"] == "RUNNING_TOOLS"
+
+    def test_batch_load_prefetches_steps_and_summary(self, tracker_db: Session, sample_task_id: str, sample_git_url: str):
+        """Test the step history and its per-status summary come from one step query."""
+        tracker_db.add(AnalysisJob(
+            task_id=sample_task_id,
+            status="RUNNING_TOOLS",
+            input_source_type="git_url",
+            input_source_path=sample_git_url
+        ))
+        started_at = datetime(2024, 1, 1, 12, 0, 0)
+        for offset, status in enumerate(["completed", "completed", "failed", "running"]):
+            tracker_db.add(AnalysisStep(
+                task_id=sample_task_id,
+                step_name=f"step-{offset}",
+                step_type="tool",
+                status=status,
+                started_at=started_at + timedelta(seconds=offset)
+            ))
+        tracker_db.add(AnalysisStep(
+            task_id="other-task",
+            step_name="elsewhere",
+            step_type="tool",
+            status="completed",
+            started_at=started_at
+        ))
+        tracker_db.commit()
+
+        tracker = ProgressTracker.batch_load([sample_task_id])[sample_task_id]
+        # Reads are served from the prefetch even once the rows are gone
+        tracker_db.query(AnalysisStep).delete()
+        tracker_db.commit()
+
+        assert [step["step_name"] for step in tracker.get_step_history()] == [
+            "step-0", "step-1", "step-2", "step-3"
+        ]
+        assert tracker.get_step_summary() == {
+            "total_steps": 4,
+            "completed_steps": 2,
+            "failed_steps": 1,
+            "running_steps": 1,
+        }
+
+    def test_step_summary_without_prefetch(self, tracker_db: Session, sample_task_id: str):
+        """Test a tracker that was not batch loaded aggregates its steps on demand."""
+        tracker_db.add(AnalysisStep(
+            task_id=sample_task_id,
+            step_name="clone",
+            step_type="rag",
+            status="completed",
+            started_at=datetime(2024, 1, 1, 12, 0, 0)
+        ))
+        tracker_db.commit()
+
+        assert ProgressTracker(sample_task_id).get_step_summary() == {
+            "total_steps": 1,
+            "completed_steps": 1,
+            "failed_steps": 0,
+            "running_steps": 0,
+        }
+
+    def test_batch_load_omits_unknown_jobs(self, tracker_db: Session):
+        """Test task ids without a job are left out of the result."""
+        assert ProgressTracker.batch_load(["missing-task"]) == {}
+
+
+class TestProgressTrackerUpdates:
+    """Test ProgressTracker writes."""
+
+    def test_cancel_marks_job_complete(self, tracker_db: Session, sample_task_id: str, sample_git_url: str):
+        """Test cancelling sets the status and completion time."""
+        job = AnalysisJob(
+            task_id=sample_task_id,
+            status="RUNNING_TOOLS",
+            input_source_type="git_url",
+            input_source_path=sample_git_url
+        )
+        tracker_db.add(job)
+        tracker_db.commit()
+
+        ProgressTracker(sample_task_id).update_status(AnalysisStatus.CANCELLED, step="Cancelled by admin")
+
+        tracker_db.refresh(job)
+        assert job.status == "CANCELLED"
+        assert job.current_step == "Cancelled by admin"
+        assert job.completed_at is not None